@@ -0,0 +1,106 @@
+-- 지역별 판매점 통계 요약 테이블
+-- v_region_stats 뷰는 조회마다 lotto_stores 전체를 GROUP BY 하므로,
+-- 지역별 합계를 테이블에 두고 lotto_stores 변경 시 트리거로 증분 갱신합니다.
+-- (insert_store, 다중 행 upsert 모두 같은 트랜잭션 안에서 반영됨)
+CREATE TABLE IF NOT EXISTS lotto_region_stats (
+    region VARCHAR(50) NOT NULL PRIMARY KEY,
+    store_count INT NOT NULL DEFAULT 0 COMMENT '판매점 수',
+    total_1st_wins INT NOT NULL DEFAULT 0 COMMENT '1등 배출 합계',
+    total_2nd_wins INT NOT NULL DEFAULT 0 COMMENT '2등 배출 합계',
+    total_wins INT NOT NULL DEFAULT 0 COMMENT '총 당첨 합계',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='지역별 판매점 통계 (트리거로 증분 갱신)';
+
+-- 기존 판매점으로 채우기 (전체 재구성과 같은 집계)
+INSERT INTO lotto_region_stats (region, store_count, total_1st_wins, total_2nd_wins, total_wins)
+SELECT
+    region,
+    COUNT(*),
+    COALESCE(SUM(wins_1st), 0),
+    COALESCE(SUM(wins_2nd), 0),
+    COALESCE(SUM(total_wins), 0)
+FROM lotto_stores
+WHERE region IS NOT NULL AND region != ''
+GROUP BY region
+ON DUPLICATE KEY UPDATE
+    store_count = VALUES(store_count),
+    total_1st_wins = VALUES(total_1st_wins),
+    total_2nd_wins = VALUES(total_2nd_wins),
+    total_wins = VALUES(total_wins);
+
+DROP TRIGGER IF EXISTS trg_stores_region_insert;
+DROP TRIGGER IF EXISTS trg_stores_region_update;
+DROP TRIGGER IF EXISTS trg_stores_region_delete;
+
+DELIMITER //
+
+CREATE TRIGGER trg_stores_region_insert AFTER INSERT ON lotto_stores
+FOR EACH ROW
+BEGIN
+    IF NEW.region IS NOT NULL AND NEW.region != '' THEN
+        INSERT INTO lotto_region_stats (region, store_count, total_1st_wins, total_2nd_wins, total_wins)
+        VALUES (NEW.region, 1, COALESCE(NEW.wins_1st, 0), COALESCE(NEW.wins_2nd, 0), COALESCE(NEW.total_wins, 0))
+        ON DUPLICATE KEY UPDATE
+            store_count = store_count + 1,
+            total_1st_wins = total_1st_wins + VALUES(total_1st_wins),
+            total_2nd_wins = total_2nd_wins + VALUES(total_2nd_wins),
+            total_wins = total_wins + VALUES(total_wins);
+    END IF;
+END//
+
+CREATE TRIGGER trg_stores_region_update AFTER UPDATE ON lotto_stores
+FOR EACH ROW
+BEGIN
+    -- 지역/당첨 횟수가 그대로면 건너뜀 (순위, updated_at만 바뀐 경우)
+    IF NOT (OLD.region <=> NEW.region
+            AND OLD.wins_1st <=> NEW.wins_1st
+            AND OLD.wins_2nd <=> NEW.wins_2nd
+            AND OLD.total_wins <=> NEW.total_wins) THEN
+        IF OLD.region IS NOT NULL AND OLD.region != '' THEN
+            UPDATE lotto_region_stats
+            SET store_count = store_count - 1,
+                total_1st_wins = total_1st_wins - COALESCE(OLD.wins_1st, 0),
+                total_2nd_wins = total_2nd_wins - COALESCE(OLD.wins_2nd, 0),
+                total_wins = total_wins - COALESCE(OLD.total_wins, 0)
+            WHERE region = OLD.region;
+        END IF;
+        IF NEW.region IS NOT NULL AND NEW.region != '' THEN
+            INSERT INTO lotto_region_stats (region, store_count, total_1st_wins, total_2nd_wins, total_wins)
+            VALUES (NEW.region, 1, COALESCE(NEW.wins_1st, 0), COALESCE(NEW.wins_2nd, 0), COALESCE(NEW.total_wins, 0))
+            ON DUPLICATE KEY UPDATE
+                store_count = store_count + 1,
+                total_1st_wins = total_1st_wins + VALUES(total_1st_wins),
+                total_2nd_wins = total_2nd_wins + VALUES(total_2nd_wins),
+                total_wins = total_wins + VALUES(total_wins);
+        END IF;
+    END IF;
+END//
+
+CREATE TRIGGER trg_stores_region_delete AFTER DELETE ON lotto_stores
+FOR EACH ROW
+BEGIN
+    IF OLD.region IS NOT NULL AND OLD.region != '' THEN
+        UPDATE lotto_region_stats
+        SET store_count = store_count - 1,
+            total_1st_wins = total_1st_wins - COALESCE(OLD.wins_1st, 0),
+            total_2nd_wins = total_2nd_wins - COALESCE(OLD.wins_2nd, 0),
+            total_wins = total_wins - COALESCE(OLD.total_wins, 0)
+        WHERE region = OLD.region;
+    END IF;
+END//
+
+DELIMITER ;
+
+-- 기존 뷰 이름으로 조회하던 곳을 위해 요약 테이블 기반으로 재정의
+CREATE OR REPLACE VIEW v_region_stats AS
+SELECT
+    region,
+    store_count,
+    total_1st_wins,
+    total_2nd_wins,
+    total_wins,
+    total_1st_wins / store_count AS avg_1st_wins,
+    total_2nd_wins / store_count AS avg_2nd_wins
+FROM lotto_region_stats
+WHERE store_count > 0
+ORDER BY total_wins DESC;
@@ -0,0 +1,60 @@
+-- 판매점 회차별 당첨 원장
+-- 회차 하나를 수집하면 그 회차의 원장 행만 교체하고, lotto_stores의 당첨 횟수는
+-- 원장 트리거로 증분 갱신합니다. 일부 회차만 다시 수집해도 합계가 부분 집계로 덮이지 않습니다.
+-- (lotto_stores 변경은 04의 트리거로 lotto_region_stats까지 반영됨)
+--
+-- 마이그레이션 시점의 원장은 비어 있으므로 기존 합계는 그대로 두고 트리거도 꺼 둡니다.
+-- 원장이 채워지면(/stores/crawl/historical이 601회~최신을 실패 없이 마치거나 POST /stores/totals/rebuild)
+-- 원장 기준으로 합계를 다시 계산하면서 같은 트랜잭션에서 store_ledger_state.active를 켭니다.
+CREATE TABLE IF NOT EXISTS store_round_wins (
+    round INT NOT NULL COMMENT '회차',
+    `rank` TINYINT NOT NULL COMMENT '당첨 등수 (1, 2)',
+    seq SMALLINT NOT NULL COMMENT '회차/등수 안의 순번 (한 판매점이 여러 번 당첨 가능)',
+    store_id INT NOT NULL,
+    method VARCHAR(20) NULL COMMENT '자동/수동/반자동',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (round, `rank`, seq),
+    INDEX idx_store_round (store_id, round),
+    CONSTRAINT fk_round_wins_store FOREIGN KEY (store_id)
+        REFERENCES lotto_stores (store_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='판매점 회차별 당첨 원장';
+
+-- 원장 트리거 활성 여부 (한 행)
+CREATE TABLE IF NOT EXISTS store_ledger_state (
+    id TINYINT PRIMARY KEY,
+    active TINYINT(1) NOT NULL DEFAULT 0 COMMENT '1: 원장이 lotto_stores 당첨 횟수의 기준',
+    activated_at TIMESTAMP NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='판매점 원장 상태';
+
+INSERT IGNORE INTO store_ledger_state (id, active) VALUES (1, 0);
+
+DROP TRIGGER IF EXISTS trg_round_wins_insert;
+DROP TRIGGER IF EXISTS trg_round_wins_delete;
+
+DELIMITER //
+
+CREATE TRIGGER trg_round_wins_insert AFTER INSERT ON store_round_wins
+FOR EACH ROW
+BEGIN
+    IF (SELECT active FROM store_ledger_state WHERE id = 1) THEN
+        UPDATE lotto_stores
+        SET wins_1st = wins_1st + (NEW.`rank` = 1),
+            wins_2nd = wins_2nd + (NEW.`rank` = 2),
+            total_wins = total_wins + 1
+        WHERE store_id = NEW.store_id;
+    END IF;
+END//
+
+CREATE TRIGGER trg_round_wins_delete AFTER DELETE ON store_round_wins
+FOR EACH ROW
+BEGIN
+    IF (SELECT active FROM store_ledger_state WHERE id = 1) THEN
+        UPDATE lotto_stores
+        SET wins_1st = wins_1st - (OLD.`rank` = 1),
+            wins_2nd = wins_2nd - (OLD.`rank` = 2),
+            total_wins = total_wins - 1
+        WHERE store_id = OLD.store_id;
+    END IF;
+END//
+
+DELIMITER ;
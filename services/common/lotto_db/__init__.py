@@ -0,0 +1,17 @@
+"""
+로또 서비스 공용 데이터 접근 패키지
+    
+    from lotto_db import BaseDatabase
+    
+    class Database(BaseDatabase):
+        def get_latest_numbers(self, limit=5):
+            return self.fetch_all("SELECT ... LIMIT %s", (limit,))
+"""
+from .pool import ConnectionPool, PoolTimeoutError, CONNECTION_ERRORS
+from .base import BaseDatabase
+from .local import LocalSnapshot, LocalFallback, with_local_snapshot
+
+__all__ = [
+    'ConnectionPool', 'PoolTimeoutError', 'CONNECTION_ERRORS', 'BaseDatabase',
+    'LocalSnapshot', 'LocalFallback', 'with_local_snapshot'
+]
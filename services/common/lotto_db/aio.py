@@ -0,0 +1,185 @@
+"""
+asyncio 기반 데이터 접근 계층 (aiomysql 커넥션 풀)
+
+ASGI 모드 서비스에서 사용합니다. 쿼리를 기다리는 동안 이벤트 루프가 다른 요청을
+처리하므로 요청마다 스레드를 점유하지 않고 느린 쿼리 수백 개를 동시에 기다릴 수 있습니다.
+동기 BaseDatabase와 같은 이름의 메서드를 제공합니다 (모두 코루틴).
+쿼리 지표와 느린 쿼리 로그도 BaseDatabase와 같은 방식으로 기록합니다 (query_stats).
+"""
+import os
+import time
+import logging
+from contextlib import contextmanager
+
+import aiomysql
+from aiomysql import Error, InterfaceError, OperationalError
+
+from .metrics import QueryMetrics, result_bytes
+
+logger = logging.getLogger(__name__)
+
+# 커넥션 자체가 끊겼음을 뜻하는 오류
+ASYNC_CONNECTION_ERRORS = (InterfaceError, OperationalError)
+
+
+class AsyncBaseDatabase:
+    """aiomysql 커넥션 풀 기반 비동기 데이터 접근 계층"""
+    
+    # 풀 이름 (지표/로그 구분용)
+    pool_name = 'lotto'
+    
+    def __init__(self, host, user, password, database, port=None,
+                 pool_size=None, pool_name=None):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.port = int(port or os.getenv('MYSQL_PORT', 3306))
+        self.min_size = int(os.getenv('MYSQL_POOL_MIN', 1))
+        self.max_size = int(pool_size or os.getenv('MYSQL_ASYNC_POOL_SIZE', 50))
+        self.name = pool_name or self.pool_name
+        self.pool = None
+        self.metrics = QueryMetrics(slow_ms=float(os.getenv('MYSQL_SLOW_QUERY_MS', 200)))
+    
+    async def connect(self):
+        """커넥션 풀 생성 (이벤트 루프 안에서 호출)"""
+        if self.pool is not None:
+            return True
+        try:
+            self.pool = await aiomysql.create_pool(
+                host=self.host,
+                port=self.port,
+                user=self.user,
+                password=self.password,
+                db=self.database,
+                minsize=self.min_size,
+                maxsize=self.max_size,
+                autocommit=True,
+                connect_timeout=10,
+                pool_recycle=3600,
+                charset='utf8mb4'
+            )
+            logger.info(f"MySQL 비동기 커넥션 풀 준비 완료 ({self.name})")
+            return True
+        except Error as e:
+            logger.error(f"데이터베이스 연결 실패: {e}")
+            return False
+    
+    async def disconnect(self):
+        """커넥션 풀 종료"""
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+            logger.info("MySQL 비동기 연결 종료")
+    
+    def pool_stats(self):
+        """커넥션 풀 지표"""
+        if self.pool is None:
+            return {"name": self.name, "size": 0, "idle": 0, "in_use": 0, "max_size": self.max_size,
+                    "query_counters": self.metrics.counters()}
+        return {
+            "name": self.name,
+            "size": self.pool.size,
+            "idle": self.pool.freesize,
+            "in_use": self.pool.size - self.pool.freesize,
+            "max_size": self.pool.maxsize,
+            "query_counters": self.metrics.counters()
+        }
+    
+    def query_stats(self, top=20):
+        """쿼리 형태별 실행 지표와 최근 느린 쿼리"""
+        return self.metrics.snapshot(top)
+    
+    @contextmanager
+    def _timed(self, query, params):
+        """쿼리 실행 시간 기록 (BaseDatabase._timed와 동일)"""
+        stat = {"rows": 0, "bytes": 0}
+        error = None
+        started = time.perf_counter()
+        try:
+            yield stat
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.metrics.record(
+                query, params, time.perf_counter() - started, stat["rows"], stat["bytes"], error)
+    
+    async def _run(self, fn, retries=1):
+        """풀 커넥션으로 await fn(conn) 실행 (끊긴 커넥션이면 새 커넥션으로 재시도)"""
+        if self.pool is None and not await self.connect():
+            raise InterfaceError("데이터베이스에 연결되어 있지 않습니다")
+        
+        for attempt in range(retries):
+            try:
+                async with self.pool.acquire() as conn:
+                    return await fn(conn)
+            except ASYNC_CONNECTION_ERRORS as e:
+                self.metrics.count("reconnects")
+                if attempt == retries - 1:
+                    raise
+                self.metrics.count("retries")
+                logger.warning(f"커넥션 오류, 재시도 ({attempt + 1}/{retries}): {e}")
+    
+    async def fetch_all(self, query, params=None, dictionary=True, retries=1):
+        """SELECT 결과 전체"""
+        async def run(conn):
+            cursor_class = aiomysql.DictCursor if dictionary else aiomysql.Cursor
+            async with conn.cursor(cursor_class) as cursor:
+                with self._timed(query, params) as stat:
+                    await cursor.execute(query, params)
+                    rows = await cursor.fetchall()
+                    stat["rows"] = len(rows)
+                    stat["bytes"] = result_bytes(rows)
+                return rows
+        return await self._run(run, retries)
+    
+    async def fetch_one(self, query, params=None, dictionary=False, retries=1):
+        """SELECT 결과 첫 행"""
+        async def run(conn):
+            cursor_class = aiomysql.DictCursor if dictionary else aiomysql.Cursor
+            async with conn.cursor(cursor_class) as cursor:
+                with self._timed(query, params) as stat:
+                    await cursor.execute(query, params)
+                    row = await cursor.fetchone()
+                    if row is not None:
+                        stat["rows"] = 1
+                        stat["bytes"] = result_bytes([row])
+                return row
+        return await self._run(run, retries)
+    
+    async def fetch_array(self, query, params=None, dtype='int32', chunk_size=1000, retries=1):
+        """SELECT 결과를 미리 할당한 정수 배열에 바로 채움 (BaseDatabase.fetch_array와 동일)"""
+        # numpy는 분석/예측 서비스에만 설치되어 있음
+        import numpy as np
+        
+        async def run(conn):
+            async with conn.cursor() as cursor:
+                with self._timed(query, params) as stat:
+                    await cursor.execute(query, params)
+                    out = np.empty((max(cursor.rowcount, 0), len(cursor.description)), dtype=dtype)
+                    filled = 0
+                    while True:
+                        rows = await cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        out[filled:filled + len(rows)] = rows
+                        filled += len(rows)
+                    stat["rows"] = filled
+                    stat["bytes"] = out[:filled].nbytes
+                return out[:filled]
+        return await self._run(run, retries)
+    
+    async def execute(self, query, params=None):
+        """단일 쓰기 쿼리
+        
+        반환값: (영향받은 행 수, lastrowid)
+        """
+        async def run(conn):
+            async with conn.cursor() as cursor:
+                with self._timed(query, params) as stat:
+                    await cursor.execute(query, params)
+                    stat["rows"] = max(cursor.rowcount, 0)
+                return cursor.rowcount, cursor.lastrowid
+        return await self._run(run)
@@ -0,0 +1,374 @@
+"""
+서비스별 Database 클래스의 공통 기반
+
+모든 쿼리는 공유 커넥션 풀에서 커넥션을 빌려 실행하고 바로 반납하므로
+여러 Flask 요청 스레드가 동시에 호출해도 하나의 커넥션을 공유하지 않습니다.
+
+MYSQL_REPLICA_HOST가 설정되면 읽기 쿼리는 별도의 복제본 풀로 보내고,
+복제본의 최신 회차가 primary보다 뒤처져 있으면 primary에서 읽습니다.
+
+모든 쿼리는 실행 시간/행 수/바이트를 쿼리 형태별로 기록하고 (query_stats),
+MYSQL_SLOW_QUERY_MS(ms) 이상 걸린 쿼리는 파라미터와 함께 로그로 남깁니다.
+"""
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+from mysql.connector import Error
+
+from .pool import ConnectionPool, CONNECTION_ERRORS
+from .metrics import QueryMetrics, result_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class BaseDatabase:
+    """커넥션 풀 기반 데이터 접근 계층"""
+    
+    # 풀 이름 (지표/로그 구분용)
+    pool_name = 'lotto'
+    
+    # 복제 지연 확인 쿼리 (복제본 값이 primary보다 작으면 뒤처진 것으로 판단)
+    replication_check_query = "SELECT COALESCE(MAX(round), 0) FROM lotto_numbers"
+    
+    # get_all_numbers 회차 정렬 (로컬 스냅샷도 같은 순서로 응답)
+    all_numbers_order = 'DESC'
+    
+    def __init__(self, host, user, password, database, port=None,
+                 pool_size=None, pool_name=None, replica_host=None, replica_port=None,
+                 lazy=False):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        name = pool_name or self.pool_name
+        self.pool = self._create_pool(
+            host, int(port or os.getenv('MYSQL_PORT', 3306)), pool_size, name)
+        
+        # 읽기 전용 복제본 풀 (없으면 primary에서 읽음)
+        replica_host = replica_host or os.getenv('MYSQL_REPLICA_HOST')
+        self.replica_pool = None
+        if replica_host:
+            replica_port = replica_port or os.getenv('MYSQL_REPLICA_PORT', 3306)
+            self.replica_pool = self._create_pool(
+                replica_host, int(replica_port), pool_size, f'{name}-replica')
+        
+        # 복제 지연 확인 결과 (MYSQL_REPLICA_CHECK초 동안 재사용)
+        self.replica_check_interval = float(os.getenv('MYSQL_REPLICA_CHECK', 5))
+        self._replica_lock = threading.Lock()
+        self._replica_checked_at = 0.0
+        self._replica_behind = False
+        self.metrics = QueryMetrics(slow_ms=float(os.getenv('MYSQL_SLOW_QUERY_MS', 200)))
+        # 스레드별 primary 연결 실패 횟수 (메서드가 오류를 잡아 빈 결과를 돌려줘도 장애를 알 수 있게)
+        self._failures = threading.local()
+        self._routing = {
+            "replica_reads": 0,
+            "primary_reads": 0,
+            "fallbacks": 0,
+            "lag_checks": 0,
+            "primary_round": None,
+            "replica_round": None
+        }
+        
+        # 초기 연결 시도 (lazy면 백그라운드에서 예열해 시작을 막지 않음)
+        if lazy:
+            threading.Thread(target=self.connect, name=f'{name}-warm-up', daemon=True).start()
+        else:
+            self.connect()
+    
+    def _create_pool(self, host, port, pool_size, name):
+        """환경 변수 설정으로 커넥션 풀 생성"""
+        return ConnectionPool(
+            host=host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            port=port,
+            min_size=int(os.getenv('MYSQL_POOL_MIN', 1)),
+            max_size=int(pool_size or os.getenv('MYSQL_POOL_SIZE', 10)),
+            timeout=float(os.getenv('MYSQL_POOL_TIMEOUT', 10)),
+            health_check_after=float(os.getenv('MYSQL_POOL_HEALTH_CHECK', 30)),
+            name=name
+        )
+    
+    def connect(self):
+        """데이터베이스 연결 (풀 예열)"""
+        if self.replica_pool is not None and not (
+                self.replica_pool.warm_up() or self.replica_pool.stats()["size"]):
+            logger.warning("MySQL 복제본 연결 실패 (primary에서 읽음)")
+        if self.pool.warm_up() or self.pool.stats()["size"]:
+            logger.info("MySQL 커넥션 풀 준비 완료")
+            return True
+        logger.error("데이터베이스 연결 실패")
+        return False
+    
+    def disconnect(self):
+        """데이터베이스 연결 종료"""
+        self.pool.close()
+        if self.replica_pool is not None:
+            self.replica_pool.close()
+        logger.info("MySQL 연결 종료")
+    
+    def pool_stats(self):
+        """커넥션 풀 지표 (복제본이 있으면 replica/routing 포함)"""
+        stats = self.pool.stats()
+        stats["query_counters"] = self.metrics.counters()
+        if self.replica_pool is not None:
+            stats["replica"] = self.replica_pool.stats()
+            stats["routing"] = dict(self._routing, replica_behind=self._replica_behind)
+        return stats
+    
+    def query_stats(self, top=20):
+        """쿼리 형태별 실행 지표와 최근 느린 쿼리"""
+        return self.metrics.snapshot(top)
+    
+    @contextmanager
+    def _timed(self, query, params):
+        """쿼리 실행 시간 기록 (블록 안에서 stat["rows"]/stat["bytes"] 채움)"""
+        stat = {"rows": 0, "bytes": 0}
+        error = None
+        started = time.perf_counter()
+        try:
+            yield stat
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.metrics.record(
+                query, params, time.perf_counter() - started, stat["rows"], stat["bytes"], error)
+    
+    def connection_failures(self):
+        """현재 스레드에서 primary 연결에 실패한 횟수 (LocalFallback이 호출 전후로 비교)"""
+        return getattr(self._failures, 'count', 0)
+    
+    def _run(self, fn, retries=1, pool=None):
+        """풀 커넥션으로 fn(conn) 실행 (끊긴 커넥션이면 새 커넥션으로 재시도)"""
+        pool = pool or self.pool
+        for attempt in range(retries):
+            try:
+                with pool.connection() as conn:
+                    return fn(conn)
+            except CONNECTION_ERRORS as e:
+                # 끊긴 커넥션은 풀에서 버려지고 다음 시도는 새 커넥션을 씀
+                self.metrics.count("reconnects")
+                if attempt == retries - 1:
+                    if pool is self.pool:
+                        self._failures.count = self.connection_failures() + 1
+                    raise
+                self.metrics.count("retries")
+                logger.warning(f"커넥션 오류, 재시도 ({attempt + 1}/{retries}): {e}")
+    
+    def _read(self, fn, retries=1, primary=False):
+        """읽기 쿼리 실행 (복제본이 최신이면 복제본, 아니면 primary)"""
+        if primary or self.replica_pool is None or self._replica_lagging():
+            if self.replica_pool is not None:
+                self._routing["primary_reads"] += 1
+            return self._run(fn, retries)
+        
+        try:
+            result = self._run(fn, retries, pool=self.replica_pool)
+            self._routing["replica_reads"] += 1
+            return result
+        except CONNECTION_ERRORS as e:
+            # 복제본 장애: 다음 확인 전까지 primary로 우회
+            logger.warning(f"복제본 읽기 실패, primary로 재시도: {e}")
+            self._mark_replica_behind()
+            self._routing["fallbacks"] += 1
+            return self._run(fn, retries)
+    
+    def _replica_lagging(self):
+        """복제본 최신 회차가 primary보다 뒤처졌는지 (replica_check_interval초 캐시)"""
+        if time.monotonic() - self._replica_checked_at < self.replica_check_interval:
+            return self._replica_behind
+        
+        # 한 스레드만 확인하고 나머지는 직전 결과 사용
+        if not self._replica_lock.acquire(blocking=False):
+            return self._replica_behind
+        try:
+            def latest(conn):
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(self.replication_check_query)
+                    row = cursor.fetchone()
+                    cursor.fetchall()
+                    return row[0] if row else 0
+                finally:
+                    cursor.close()
+            
+            try:
+                primary_round = self._run(latest)
+                replica_round = self._run(latest, pool=self.replica_pool)
+                behind = replica_round < primary_round
+                self._routing["primary_round"] = primary_round
+                self._routing["replica_round"] = replica_round
+                if behind and not self._replica_behind:
+                    logger.warning(
+                        f"복제본이 뒤처짐 (primary {primary_round}, replica {replica_round}), "
+                        f"primary에서 읽음")
+            except Error as e:
+                logger.warning(f"복제 지연 확인 실패, primary에서 읽음: {e}")
+                behind = True
+            
+            self._routing["lag_checks"] += 1
+            self._replica_behind = behind
+            self._replica_checked_at = time.monotonic()
+            return behind
+        finally:
+            self._replica_lock.release()
+    
+    def _mark_replica_behind(self):
+        """다음 지연 확인 전까지 primary에서 읽기"""
+        self._replica_behind = True
+        self._replica_checked_at = time.monotonic()
+    
+    def _invalidate_replica_check(self):
+        """쓰기 직후 다음 읽기에서 지연을 다시 확인 (read-your-writes)"""
+        self._replica_checked_at = 0.0
+    
+    def fetch_all(self, query, params=None, dictionary=True, retries=1, primary=False):
+        """SELECT 결과 전체"""
+        def run(conn):
+            cursor = conn.cursor(dictionary=dictionary)
+            try:
+                with self._timed(query, params) as stat:
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall()
+                    stat["rows"] = len(rows)
+                    stat["bytes"] = result_bytes(rows)
+                return rows
+            finally:
+                cursor.close()
+        return self._read(run, retries, primary)
+    
+    def fetch_one(self, query, params=None, dictionary=False, retries=1, primary=False):
+        """SELECT 결과 첫 행"""
+        def run(conn):
+            cursor = conn.cursor(dictionary=dictionary)
+            try:
+                with self._timed(query, params) as stat:
+                    cursor.execute(query, params)
+                    row = cursor.fetchone()
+                    cursor.fetchall()
+                    if row is not None:
+                        stat["rows"] = 1
+                        stat["bytes"] = result_bytes([row])
+                return row
+            finally:
+                cursor.close()
+        return self._read(run, retries, primary)
+    
+    def fetch_array(self, query, params=None, dtype='int32', chunk_size=1000, retries=1,
+                    primary=False):
+        """SELECT 결과를 미리 할당한 정수 배열에 바로 채움 (행마다 dict를 만들지 않음)
+        
+        NULL이 없는 정수 컬럼만 선택해야 합니다.
+        반환값: (행 수, 컬럼 수) numpy 배열
+        """
+        # numpy는 분석/예측 서비스에만 설치되어 있음
+        import numpy as np
+        
+        def run(conn):
+            # buffered 튜플 커서: 실행 직후 행 수를 알 수 있고 fetchmany 단위로만 변환
+            cursor = conn.cursor(buffered=True)
+            try:
+                with self._timed(query, params) as stat:
+                    cursor.execute(query, params)
+                    out = np.empty((max(cursor.rowcount, 0), len(cursor.description)), dtype=dtype)
+                    filled = 0
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        out[filled:filled + len(rows)] = rows
+                        filled += len(rows)
+                    stat["rows"] = filled
+                    stat["bytes"] = out[:filled].nbytes
+                return out[:filled]
+            finally:
+                cursor.close()
+        return self._read(run, retries, primary)
+    
+    def execute(self, query, params=None):
+        """단일 쓰기 쿼리 (하나의 트랜잭션으로 commit)
+        
+        반환값: (영향받은 행 수, lastrowid)
+        """
+        try:
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+                try:
+                    with self._timed(query, params) as stat:
+                        cursor.execute(query, params)
+                        stat["rows"] = max(cursor.rowcount, 0)
+                    return cursor.rowcount, cursor.lastrowid
+                finally:
+                    cursor.close()
+        finally:
+            self._invalidate_replica_check()
+    
+    def bulk_upsert(self, table, columns, rows, update_columns=None, chunk_size=500):
+        """다중 행 INSERT ... ON DUPLICATE KEY UPDATE (청크당 하나의 트랜잭션)
+        
+        rows: 컬럼 순서의 튜플을 내는 iterable (한 번에 chunk_size개씩만 메모리에 올림)
+        update_columns: 갱신할 컬럼명 또는 (컬럼명, 'SQL 식') 튜플 (기본값: 전체 컬럼)
+        반환값: {"rows", "chunks": [{"chunk", "rows", "affected", "elapsed_ms"}], "elapsed_ms"}
+        청크가 실패하면 그 청크만 rollback하고 중단하며 "error"를 함께 반환합니다
+        (rows는 commit된 행 수).
+        """
+        update_columns = columns if update_columns is None else update_columns
+        column_sql = ', '.join(f'`{c}`' for c in columns)
+        placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        update_sql = ', '.join(
+            f'`{c}` = VALUES(`{c}`)' if isinstance(c, str) else c[1] for c in update_columns
+        )
+        
+        summary = {"rows": 0, "chunks": [], "elapsed_ms": 0.0}
+        started = time.perf_counter()
+        iterator = iter(rows)
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            query = f"INSERT INTO {table} ({column_sql}) VALUES " + ', '.join([placeholder] * len(chunk))
+            if update_sql:
+                query += f" ON DUPLICATE KEY UPDATE {update_sql}"
+            params = [value for row in chunk for value in row]
+            # 청크 크기마다 쿼리 문자열이 달라지므로 지표는 테이블 단위로 묶음
+            label = f"INSERT INTO {table} ({column_sql}) VALUES ... (bulk)"
+            
+            chunk_started = time.perf_counter()
+            try:
+                with self.pool.transaction() as conn:
+                    cursor = conn.cursor()
+                    try:
+                        with self._timed(label, f'<{len(chunk)}행>') as stat:
+                            cursor.execute(query, params)
+                            affected = cursor.rowcount
+                            stat["rows"] = max(affected, 0)
+                    finally:
+                        cursor.close()
+            except Error as e:
+                # 실패한 청크는 rollback, 이전 청크는 이미 commit됨
+                logger.error(f"{table} 청크 {len(summary['chunks']) + 1} 저장 실패: {e}")
+                summary["error"] = str(e)
+                summary["failed_rows"] = len(chunk)
+                break
+            
+            elapsed_ms = (time.perf_counter() - chunk_started) * 1000
+            summary["rows"] += len(chunk)
+            summary["chunks"].append({
+                "chunk": len(summary["chunks"]) + 1,
+                "rows": len(chunk),
+                "affected": affected,
+                "elapsed_ms": round(elapsed_ms, 2)
+            })
+            logger.info(f"{table} 청크 {len(summary['chunks'])}: {len(chunk)}행 ({elapsed_ms:.1f}ms)")
+        
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        self._invalidate_replica_check()
+        return summary
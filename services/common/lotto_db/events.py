@@ -0,0 +1,187 @@
+"""
+새 회차 변경 피드 (Redis pub/sub + stream)
+
+데이터 수집 서비스가 회차를 저장하면 RoundEventPublisher가
+  - ROUND_STREAM에 XADD (재연결 시 놓친 이벤트를 따라잡는 내구 로그)
+  - ROUND_CHANNEL에 PUBLISH (구독 중인 서비스에 즉시 전달)
+합니다. 통계/ML 서비스는 RoundEventSubscriber로 구독해 메모리 구조와 캐시를 갱신합니다.
+
+이벤트: {"id": stream id, "rounds": [회차...], "round": 최신 회차, "version": 데이터 버전,
+        "source": 발행 서비스, "ts": 발행 시각}
+"""
+import os
+import json
+import time
+import logging
+import threading
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+ROUND_CHANNEL = 'lotto:rounds'
+ROUND_STREAM = 'lotto:rounds:stream'
+
+# 스트림 보관 길이 (대략)
+STREAM_MAXLEN = 1000
+
+
+def redis_from_env():
+    """REDIS_HOST/REDIS_PORT로 Redis 클라이언트 생성 (연결 실패 시 None)"""
+    try:
+        client = redis.Redis(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            decode_responses=True
+        )
+        client.ping()
+        return client
+    except redis.RedisError as e:
+        logger.error(f"Redis 연결 실패: {e}")
+        return None
+
+
+def _stream_id(value):
+    """'1700000000000-0' -> (1700000000000, 0) (비교용)"""
+    ms, _, seq = value.partition('-')
+    return int(ms), int(seq or 0)
+
+
+class RoundEventPublisher:
+    """회차 저장 이벤트 발행"""
+    
+    def __init__(self, client, source):
+        self.client = client
+        self.source = source
+    
+    def publish(self, rounds, version):
+        """회차 저장 이벤트 발행 (Redis 오류는 로그만 남기고 None 반환)"""
+        rounds = sorted({int(r) for r in rounds})
+        if not rounds or self.client is None:
+            return None
+        
+        event = {
+            "rounds": rounds,
+            "round": rounds[-1],
+            "version": version,
+            "source": self.source,
+            "ts": time.time()
+        }
+        try:
+            event_id = self.client.xadd(
+                ROUND_STREAM,
+                {"event": json.dumps(event)},
+                maxlen=STREAM_MAXLEN,
+                approximate=True
+            )
+            if isinstance(event_id, bytes):
+                event_id = event_id.decode()
+            event["id"] = event_id
+            receivers = self.client.publish(ROUND_CHANNEL, json.dumps(event))
+            logger.info(f"회차 이벤트 발행: {rounds[-1]}회 (버전 {version}, 구독 {receivers})")
+            return event
+        except redis.RedisError as e:
+            logger.error(f"회차 이벤트 발행 실패: {e}")
+            return None
+
+
+class RoundEventSubscriber:
+    """회차 저장 이벤트 구독 (백그라운드 스레드)
+    
+    구독 직후와 재연결 시마다 스트림에서 마지막으로 처리한 이벤트 이후를 따라잡으므로
+    Redis 연결이 잠깐 끊겨도 이벤트를 놓치지 않습니다 (id 기준 중복 제거).
+    handler(event)는 구독 스레드에서 순서대로 호출됩니다.
+    """
+    
+    def __init__(self, client, handler, name='rounds', retry_interval=5):
+        self.client = client
+        self.handler = handler
+        self.name = name
+        self.retry_interval = retry_interval
+        self.last_id = None
+        self.received = 0
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """구독 시작 (Redis가 없으면 False)"""
+        if self.client is None:
+            return False
+        try:
+            # 시작 시점 이후 이벤트만 처리 (기존 이력은 서비스가 시작하며 이미 로드함)
+            latest = self.client.xrevrange(ROUND_STREAM, count=1)
+            self.last_id = self._decode(latest[0][0]) if latest else '0-0'
+        except redis.RedisError as e:
+            logger.error(f"회차 이벤트 구독 실패: {e}")
+            return False
+        
+        self._thread = threading.Thread(
+            target=self._run, name=f'{self.name}-subscriber', daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self):
+        self._stop.set()
+    
+    def status(self):
+        return {"connected": self.connected, "last_id": self.last_id, "received": self.received}
+    
+    @staticmethod
+    def _decode(value):
+        return value.decode() if isinstance(value, bytes) else value
+    
+    def _run(self):
+        while not self._stop.is_set():
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(ROUND_CHANNEL)
+                self.connected = True
+                # 구독 후 따라잡기 (그 사이 발행된 이벤트는 id로 중복 제거)
+                self._catch_up()
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get('type') == 'message':
+                        self._receive(lambda: json.loads(self._decode(message['data'])))
+            except redis.RedisError as e:
+                logger.warning(f"회차 이벤트 구독 끊김, {self.retry_interval}초 후 재연결: {e}")
+                self._stop.wait(self.retry_interval)
+            finally:
+                self.connected = False
+                try:
+                    pubsub.close()
+                except redis.RedisError:
+                    pass
+    
+    def _catch_up(self):
+        """마지막 처리 id 이후 스트림 이벤트 처리"""
+        entries = self.client.xrange(ROUND_STREAM, min=f'({self.last_id}', max='+')
+        for entry_id, fields in entries:
+            self._receive(lambda: self._stream_event(entry_id, fields))
+    
+    def _stream_event(self, entry_id, fields):
+        fields = {self._decode(k): self._decode(v) for k, v in fields.items()}
+        event = json.loads(fields['event'])
+        event["id"] = self._decode(entry_id)
+        return event
+    
+    def _receive(self, decode):
+        """메시지 하나 해석 후 처리 (잘못된 메시지는 기록하고 건너뜀 -> 구독 스레드 유지)"""
+        try:
+            self._dispatch(decode())
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"잘못된 회차 이벤트 무시: {e}")
+        except Exception as e:
+            logger.error(f"회차 이벤트 수신 실패: {e}")
+    
+    def _dispatch(self, event):
+        event_id = event.get('id')
+        if event_id and self.last_id and _stream_id(event_id) <= _stream_id(self.last_id):
+            return
+        try:
+            self.handler(event)
+        except Exception as e:
+            logger.error(f"회차 이벤트 처리 실패 ({event.get('round')}회): {e}")
+        if event_id:
+            self.last_id = event_id
+        self.received += 1
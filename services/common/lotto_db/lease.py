@@ -0,0 +1,81 @@
+"""
+Redis lease (여러 복제본 중 하나만 작업 실행)
+
+    lease = RedisLease(client, 'lotto:draw-poller')
+    if lease.hold(ttl_ms=60000):   # 없으면 획득, 내가 가진 lease면 연장
+        ...
+    lease.release()
+
+키 값은 소유자 id이고, 연장/해제는 소유자가 같을 때만 원자적으로(Lua) 처리합니다.
+소유자가 죽으면 ttl 뒤에 만료되어 다른 복제본이 이어받습니다.
+"""
+import os
+import uuid
+import socket
+import logging
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# 비어 있으면 획득, 내 것이면 연장 (1: 보유, 0: 다른 소유자)
+_HOLD_SCRIPT = """
+local holder = redis.call('GET', KEYS[1])
+if holder == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if not holder then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# 내 것일 때만 삭제
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLease:
+    """만료 시간이 있는 단일 소유 lease"""
+    
+    def __init__(self, client, key):
+        self.client = client
+        self.key = key
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    
+    def hold(self, ttl_ms):
+        """lease 획득 또는 연장 (보유 여부 반환)
+        
+        Redis가 없거나 오류면 True (단일 인스턴스로 보고 실행, 중복 실행은 호출 쪽이 멱등이어야 함)
+        """
+        if self.client is None:
+            return True
+        try:
+            return bool(self.client.eval(_HOLD_SCRIPT, 1, self.key, self.owner, int(ttl_ms)))
+        except redis.RedisError as e:
+            logger.error(f"lease 확인 실패, lease 없이 진행 ({self.key}): {e}")
+            return True
+    
+    def release(self):
+        """내 lease면 해제"""
+        if self.client is None:
+            return
+        try:
+            self.client.eval(_RELEASE_SCRIPT, 1, self.key, self.owner)
+        except redis.RedisError as e:
+            logger.error(f"lease 해제 실패 ({self.key}): {e}")
+    
+    def holder(self):
+        """현재 소유자 id (없거나 Redis가 없으면 None)"""
+        if self.client is None:
+            return None
+        try:
+            return self.client.get(self.key)
+        except redis.RedisError:
+            return None
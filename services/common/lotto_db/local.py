@@ -0,0 +1,439 @@
+"""
+로컬 임베디드 스냅샷 (SQLite)
+
+lotto_numbers / lotto_stores를 서비스 로컬 SQLite 파일로 복제해 두고
+  - 서비스 시작 직후 (MySQL 풀이 준비되기 전)
+  - MySQL이 내려가 있는 동안
+  - MySQL 없이 모델을 학습할 때
+읽기 요청에 응답합니다. LocalFallback이 주기적으로 primary에서 변경분을 가져옵니다.
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import date
+from contextlib import contextmanager
+
+from mysql.connector import Error
+
+from .pool import CONNECTION_ERRORS
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lotto_numbers (
+    round INTEGER PRIMARY KEY,
+    draw_date TEXT NOT NULL,
+    number1 INTEGER NOT NULL,
+    number2 INTEGER NOT NULL,
+    number3 INTEGER NOT NULL,
+    number4 INTEGER NOT NULL,
+    number5 INTEGER NOT NULL,
+    number6 INTEGER NOT NULL,
+    bonus_number INTEGER
+);
+CREATE TABLE IF NOT EXISTS lotto_stores (
+    store_id INTEGER PRIMARY KEY,
+    store_name TEXT NOT NULL,
+    address TEXT,
+    region TEXT,
+    wins_1st INTEGER DEFAULT 0,
+    wins_2nd INTEGER DEFAULT 0,
+    total_wins INTEGER DEFAULT 0,
+    `rank` INTEGER DEFAULT 0,
+    latitude REAL,
+    longitude REAL,
+    phone TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stores_region ON lotto_stores (region);
+CREATE INDEX IF NOT EXISTS idx_stores_rank ON lotto_stores (`rank`);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+NUMBER_COLUMNS = (
+    'round', 'draw_date',
+    'number1', 'number2', 'number3', 'number4', 'number5', 'number6',
+    'bonus_number'
+)
+
+STORE_COLUMNS = (
+    'store_id', 'store_name', 'address', 'region',
+    'wins_1st', 'wins_2nd', 'total_wins', 'rank',
+    'latitude', 'longitude', 'phone'
+)
+
+
+def _dict_row(cursor, row):
+    """dict 행 (draw_date는 MySQL 커넥터처럼 date로)"""
+    result = {col[0]: value for col, value in zip(cursor.description, row)}
+    if isinstance(result.get('draw_date'), str):
+        result['draw_date'] = date.fromisoformat(result['draw_date'])
+    return result
+
+
+class LocalSnapshot:
+    """SQLite 스냅샷 (Database와 같은 이름의 조회 메서드 제공)"""
+    
+    # get_all_numbers 회차 정렬 (LocalFallback이 primary의 값으로 맞춤)
+    all_numbers_order = 'DESC'
+    
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+    
+    @contextmanager
+    def _connect(self, dictionary=False):
+        """호출마다 새 커넥션 (스레드 간 공유하지 않음, WAL로 읽기/쓰기 동시 진행)"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        if dictionary:
+            conn.row_factory = _dict_row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _fetch_all(self, query, params=(), dictionary=True):
+        with self._connect(dictionary) as conn:
+            return conn.execute(query, params).fetchall()
+    
+    def _fetch_one(self, query, params=()):
+        with self._connect() as conn:
+            return conn.execute(query, params).fetchone()
+    
+    def get_meta(self, key):
+        row = self._fetch_one("SELECT value FROM meta WHERE key = ?", (key,))
+        return row[0] if row else None
+    
+    def status(self):
+        """스냅샷 상태 (경로, 회차/판매점 수, 마지막 동기화 시각)"""
+        return {
+            "path": self.path,
+            "rounds": self._fetch_one("SELECT COUNT(*) FROM lotto_numbers")[0],
+            "stores": self._fetch_one("SELECT COUNT(*) FROM lotto_stores")[0],
+            "version": self.get_data_version(),
+            "synced_at": self.get_meta('synced_at')
+        }
+    
+    # ---- primary -> 로컬 동기화 ----
+    
+    def sync_from(self, primary):
+        """primary(BaseDatabase)에서 변경분 가져오기
+        
+        당첨 번호: 로컬 최신 회차 이후만 가져오고, 회차 수가 맞지 않으면 전체 재동기화
+        판매점: (행 수, 마지막 수정 시각)이 바뀌었을 때만 전체 교체
+        반환값: {"rounds": 추가된 회차 수, "stores": 교체된 판매점 수}
+        """
+        result = {"rounds": self._sync_numbers(primary), "stores": self._sync_stores(primary)}
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('synced_at', ?)",
+                (time.strftime('%Y-%m-%dT%H:%M:%S'),)
+            )
+        if result["rounds"] or result["stores"]:
+            logger.info(f"로컬 스냅샷 동기화: {result['rounds']}개 회차, {result['stores']}개 판매점")
+        return result
+    
+    def _sync_numbers(self, primary):
+        latest_round, count = primary.fetch_one(
+            "SELECT COALESCE(MAX(round), 0), COUNT(*) FROM lotto_numbers", primary=True)
+        local_round, local_count = self._fetch_one(
+            "SELECT COALESCE(MAX(round), 0), COUNT(*) FROM lotto_numbers")
+        if (latest_round, count) == (local_round, local_count):
+            return 0
+        
+        # 중간 회차가 새로 채워졌으면 (역방향 백필) 전체 재동기화
+        full = latest_round == local_round or count - local_count != self._count_above(
+            primary, local_round)
+        since = 0 if full else local_round
+        
+        query = f"""
+            SELECT {', '.join(NUMBER_COLUMNS)}
+            FROM lotto_numbers
+            WHERE round > %s
+            ORDER BY round ASC
+        """
+        rows = [
+            (r[0], r[1].strftime('%Y-%m-%d') if r[1] else None, *r[2:])
+            for r in primary.fetch_all(query, (since,), dictionary=False, primary=True)
+        ]
+        with self._connect() as conn:
+            if full:
+                conn.execute("DELETE FROM lotto_numbers")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO lotto_numbers ({', '.join(NUMBER_COLUMNS)}) "
+                f"VALUES ({', '.join(['?'] * len(NUMBER_COLUMNS))})",
+                rows
+            )
+        return len(rows)
+    
+    @staticmethod
+    def _count_above(primary, round_num):
+        return primary.fetch_one(
+            "SELECT COUNT(*) FROM lotto_numbers WHERE round > %s", (round_num,), primary=True)[0]
+    
+    def _sync_stores(self, primary):
+        count, updated_at = primary.fetch_one(
+            "SELECT COUNT(*), MAX(updated_at) FROM lotto_stores", primary=True)
+        version = f"{count}-{updated_at}"
+        if version == self.get_meta('stores_version'):
+            return 0
+        
+        columns = ', '.join(f'`{c}`' for c in STORE_COLUMNS)
+        rows = [
+            tuple(float(v) if i in (8, 9) and v is not None else v for i, v in enumerate(r))
+            for r in primary.fetch_all(f"SELECT {columns} FROM lotto_stores", dictionary=False, primary=True)
+        ]
+        with self._connect() as conn:
+            conn.execute("DELETE FROM lotto_stores")
+            conn.executemany(
+                f"INSERT INTO lotto_stores ({columns}) VALUES ({', '.join(['?'] * len(STORE_COLUMNS))})",
+                rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('stores_version', ?)", (version,))
+        return len(rows)
+    
+    # ---- 조회 (Database와 같은 이름/반환 형식) ----
+    
+    def get_latest_numbers(self, limit=5):
+        """최신 N회 당첨 번호 조회"""
+        return self._fetch_all(
+            f"SELECT {', '.join(NUMBER_COLUMNS)} FROM lotto_numbers ORDER BY round DESC LIMIT ?",
+            (limit,)
+        )
+    
+    def get_recent_numbers(self, limit=10):
+        """최근 N회 번호 조회"""
+        return self.get_latest_numbers(limit)
+    
+    def get_history(self, page=1, per_page=20):
+        """당첨 이력 조회 (페이지네이션)"""
+        return self._fetch_all(
+            f"SELECT {', '.join(NUMBER_COLUMNS)} FROM lotto_numbers "
+            f"ORDER BY round DESC LIMIT ? OFFSET ?",
+            (per_page, (page - 1) * per_page)
+        )
+    
+    def get_history_page(self, before_round=None, after_round=None, limit=20):
+        """당첨 이력 keyset 페이지"""
+        columns = f"SELECT {', '.join(NUMBER_COLUMNS)} FROM lotto_numbers"
+        if after_round is not None:
+            results = self._fetch_all(
+                columns + " WHERE round > ? ORDER BY round ASC LIMIT ?", (after_round, limit + 1))
+            has_newer = len(results) > limit
+            results = results[:limit][::-1]
+            has_older = self._fetch_one(
+                "SELECT 1 FROM lotto_numbers WHERE round <= ? LIMIT 1", (after_round,)) is not None
+        else:
+            if before_round is not None:
+                results = self._fetch_all(
+                    columns + " WHERE round < ? ORDER BY round DESC LIMIT ?", (before_round, limit + 1))
+            else:
+                results = self._fetch_all(columns + " ORDER BY round DESC LIMIT ?", (limit + 1,))
+            has_older = len(results) > limit
+            results = results[:limit]
+            has_newer = before_round is not None and self._fetch_one(
+                "SELECT 1 FROM lotto_numbers WHERE round >= ? LIMIT 1", (before_round,)) is not None
+        return results, has_older, has_newer
+    
+    def get_total_count(self):
+        """전체 회차 개수"""
+        return self._fetch_one("SELECT COUNT(*) FROM lotto_numbers")[0]
+    
+    def get_all_numbers(self):
+        """모든 로또 번호 조회"""
+        order = 'ASC' if self.all_numbers_order == 'ASC' else 'DESC'
+        return self._fetch_all(
+            f"SELECT {', '.join(NUMBER_COLUMNS)} FROM lotto_numbers ORDER BY round {order}")
+    
+    def get_data_version(self):
+        """데이터 버전 (최신 회차 + 전체 회차 수)"""
+        latest_round, count = self._fetch_one("SELECT MAX(round), COUNT(*) FROM lotto_numbers")
+        return f"{latest_round or 0}-{count}"
+    
+    def get_draw_matrix(self, game, since_round=0):
+        """회차 오름차순 정수 행렬 [round, 추첨일(epoch 일수), 번호..., 보너스...]"""
+        import numpy as np
+        
+        columns = ', '.join(
+            game.number_columns + [f'COALESCE({col}, 0)' for col in game.bonus_columns]
+        )
+        rows = self._fetch_all(
+            f"SELECT round, CAST(julianday(draw_date) - 2440587.5 AS INTEGER), {columns} "
+            f"FROM lotto_numbers WHERE round > ? ORDER BY round ASC",
+            (since_round,),
+            dictionary=False
+        )
+        return np.array(rows, dtype=np.int32).reshape(len(rows), 2 + game.picks + game.bonus)
+    
+    def get_number_matrix(self, limit=None):
+        """당첨 번호 (회차 수, 6) 정수 행렬 (회차 오름차순, limit이면 최근 limit회)"""
+        import numpy as np
+        
+        query = ("SELECT number1, number2, number3, number4, number5, number6 "
+                 "FROM lotto_numbers ORDER BY round DESC")
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        rows = self._fetch_all(query, params, dictionary=False)
+        return np.array(rows[::-1], dtype=np.int32).reshape(len(rows), 6)
+    
+    def get_round_matrix(self, since_round=0):
+        """(회차 수, 7) 정수 행렬 [round, number1..number6] (회차 오름차순, since_round 이후만)"""
+        import numpy as np
+        
+        rows = self._fetch_all(
+            "SELECT round, number1, number2, number3, number4, number5, number6 "
+            "FROM lotto_numbers WHERE round > ? ORDER BY round ASC",
+            (since_round,),
+            dictionary=False
+        )
+        return np.array(rows, dtype=np.int32).reshape(len(rows), 7)
+    
+    def get_all_stores(self):
+        """판매점 전체 (메모리 인덱스 구성용, 좌표 포함)"""
+        return self._fetch_all(
+            "SELECT store_id, store_name, address, region, wins_1st, wins_2nd, total_wins, `rank`, "
+            "latitude, longitude FROM lotto_stores"
+        )
+    
+    def get_top_stores(self, limit=100):
+        """상위 판매점 조회"""
+        return self._fetch_all(
+            "SELECT store_id, store_name, address, region, wins_1st, wins_2nd, total_wins, `rank` "
+            "FROM lotto_stores ORDER BY `rank` ASC, total_wins DESC LIMIT ?",
+            (limit,)
+        )
+    
+    def get_stores_by_region(self, region):
+        """지역별 판매점 조회"""
+        return self._fetch_all(
+            "SELECT store_id, store_name, address, region, wins_1st, wins_2nd, total_wins, `rank` "
+            "FROM lotto_stores WHERE region = ? ORDER BY total_wins DESC",
+            (region,)
+        )
+    
+    def get_region_stats(self):
+        """지역별 통계 (v_region_stats와 같은 컬럼)"""
+        return self._fetch_all("""
+            SELECT region,
+                   COUNT(*) AS store_count,
+                   SUM(wins_1st) AS total_1st_wins,
+                   SUM(wins_2nd) AS total_2nd_wins,
+                   SUM(total_wins) AS total_wins,
+                   AVG(wins_1st) AS avg_1st_wins,
+                   AVG(wins_2nd) AS avg_2nd_wins
+            FROM lotto_stores
+            WHERE region IS NOT NULL AND region != ''
+            GROUP BY region
+            ORDER BY total_wins DESC
+        """)
+
+
+class LocalFallback:
+    """MySQL Database 앞에 두는 프록시
+    
+    primary가 살아 있으면 그대로 위임하고, 시작 직후나 장애 중에는 로컬 스냅샷의
+    같은 이름 메서드로 응답합니다 (쓰기 메서드는 항상 primary).
+    Database 메서드는 연결 오류를 잡아 빈 결과를 돌려주므로, 예외 대신
+    primary.connection_failures()가 호출 중에 늘었는지로 장애를 판단합니다.
+    백그라운드 스레드가 interval초마다 primary 상태를 확인하고 스냅샷을 동기화합니다.
+    """
+    
+    def __init__(self, primary, local, interval=60):
+        self.primary = primary
+        self.local = local
+        local.all_numbers_order = getattr(primary, 'all_numbers_order', local.all_numbers_order)
+        self.interval = interval
+        self.primary_up = False
+        # 한 번이라도 동기화된 스냅샷만 대신 응답 (빈 파일이면 primary 시도)
+        self.local_ready = local.get_meta('synced_at') is not None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='local-snapshot-sync', daemon=True)
+        self._thread.start()
+    
+    def __getattr__(self, name):
+        attr = getattr(self.primary, name)
+        fallback = getattr(self.local, name, None)
+        if not callable(attr) or fallback is None:
+            return attr
+        
+        def call(*args, **kwargs):
+            if not self.primary_up and self.local_ready:
+                return fallback(*args, **kwargs)
+            failures = self._failures()
+            try:
+                result = attr(*args, **kwargs)
+            except CONNECTION_ERRORS as e:
+                logger.warning(f"MySQL 장애, 로컬 스냅샷으로 응답 ({name}): {e}")
+                self.primary_up = False
+                return fallback(*args, **kwargs)
+            if self._failures() != failures:
+                # 메서드가 연결 오류를 잡고 빈 결과를 돌려줌 -> 다음 동기화 확인까지 스냅샷으로 응답
+                logger.warning(f"MySQL 장애, 로컬 스냅샷으로 응답 ({name})")
+                self.primary_up = False
+                if self.local_ready:
+                    return fallback(*args, **kwargs)
+            return result
+        return call
+    
+    def _failures(self):
+        counter = getattr(self.primary, 'connection_failures', None)
+        return counter() if counter is not None else 0
+    
+    def pool_stats(self):
+        """커넥션 풀 지표 + 로컬 스냅샷 상태"""
+        stats = self.primary.pool_stats()
+        stats["local_snapshot"] = dict(self.local.status(), serving=not self.primary_up)
+        return stats
+    
+    def sync(self):
+        """primary 상태 확인 후 스냅샷 동기화 (primary 사용 가능 여부 반환)"""
+        try:
+            self.primary.fetch_one("SELECT 1", primary=True)
+        except Error as e:
+            if self.primary_up:
+                logger.warning(f"MySQL 연결 끊김, 로컬 스냅샷으로 전환: {e}")
+            self.primary_up = False
+            return False
+        
+        try:
+            self.local.sync_from(self.primary)
+            self.local_ready = True
+        except Error as e:
+            logger.error(f"로컬 스냅샷 동기화 실패: {e}")
+        
+        if not self.primary_up:
+            logger.info("MySQL 사용 가능, primary로 전환")
+        self.primary_up = True
+        return True
+    
+    def _loop(self):
+        while not self._stop.is_set():
+            self.sync()
+            self._stop.wait(self.interval)
+    
+    def stop(self):
+        self._stop.set()
+
+
+def with_local_snapshot(primary):
+    """LOCAL_SNAPSHOT_PATH가 설정되어 있으면 primary를 LocalFallback으로 감쌈"""
+    path = os.getenv('LOCAL_SNAPSHOT_PATH')
+    if not path:
+        return primary
+    return LocalFallback(
+        primary,
+        LocalSnapshot(path),
+        interval=float(os.getenv('LOCAL_SNAPSHOT_INTERVAL', 60))
+    )
@@ -0,0 +1,115 @@
+"""
+쿼리 단위 지표와 느린 쿼리 로그
+
+BaseDatabase가 모든 쿼리의 실행 시간, 반환 행 수, 가져온 바이트(대략)를
+쿼리 형태별로 누적합니다. slow_ms 이상 걸린 쿼리는 파라미터와 함께 로그로 남기고
+최근 목록에도 보관합니다. 인덱스 추가 여부를 판단할 근거 자료용입니다.
+"""
+import time
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger('lotto_db.slow_query')
+
+# 지표를 따로 모을 최대 쿼리 형태 수 (넘으면 '(other)'로 합침)
+MAX_FINGERPRINTS = 200
+
+# 로그/지표에 남길 파라미터 최대 길이
+MAX_PARAMS_LENGTH = 500
+
+
+def fingerprint(query):
+    """공백을 정규화한 쿼리 형태"""
+    return ' '.join(query.split())[:300]
+
+
+def result_bytes(rows):
+    """결과 대략 크기 (문자열/바이트는 길이, 나머지는 8바이트)"""
+    total = 0
+    for row in rows:
+        for value in (row.values() if isinstance(row, dict) else row):
+            total += len(value) if isinstance(value, (str, bytes, bytearray)) else 8
+    return total
+
+
+class QueryMetrics:
+    """쿼리 형태별 실행 지표 (스레드 안전)"""
+    
+    def __init__(self, slow_ms=200, slow_log_size=50):
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._queries = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._counters = {"executed": 0, "errors": 0, "slow": 0, "retries": 0, "reconnects": 0}
+    
+    def count(self, name, value=1):
+        """retries / reconnects 등 카운터 증가"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+    
+    def counters(self):
+        """전체 카운터 (executed/errors/slow/retries/reconnects)"""
+        with self._lock:
+            return dict(self._counters)
+    
+    def record(self, query, params, elapsed, rows=0, nbytes=0, error=None):
+        """쿼리 1회 실행 기록"""
+        elapsed_ms = elapsed * 1000
+        key = fingerprint(query)
+        slow = elapsed_ms >= self.slow_ms
+        
+        with self._lock:
+            stats = self._queries.get(key)
+            if stats is None:
+                if len(self._queries) >= MAX_FINGERPRINTS:
+                    key = '(other)'
+                stats = self._queries.setdefault(key, {
+                    "calls": 0, "errors": 0, "slow": 0,
+                    "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "bytes": 0
+                })
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["rows"] += rows
+            stats["bytes"] += nbytes
+            self._counters["executed"] += 1
+            if error is not None:
+                stats["errors"] += 1
+                self._counters["errors"] += 1
+            if slow:
+                stats["slow"] += 1
+                self._counters["slow"] += 1
+        
+        if slow:
+            params_text = repr(params)[:MAX_PARAMS_LENGTH]
+            self._slow.append({
+                "query": key,
+                "params": params_text,
+                "elapsed_ms": round(elapsed_ms, 2),
+                "rows": rows,
+                "error": str(error) if error is not None else None,
+                "at": time.strftime('%Y-%m-%dT%H:%M:%S')
+            })
+            logger.warning(
+                f"느린 쿼리 {elapsed_ms:.1f}ms (행 {rows}, {nbytes}B): {key} | params={params_text}")
+    
+    def snapshot(self, top=20):
+        """지표 요약 (총 실행 시간 기준 상위 top개 쿼리 형태 + 최근 느린 쿼리)"""
+        counters = self.counters()
+        with self._lock:
+            queries = [dict(stats, query=key) for key, stats in self._queries.items()]
+            slow = list(self._slow)
+        
+        queries.sort(key=lambda q: q["total_ms"], reverse=True)
+        for q in queries:
+            q["avg_ms"] = round(q["total_ms"] / q["calls"], 3) if q["calls"] else 0.0
+            q["total_ms"] = round(q["total_ms"], 3)
+            q["max_ms"] = round(q["max_ms"], 3)
+        
+        return dict(
+            counters,
+            slow_query_ms=self.slow_ms,
+            queries=queries[:top],
+            slow_queries=slow[::-1]
+        )
@@ -0,0 +1,258 @@
+"""
+스레드 안전한 MySQL 커넥션 풀
+
+요청(스레드)마다 커넥션을 빌려 쓰고 반납합니다. 풀 크기는 max_size로 제한되며,
+오래 쉬고 있던 커넥션만 반납/대여 시점에 ping으로 상태를 확인합니다
+(매 쿼리마다 is_connected()로 왕복하지 않음).
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import errors
+
+logger = logging.getLogger(__name__)
+
+# 커넥션 자체가 끊겼음을 뜻하는 오류 (풀에 돌려보내지 않고 폐기)
+CONNECTION_ERRORS = (errors.InterfaceError, errors.OperationalError)
+
+
+class PoolTimeoutError(errors.PoolError):
+    """풀에서 커넥션을 제한 시간 안에 얻지 못함"""
+
+
+class ConnectionPool:
+    """크기 제한이 있는 MySQL 커넥션 풀"""
+    
+    def __init__(self, host, user, password, database, port=3306,
+                 min_size=1, max_size=10, timeout=10, health_check_after=30,
+                 max_lifetime=3600, name='lotto', **connect_args):
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.max_lifetime = max_lifetime
+        self.connect_args = {
+            "host": host,
+            "port": port,
+            "user": user,
+            "password": password,
+            "database": database,
+            "autocommit": True,
+            "connect_timeout": 10,
+            "use_pure": True,
+            **connect_args
+        }
+        
+        # (커넥션, 생성 시각, 마지막 반납 시각)
+        self._idle = deque()
+        self._created_at = {}
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        
+        self._metrics = {
+            "created": 0,
+            "closed": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "timeouts": 0,
+            "health_checks": 0,
+            "health_check_failures": 0,
+            "discarded": 0
+        }
+    
+    def warm_up(self):
+        """min_size만큼 커넥션 미리 생성 (실패해도 예외 없음)"""
+        created = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return created
+                self._size += 1
+            try:
+                conn = self._create()
+            except errors.Error as e:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                logger.error(f"[{self.name}] 커넥션 생성 실패: {e}")
+                return created
+            now = time.monotonic()
+            with self._cond:
+                self._idle.append((conn, now, now))
+                self._cond.notify()
+            created += 1
+    
+    def _create(self):
+        conn = mysql.connector.connect(**self.connect_args)
+        with self._cond:
+            self._metrics["created"] += 1
+        return conn
+    
+    def _destroy(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            self._size -= 1
+            self._metrics["closed"] += 1
+            self._cond.notify()
+    
+    def _healthy(self, conn, created_at, idle_since):
+        """대여 전 상태 확인 (오래 쉰 커넥션만 ping)"""
+        now = time.monotonic()
+        if self.max_lifetime and now - created_at > self.max_lifetime:
+            return False
+        if now - idle_since < self.health_check_after:
+            return True
+        
+        with self._cond:
+            self._metrics["health_checks"] += 1
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            with self._cond:
+                self._metrics["health_check_failures"] += 1
+            return False
+    
+    def acquire(self, timeout=None):
+        """커넥션 대여 (풀이 가득 차면 timeout초 대기)"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited_from = None
+        
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise errors.PoolError(f"[{self.name}] 풀이 닫혔습니다")
+                
+                while not self._idle and self._size >= self.max_size:
+                    if waited_from is None:
+                        waited_from = time.monotonic()
+                        self._metrics["waits"] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"[{self.name}] 커넥션 대기 시간 초과 ({timeout}초, 최대 {self.max_size}개)"
+                        )
+                    self._cond.wait(remaining)
+                
+                if waited_from is not None:
+                    self._metrics["wait_time_total"] += time.monotonic() - waited_from
+                    waited_from = None
+                
+                if self._idle:
+                    # 가장 최근에 반납된 커넥션부터 사용 (LIFO)
+                    conn, created_at, idle_since = self._idle.pop()
+                    fresh = False
+                else:
+                    self._size += 1
+                    conn = None
+                    fresh = True
+            
+            if fresh:
+                try:
+                    conn = self._create()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                created_at = time.monotonic()
+            elif not self._healthy(conn, created_at, idle_since):
+                self._discard(conn)
+                continue
+            
+            with self._cond:
+                self._metrics["checkouts"] += 1
+                self._created_at[id(conn)] = created_at
+            return conn
+    
+    def release(self, conn, broken=False):
+        """커넥션 반납 (끊긴 커넥션은 폐기)"""
+        if broken or self._closed:
+            self._discard(conn)
+            return
+        
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        
+        with self._cond:
+            created_at = self._created_at.pop(id(conn), time.monotonic())
+            self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+    
+    def _discard(self, conn):
+        with self._cond:
+            self._metrics["discarded"] += 1
+        self._destroy(conn)
+    
+    @contextmanager
+    def connection(self):
+        """with pool.connection() as conn: ... (끝나면 자동 반납)"""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except CONNECTION_ERRORS:
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken=broken)
+    
+    @contextmanager
+    def transaction(self):
+        """하나의 트랜잭션 (정상 종료 시 commit, 예외 시 rollback)"""
+        with self.connection() as conn:
+            conn.start_transaction()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+    
+    def close(self):
+        """유휴 커넥션 모두 종료 (대여 중인 커넥션은 반납 시 종료)"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._destroy(conn)
+    
+    def stats(self):
+        """풀 지표"""
+        with self._cond:
+            idle = len(self._idle)
+            metrics = dict(self._metrics)
+            size = self._size
+        metrics.update({
+            "name": self.name,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "max_size": self.max_size,
+            "avg_wait_ms": round(metrics["wait_time_total"] / metrics["waits"] * 1000, 3)
+            if metrics["waits"] else 0.0
+        })
+        metrics["wait_time_total"] = round(metrics["wait_time_total"], 6)
+        return metrics
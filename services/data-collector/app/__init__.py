@@ -1 +1,9 @@
 # Data Collector Service
+import os
+import sys
+
+# 공용 데이터 접근 패키지 (services/common/lotto_db)
+# 컨테이너에서는 /app/lotto_db로 복사되므로 로컬 실행 시에만 경로 추가
+_COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'common'))
+if os.path.isdir(_COMMON_DIR) and _COMMON_DIR not in sys.path:
+    sys.path.append(_COMMON_DIR)
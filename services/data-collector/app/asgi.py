@@ -0,0 +1,210 @@
+"""
+데이터 수집 서비스 ASGI 모드 (조회 전용)
+
+    hypercorn app.asgi:app --bind 0.0.0.0:8001
+
+조회 API를 aiomysql 비동기 풀로 처리합니다. 하나의 프로세스가 느린 쿼리를
+요청마다 스레드를 점유하지 않고 동시에 기다립니다. 크롤링, 일괄 저장, 스케줄러는
+WSGI 앱(app.main)에서 계속 담당합니다.
+"""
+from quart import Quart, jsonify, request
+from quart_cors import cors
+import os
+import logging
+from .async_database import AsyncDatabase
+from .pagination import clamp_per_page, encode_cursor, decode_cursor, DEFAULT_PER_PAGE
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+app = cors(Quart(__name__))
+
+# 비동기 데이터베이스 (풀은 서버 시작 시 이벤트 루프 안에서 생성)
+db = AsyncDatabase(
+    host=os.getenv('MYSQL_HOST', 'localhost'),
+    user=os.getenv('MYSQL_USER', 'root'),
+    password=os.getenv('MYSQL_PASSWORD', ''),
+    database=os.getenv('MYSQL_DATABASE', 'lotto_db')
+)
+
+
+@app.before_serving
+async def startup():
+    await db.connect()
+
+
+@app.after_serving
+async def shutdown():
+    await db.disconnect()
+
+
+@app.route('/health', methods=['GET'])
+async def health_check():
+    """헬스 체크"""
+    return jsonify({"status": "healthy", "service": "data-collector", "mode": "asgi"}), 200
+
+
+@app.route('/db/pool', methods=['GET'])
+async def get_pool_stats():
+    """DB 커넥션 풀 지표"""
+    return jsonify({"success": True, "pool": db.pool_stats()}), 200
+
+
+@app.route('/db/queries', methods=['GET'])
+async def get_query_stats():
+    """쿼리 형태별 실행 지표와 최근 느린 쿼리"""
+    top = request.args.get('top', 20, type=int)
+    return jsonify({"success": True, "queries": db.query_stats(top)}), 200
+
+
+@app.route('/latest', methods=['GET'])
+async def get_latest():
+    """최신 5회 당첨 번호 조회"""
+    try:
+        limit = request.args.get('limit', 5, type=int)
+        results = await db.get_latest_numbers(limit)
+        
+        return jsonify({
+            "success": True,
+            "count": len(results),
+            "data": results
+        }), 200
+    except Exception as e:
+        logger.error(f"조회 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/history', methods=['GET'])
+async def get_history():
+    """당첨 이력 조회 (커서 또는 페이지 번호 기반 페이지네이션)"""
+    try:
+        per_page = clamp_per_page(request.args.get('per_page', DEFAULT_PER_PAGE, type=int))
+        page = request.args.get('page', type=int)
+        cursor = request.args.get('cursor')
+        before_round = request.args.get('before_round', type=int)
+        after_round = request.args.get('after_round', type=int)
+        
+        if cursor:
+            try:
+                direction, round_num = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+            if direction == 'before':
+                before_round, after_round = round_num, None
+            else:
+                before_round, after_round = None, round_num
+        
+        keyset = bool(cursor) or before_round is not None or after_round is not None
+        if page and not keyset:
+            # 기존 page/per_page 방식 (OFFSET)
+            results = await db.get_history(max(page, 1), per_page)
+            has_older = len(results) == per_page
+            has_newer = page > 1
+        else:
+            results, has_older, has_newer = await db.get_history_page(
+                before_round=before_round,
+                after_round=after_round,
+                limit=per_page
+            )
+        
+        next_cursor = encode_cursor('before', results[-1]['round']) if results and has_older else None
+        prev_cursor = encode_cursor('after', results[0]['round']) if results and has_newer else None
+        
+        return jsonify({
+            "success": True,
+            "page": None if keyset else max(page or 1, 1),
+            "per_page": per_page,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "data": results
+        }), 200
+    except Exception as e:
+        logger.error(f"조회 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/stats/count', methods=['GET'])
+async def get_count():
+    """전체 회차 개수"""
+    try:
+        count = await db.get_total_count()
+        
+        return jsonify({
+            "success": True,
+            "total_rounds": count
+        }), 200
+    except Exception as e:
+        logger.error(f"조회 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/stores/top', methods=['GET'])
+async def get_top_stores():
+    """상위 판매점 조회"""
+    try:
+        limit = request.args.get('limit', 100, type=int)
+        stores = await db.get_top_stores(limit)
+        
+        return jsonify({
+            "success": True,
+            "count": len(stores),
+            "data": stores
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"판매점 조회 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/stores/region/<region>', methods=['GET'])
+async def get_stores_by_region(region):
+    """지역별 판매점 조회"""
+    try:
+        stores = await db.get_stores_by_region(region)
+        
+        return jsonify({
+            "success": True,
+            "region": region,
+            "count": len(stores),
+            "data": stores
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"지역별 판매점 조회 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/stores/stats/region', methods=['GET'])
+async def get_region_stats():
+    """지역별 통계"""
+    try:
+        stats = await db.get_region_stats()
+        
+        return jsonify({
+            "success": True,
+            "count": len(stats),
+            "data": stats
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"지역별 통계 조회 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
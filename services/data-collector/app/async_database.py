@@ -0,0 +1,154 @@
+from lotto_db.aio import AsyncBaseDatabase, Error
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _format_dates(rows):
+    """datetime을 문자열로 변환"""
+    for row in rows:
+        if row['draw_date']:
+            row['draw_date'] = row['draw_date'].strftime('%Y-%m-%d')
+    return rows
+
+
+class AsyncDatabase(AsyncBaseDatabase):
+    """데이터 수집 서비스 비동기 DB 접근 (ASGI 모드 조회 전용)"""
+    
+    pool_name = 'data-collector-async'
+    
+    async def get_latest_numbers(self, limit=5):
+        """최신 N회 당첨 번호 조회"""
+        try:
+            query = """
+                SELECT round, draw_date,
+                       number1, number2, number3, number4, number5, number6, bonus_number
+                FROM lotto_numbers
+                ORDER BY round DESC
+                LIMIT %s
+            """
+            return _format_dates(await self.fetch_all(query, (limit,)))
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return []
+    
+    async def get_history(self, page=1, per_page=20):
+        """당첨 이력 조회 (페이지네이션)"""
+        try:
+            offset = (page - 1) * per_page
+            query = """
+                SELECT round, draw_date,
+                       number1, number2, number3, number4, number5, number6, bonus_number
+                FROM lotto_numbers
+                ORDER BY round DESC
+                LIMIT %s OFFSET %s
+            """
+            return _format_dates(await self.fetch_all(query, (per_page, offset)))
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return []
+    
+    async def get_history_page(self, before_round=None, after_round=None, limit=20):
+        """당첨 이력 keyset 페이지 (Database.get_history_page와 동일)"""
+        try:
+            columns = """
+                SELECT round, draw_date,
+                       number1, number2, number3, number4, number5, number6, bonus_number
+                FROM lotto_numbers
+            """
+            if after_round is not None:
+                query = columns + " WHERE round > %s ORDER BY round ASC LIMIT %s"
+                results = await self.fetch_all(query, (after_round, limit + 1))
+                has_newer = len(results) > limit
+                results = results[:limit][::-1]
+                has_older = await self._round_exists(
+                    "SELECT 1 FROM lotto_numbers WHERE round <= %s LIMIT 1", after_round)
+            else:
+                if before_round is not None:
+                    query = columns + " WHERE round < %s ORDER BY round DESC LIMIT %s"
+                    results = await self.fetch_all(query, (before_round, limit + 1))
+                else:
+                    query = columns + " ORDER BY round DESC LIMIT %s"
+                    results = await self.fetch_all(query, (limit + 1,))
+                has_older = len(results) > limit
+                results = results[:limit]
+                has_newer = before_round is not None and await self._round_exists(
+                    "SELECT 1 FROM lotto_numbers WHERE round >= %s LIMIT 1", before_round)
+            
+            return _format_dates(list(results)), has_older, has_newer
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return [], False, False
+    
+    async def _round_exists(self, query, round_num):
+        """인덱스 범위 존재 여부 (1행만 확인)"""
+        return await self.fetch_one(query, (round_num,)) is not None
+    
+    async def get_total_count(self):
+        """전체 회차 개수"""
+        try:
+            row = await self.fetch_one("SELECT COUNT(*) FROM lotto_numbers")
+            return row[0]
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return 0
+    
+    async def get_all_numbers(self):
+        """모든 로또 번호 조회"""
+        try:
+            query = """
+                SELECT round, draw_date,
+                       number1, number2, number3, number4, number5, number6, bonus_number
+                FROM lotto_numbers
+                ORDER BY round DESC
+            """
+            return _format_dates(await self.fetch_all(query))
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return []
+    
+    async def get_top_stores(self, limit=100):
+        """상위 판매점 조회"""
+        try:
+            query = """
+                SELECT store_id, store_name, address, region,
+                       wins_1st, wins_2nd, total_wins, `rank`
+                FROM lotto_stores
+                ORDER BY `rank` ASC, total_wins DESC
+                LIMIT %s
+            """
+            return await self.fetch_all(query, (limit,), retries=3)
+        except Error as e:
+            logger.error(f"판매점 조회 실패: {e}")
+            return []
+    
+    async def get_stores_by_region(self, region):
+        """지역별 판매점 조회"""
+        try:
+            query = """
+                SELECT store_id, store_name, address, region,
+                       wins_1st, wins_2nd, total_wins, `rank`
+                FROM lotto_stores
+                WHERE region = %s
+                ORDER BY total_wins DESC
+            """
+            return await self.fetch_all(query, (region,))
+        except Error as e:
+            logger.error(f"지역별 판매점 조회 실패: {e}")
+            return []
+    
+    async def get_region_stats(self):
+        """지역별 통계 (요약 테이블 조회)"""
+        try:
+            query = """
+                SELECT region, store_count, total_1st_wins, total_2nd_wins, total_wins,
+                       total_1st_wins / store_count AS avg_1st_wins,
+                       total_2nd_wins / store_count AS avg_2nd_wins
+                FROM lotto_region_stats
+                WHERE store_count > 0
+                ORDER BY total_wins DESC
+            """
+            return await self.fetch_all(query, retries=3)
+        except Error as e:
+            logger.error(f"지역별 통계 조회 실패: {e}")
+            return []
@@ -0,0 +1,119 @@
+"""
+크롤링 체크포인트 (SQLite)
+
+회차 페이지를 받는 즉시 그 회차의 파싱 결과를 한 트랜잭션으로 저장하고 완료로 표시합니다.
+중간에 죽거나 타임아웃이 나도 다음 실행은 완료되지 않은 회차만 가져오고,
+DB 원장(store_round_wins)에 아직 반영되지 않은 회차는 저장된 결과로 네트워크 없이 반영합니다.
+
+CRAWL_CHECKPOINT_PATH로 파일 위치를 지정합니다 (기본 crawl_checkpoint.sqlite3).
+"""
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_rounds (
+    kind TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    items INTEGER NOT NULL,
+    crawled_at TEXT NOT NULL,
+    PRIMARY KEY (kind, round)
+);
+CREATE TABLE IF NOT EXISTS crawl_round_stores (
+    round INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    store_name TEXT NOT NULL,
+    address TEXT,
+    region TEXT,
+    method TEXT,
+    PRIMARY KEY (round, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_round_stores_store ON crawl_round_stores (store_name, address);
+"""
+
+# 1등 배출점 크롤링 체크포인트 종류
+STORES_KIND = 'stores'
+
+
+class CrawlCheckpoint:
+    """회차 단위 크롤링 진행 상황과 결과"""
+    
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # 이전 버전 파일에는 method 컬럼이 없음
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(crawl_round_stores)")}
+            if 'method' not in columns:
+                conn.execute("ALTER TABLE crawl_round_stores ADD COLUMN method TEXT")
+    
+    @classmethod
+    def from_env(cls):
+        return cls(os.getenv('CRAWL_CHECKPOINT_PATH', 'crawl_checkpoint.sqlite3'))
+    
+    @contextmanager
+    def _connect(self):
+        """호출마다 새 커넥션 (스레드 간 공유하지 않음)"""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def done_rounds(self, kind, start_round, end_round):
+        """범위 안에서 완료된 회차 집합 (결과가 비어 있는 회차는 다시 받도록 제외)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT round FROM crawl_rounds WHERE kind = ? AND round BETWEEN ? AND ? AND items > 0",
+                (kind, start_round, end_round)
+            ).fetchall()
+        return {row[0] for row in rows}
+    
+    def save_store_round(self, round_num, winners):
+        """회차의 1등 배출점 [(store_name, address, region, method)] 저장 + 완료 표시 (한 트랜잭션)"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM crawl_round_stores WHERE round = ?", (round_num,))
+            conn.executemany(
+                "INSERT INTO crawl_round_stores (round, seq, store_name, address, region, method) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(round_num, seq, name, address, region, method)
+                 for seq, (name, address, region, method) in enumerate(winners)]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO crawl_rounds (kind, round, items, crawled_at) VALUES (?, ?, ?, ?)",
+                (STORES_KIND, round_num, len(winners), datetime.now().isoformat(timespec='seconds'))
+            )
+    
+    def store_round(self, round_num):
+        """저장된 회차의 1등 배출점 [(store_name, address, region, method)] (페이지 순서)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT store_name, address, region, method FROM crawl_round_stores "
+                "WHERE round = ? ORDER BY seq",
+                (round_num,)
+            ).fetchall()
+        return [tuple(row) for row in rows]
+    
+    def status(self, kind=STORES_KIND):
+        """완료 회차 수/범위, 마지막 저장 시각"""
+        with self._connect() as conn:
+            count, first, last, updated = conn.execute(
+                "SELECT COUNT(*), MIN(round), MAX(round), MAX(crawled_at) FROM crawl_rounds WHERE kind = ?",
+                (kind,)
+            ).fetchone()
+        return {
+            "path": self.path,
+            "kind": kind,
+            "rounds": count,
+            "first_round": first,
+            "last_round": last,
+            "updated_at": updated
+        }
@@ -0,0 +1,153 @@
+"""
+당첨 번호 일괄 수집 CLI (서비스 코드를 프로세스 안에서 직접 실행)
+
+    python -m app.cli                      # 최신 회차 1개
+    python -m app.cli 1196                 # 특정 회차
+    python -m app.cli 1180 1196            # 구간 전체 다시 수집
+    python -m app.cli 1 1196 --missing     # 구간 중 DB에 없거나 불완전한 회차만
+    python -m app.cli --missing            # 1회 ~ 최신 중 빠진 회차만
+
+    # 호스트에서
+    sudo docker exec data-collector-service python -m app.cli 1 1196 --missing
+
+DrawCrawler의 동시 수집과 bulk_insert_lotto_numbers 일괄 저장을 그대로 쓰고,
+진행 상황(처리 회차, 초당 회차, ETA)은 stderr로, 끝나면 요약 JSON 한 줄을 stdout으로 출력합니다.
+종료 코드: 0 전체 성공, 1 실패 회차 또는 저장 오류, 2 인자 오류, 130 중단
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+
+from lotto_db.events import RoundEventPublisher, redis_from_env
+
+from .database import Database
+from .draw_crawler import DrawCrawler
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressPrinter:
+    """progress(done, total) 콜백 - interval초마다 한 줄씩 stderr에 출력"""
+    
+    def __init__(self, stream=sys.stderr, interval=1.0, enabled=True):
+        self.stream = stream
+        self.interval = interval
+        self.enabled = enabled
+        self.started = time.time()
+        self.done = 0
+        self.total = 0
+        self._last = 0.0
+    
+    def __call__(self, done, total):
+        self.done, self.total = done, total
+        now = time.time()
+        if self.enabled and (done >= total or now - self._last >= self.interval):
+            self._last = now
+            self.stream.write(self.line() + "\n")
+            self.stream.flush()
+    
+    def rate(self):
+        elapsed = time.time() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+    
+    def line(self):
+        rate = self.rate()
+        percent = self.done * 100 / self.total if self.total else 100.0
+        eta = f"{(self.total - self.done) / rate:.0f}초" if rate > 0 and self.done < self.total else "-"
+        return f"[{self.done}/{self.total} {percent:5.1f}%] {rate:.1f}회/초, ETA {eta}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m app.cli',
+        description='당첨 번호 일괄 수집 (결과 요약은 stdout JSON)'
+    )
+    parser.add_argument(
+        'rounds', nargs='*', type=int,
+        help='수집할 회차 (없음: 최신, 1개: 특정 회차, 2개: 구간)'
+    )
+    parser.add_argument(
+        '--missing', action='store_true',
+        help='DB에 없거나 보너스 번호가 빠진 회차만 수집 (회차 없이 쓰면 1회 ~ 최신)'
+    )
+    parser.add_argument('--chunk-size', type=int, default=None, help='일괄 저장 청크 크기 (기본 BULK_CHUNK_SIZE)')
+    parser.add_argument('--progress-interval', type=float, default=1.0, help='진행 출력 간격 (초)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='진행/로그 출력 없이 요약만')
+    
+    args = parser.parse_args(argv)
+    if len(args.rounds) > 2:
+        parser.error("회차는 최대 2개 (시작 끝)")
+    if len(args.rounds) == 2 and args.rounds[0] > args.rounds[1]:
+        parser.error(f"시작 회차({args.rounds[0]})가 끝 회차({args.rounds[1]})보다 큽니다")
+    if any(r < 1 for r in args.rounds):
+        parser.error("회차는 1 이상")
+    return args
+
+
+def create_crawler():
+    """main과 같은 환경 변수로 DB/이벤트 발행기를 연결한 DrawCrawler"""
+    db = Database(
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        user=os.getenv('MYSQL_USER', 'root'),
+        password=os.getenv('MYSQL_PASSWORD', ''),
+        database=os.getenv('MYSQL_DATABASE', 'lotto_db')
+    )
+    # CLI로 저장한 회차도 통계/ML 서비스가 받도록 이벤트 발행
+    db.round_listener = RoundEventPublisher(redis_from_env(), source='data-collector-cli').publish
+    return DrawCrawler(db)
+
+
+def resolve_range(args, crawler):
+    if len(args.rounds) == 2:
+        return tuple(args.rounds)
+    if len(args.rounds) == 1:
+        return args.rounds[0], args.rounds[0]
+    latest = crawler.latest_round()
+    return (1 if args.missing else latest), latest
+
+
+def run(args, crawler, progress):
+    start_round, end_round = resolve_range(args, crawler)
+    ranges = [(start_round, end_round)]
+    if args.missing:
+        result = crawler.backfill(ranges, progress=progress, chunk_size=args.chunk_size)
+    else:
+        result = crawler.crawl_ranges(ranges, progress=progress, chunk_size=args.chunk_size)
+    
+    elapsed = time.time() - progress.started
+    result.update(
+        mode='missing' if args.missing else 'range',
+        start_round=start_round,
+        end_round=end_round,
+        elapsed_sec=round(elapsed, 2),
+        rounds_per_sec=round(result['saved'] / elapsed, 2) if elapsed > 0 else 0.0
+    )
+    return result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, stream=sys.stderr)
+    progress = ProgressPrinter(interval=args.progress_interval, enabled=not args.quiet)
+    
+    try:
+        result = run(args, create_crawler(), progress)
+    except KeyboardInterrupt:
+        result = {"success": False, "error": "interrupted", "rounds_done": progress.done, "rounds_total": progress.total}
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+        return 130
+    except Exception as e:
+        logger.exception("당첨 번호 수집 실패")
+        result = {"success": False, "error": str(e), "rounds_done": progress.done, "rounds_total": progress.total}
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+        return 1
+    
+    print(json.dumps(result, ensure_ascii=False, default=str), flush=True)
+    return 0 if result['success'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
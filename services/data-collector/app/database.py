@@ -1,58 +1,88 @@
-import mysql.connector
 from mysql.connector import Error
+from lotto_db import BaseDatabase
+import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+LOTTO_COLUMNS = (
+    'round', 'draw_date',
+    'number1', 'number2', 'number3', 'number4', 'number5', 'number6',
+    'bonus_number'
+)
 
-class Database:
-    def __init__(self, host, user, password, database):
-        self.host = host
-        self.user = user
-        self.password = password
-        self.database = database
-        self.connection = None
-        # 초기 연결 시도
-        self.connect()
+# 당첨 횟수 순 순위 (바뀐 행만 갱신 -> 지역 통계 트리거는 순위 변경을 건너뜀)
+STORE_RANK_REFRESH_QUERY = """
+    UPDATE lotto_stores s
+    JOIN (
+        SELECT store_id, ROW_NUMBER() OVER (ORDER BY total_wins DESC, wins_1st DESC, store_id) AS new_rank
+        FROM lotto_stores
+    ) ranked ON ranked.store_id = s.store_id
+    SET s.`rank` = ranked.new_rank
+    WHERE s.`rank` <> ranked.new_rank
+"""
+
+# 원장 전체로 판매점 당첨 횟수 재계산 (05 마이그레이션과 같은 집계)
+STORE_TOTALS_REBUILD_QUERY = """
+    UPDATE lotto_stores s
+    LEFT JOIN (
+        SELECT store_id, SUM(`rank` = 1) AS wins_1st, SUM(`rank` = 2) AS wins_2nd, COUNT(*) AS total_wins
+        FROM store_round_wins
+        GROUP BY store_id
+    ) w ON w.store_id = s.store_id
+    SET s.wins_1st = COALESCE(w.wins_1st, 0),
+        s.wins_2nd = COALESCE(w.wins_2nd, 0),
+        s.total_wins = COALESCE(w.total_wins, 0)
+    WHERE NOT (s.wins_1st <=> COALESCE(w.wins_1st, 0)
+               AND s.wins_2nd <=> COALESCE(w.wins_2nd, 0)
+               AND s.total_wins <=> COALESCE(w.total_wins, 0))
+"""
+
+# 원장 트리거 켜기 (이후 원장 변경이 lotto_stores 합계에 반영됨)
+STORE_LEDGER_ACTIVATE_QUERY = """
+    UPDATE store_ledger_state
+    SET active = 1, activated_at = COALESCE(activated_at, CURRENT_TIMESTAMP)
+    WHERE id = 1
+"""
+
+# 지역별 통계 요약 테이블 전체 재구성 (트리거 증분 갱신과 같은 집계)
+REGION_STATS_REBUILD_QUERY = """
+    INSERT INTO lotto_region_stats (region, store_count, total_1st_wins, total_2nd_wins, total_wins)
+    SELECT region, COUNT(*),
+           COALESCE(SUM(wins_1st), 0), COALESCE(SUM(wins_2nd), 0), COALESCE(SUM(total_wins), 0)
+    FROM lotto_stores
+    WHERE region IS NOT NULL AND region != ''
+    GROUP BY region
+"""
+
+
+def _store_key(name, address):
+    """lotto_stores 비교 키 (utf8mb4_unicode_ci처럼 대소문자/끝 공백 무시, NULL 주소는 빈 주소로)"""
+    return (name or '').rstrip(' ').casefold(), (address or '').rstrip(' ').casefold()
+
+
+class Database(BaseDatabase):
+    """데이터 수집 서비스 DB 접근 (공유 커넥션 풀 사용)"""
     
-    def connect(self):
-        """데이터베이스 연결"""
-        try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                pool_name="lotto_pool",
-                pool_size=5,
-                pool_reset_session=True,
-                autocommit=False,
-                connect_timeout=10,
-                use_pure=True
-            )
-            if self.connection.is_connected():
-                logger.info("MySQL 데이터베이스 연결 성공")
-                return True
-        except Error as e:
-            logger.error(f"데이터베이스 연결 실패: {e}")
-            self.connection = None
-            return False
+    pool_name = 'data-collector'
+    
+    # 회차 저장 후 호출되는 콜백 (rounds, version) - main에서 이벤트 발행기 연결
+    round_listener = None
     
-    def disconnect(self):
-        """데이터베이스 연결 종료"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            logger.info("MySQL 연결 종료")
+    def _notify_rounds(self, rounds):
+        """저장된 회차를 round_listener에 알림 (실패해도 저장 결과에는 영향 없음)"""
+        if self.round_listener is None or not rounds:
+            return
+        try:
+            self.round_listener(rounds, self.get_data_version())
+        except Exception as e:
+            logger.error(f"회차 이벤트 알림 실패: {e}")
     
     def insert_lotto_numbers(self, round_num, draw_date, numbers, bonus):
         """로또 번호 저장"""
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        
         try:
-            cursor = self.connection.cursor()
             query = """
-                INSERT INTO lotto_numbers 
+                INSERT INTO lotto_numbers
                 (round, draw_date, number1, number2, number3, number4, number5, number6, bonus_number)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ON DUPLICATE KEY UPDATE
@@ -65,34 +95,47 @@ class Database:
                 number6 = VALUES(number6),
                 bonus_number = VALUES(bonus_number)
             """
-            cursor.execute(query, (round_num, draw_date, *numbers, bonus))
-            self.connection.commit()
+            self.execute(query, (round_num, draw_date, *numbers, bonus))
             logger.info(f"{round_num}회차 데이터 저장 완료")
+            self._notify_rounds([round_num])
             return True
         except Error as e:
             logger.error(f"데이터 저장 실패: {e}")
-            self.connection.rollback()
             return False
-        finally:
-            cursor.close()
+    
+    def bulk_insert_lotto_numbers(self, draws, chunk_size=None):
+        """로또 번호 일괄 저장 (다중 행 upsert, 청크당 1회 commit)
+        
+        draws: {"round", "draw_date", "numbers", "bonus"} dict의 iterable
+        반환값: bulk_upsert 요약 + success
+        """
+        chunk_size = chunk_size or int(os.getenv('BULK_CHUNK_SIZE', 500))
+        rounds = []
+        
+        def rows():
+            for d in draws:
+                rounds.append(d['round'])
+                yield (d['round'], d['draw_date'], *d['numbers'], d['bonus'])
+        
+        summary = self.bulk_upsert('lotto_numbers', LOTTO_COLUMNS, rows(), chunk_size=chunk_size)
+        summary["success"] = "error" not in summary
+        logger.info(f"{summary['rows']}개 회차 일괄 저장 ({summary['elapsed_ms']}ms, {len(summary['chunks'])}개 청크)")
+        
+        # commit된 청크의 회차만 알림
+        self._notify_rounds(rounds[:summary['rows']])
+        return summary
     
     def get_latest_numbers(self, limit=5):
         """최신 N회 당첨 번호 조회"""
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        
-        cursor = None
         try:
-            cursor = self.connection.cursor(dictionary=True)
             query = """
-                SELECT round, draw_date, 
+                SELECT round, draw_date,
                        number1, number2, number3, number4, number5, number6, bonus_number
                 FROM lotto_numbers
                 ORDER BY round DESC
                 LIMIT %s
             """
-            cursor.execute(query, (limit,))
-            results = cursor.fetchall()
+            results = self.fetch_all(query, (limit,))
             
             # datetime을 문자열로 변환
             for row in results:
@@ -103,17 +146,10 @@ class Database:
         except Error as e:
             logger.error(f"조회 실패: {e}")
             return []
-        finally:
-            cursor.close()
     
     def get_history(self, page=1, per_page=20):
         """당첨 이력 조회 (페이지네이션)"""
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        
-        cursor = None
         try:
-            cursor = self.connection.cursor(dictionary=True)
             offset = (page - 1) * per_page
             query = """
                 SELECT round, draw_date,
@@ -122,8 +158,7 @@ class Database:
                 ORDER BY round DESC
                 LIMIT %s OFFSET %s
             """
-            cursor.execute(query, (per_page, offset))
-            results = cursor.fetchall()
+            results = self.fetch_all(query, (per_page, offset))
             
             # datetime을 문자열로 변환
             for row in results:
@@ -134,106 +169,254 @@ class Database:
         except Error as e:
             logger.error(f"조회 실패: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
+    
+    def get_history_page(self, before_round=None, after_round=None, limit=20):
+        """당첨 이력 keyset 페이지 (round 유니크 인덱스 기준, 깊이와 무관한 비용)
+        
+        before_round: 이 회차보다 오래된 회차 (다음 페이지)
+        after_round: 이 회차보다 최신 회차 (이전 페이지)
+        반환값: (회차 내림차순 결과, 더 오래된 회차 존재 여부, 더 최신 회차 존재 여부)
+        """
+        try:
+            columns = """
+                SELECT round, draw_date,
+                       number1, number2, number3, number4, number5, number6, bonus_number
+                FROM lotto_numbers
+            """
+            if after_round is not None:
+                query = columns + " WHERE round > %s ORDER BY round ASC LIMIT %s"
+                results = self.fetch_all(query, (after_round, limit + 1))
+                has_newer = len(results) > limit
+                results = results[:limit][::-1]
+                has_older = self._round_exists(
+                    "SELECT 1 FROM lotto_numbers WHERE round <= %s LIMIT 1", after_round)
+            else:
+                if before_round is not None:
+                    query = columns + " WHERE round < %s ORDER BY round DESC LIMIT %s"
+                    results = self.fetch_all(query, (before_round, limit + 1))
+                else:
+                    query = columns + " ORDER BY round DESC LIMIT %s"
+                    results = self.fetch_all(query, (limit + 1,))
+                has_older = len(results) > limit
+                results = results[:limit]
+                has_newer = before_round is not None and self._round_exists(
+                    "SELECT 1 FROM lotto_numbers WHERE round >= %s LIMIT 1", before_round)
+            
+            # datetime을 문자열로 변환
+            for row in results:
+                if row['draw_date']:
+                    row['draw_date'] = row['draw_date'].strftime('%Y-%m-%d')
+            
+            return results, has_older, has_newer
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return [], False, False
+    
+    def _round_exists(self, query, round_num):
+        """인덱스 범위 존재 여부 (1행만 확인)"""
+        return self.fetch_one(query, (round_num,)) is not None
     
     def get_total_count(self):
         """전체 회차 개수"""
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        
-        cursor = None
         try:
-            cursor = self.connection.cursor()
             query = "SELECT COUNT(*) FROM lotto_numbers"
-            cursor.execute(query)
-            count = cursor.fetchone()[0]
-            return count
+            return self.fetch_one(query)[0]
         except Error as e:
             logger.error(f"조회 실패: {e}")
             return 0
-        finally:
-            if cursor:
-                cursor.close()
     
-    def insert_store(self, store_data):
-        """판매점 데이터 저장"""
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
+    def get_missing_round_ranges(self, start_round, end_round):
+        """범위 안에서 없거나 불완전한(보너스 번호 없음) 회차 구간 [(start, end)]
         
-        cursor = None
+        round 인덱스 범위를 한 번 읽어 저장된 회차 사이의 간격만 돌려줍니다.
+        범위 앞뒤 경계는 start_round - 1 / end_round + 1 가상 회차로 처리합니다.
+        """
+        query = """
+            SELECT prev_round + 1, round - 1
+            FROM (
+                SELECT round, LAG(round, 1, %s) OVER (ORDER BY round) AS prev_round
+                FROM (
+                    SELECT round FROM lotto_numbers
+                    WHERE round BETWEEN %s AND %s AND bonus_number IS NOT NULL
+                    UNION ALL
+                    SELECT %s
+                ) saved
+            ) gaps
+            WHERE round - prev_round > 1
+            ORDER BY round
+        """
+        rows = self.fetch_all(
+            query, (start_round - 1, start_round, end_round, end_round + 1),
+            dictionary=False, primary=True
+        )
+        return [(int(gap_start), int(gap_end)) for gap_start, gap_end in rows]
+    
+    def get_data_version(self):
+        """데이터 버전 (최신 회차 + 전체 회차 수)"""
         try:
-            cursor = self.connection.cursor()
-            query = """
-                INSERT INTO lotto_stores 
-                (store_name, address, region, wins_1st, wins_2nd, total_wins, `rank`)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                wins_1st = VALUES(wins_1st),
-                wins_2nd = VALUES(wins_2nd),
-                total_wins = VALUES(total_wins),
-                `rank` = VALUES(`rank`),
-                updated_at = CURRENT_TIMESTAMP
-            """
-            cursor.execute(query, (
-                store_data['store_name'],
-                store_data['address'],
-                store_data['region'],
-                store_data['wins_1st'],
-                store_data['wins_2nd'],
-                store_data['total_wins'],
-                store_data['rank']
-            ))
-            self.connection.commit()
-            return True
+            query = "SELECT MAX(round), COUNT(*) FROM lotto_numbers"
+            latest_round, count = self.fetch_one(query, primary=True)
+            return f"{latest_round or 0}-{count}"
         except Error as e:
-            logger.error(f"판매점 저장 실패: {e}")
-            self.connection.rollback()
-            return False
+            logger.error(f"조회 실패: {e}")
+            return None
+    
+    def ingest_round_wins(self, round_num, winners, rank=1):
+        """한 회차의 판매점 당첨 원장 교체 (한 트랜잭션)
+        
+        winners: [(store_name, address, region, method)] (페이지 순서)
+        없는 판매점은 추가하고, 그 회차 원장 행이 달라졌을 때만 지우고 다시 넣습니다.
+        lotto_stores 당첨 횟수는 원장 트리거가 증분 갱신합니다.
+        반환값: 당첨 횟수가 바뀐 store_id 목록 (원장이 그대로면 빈 목록)
+        """
+        # 비교 키 -> 처음 나온 (store_name, address, region)
+        firsts = {}
+        for name, address, region, _ in winners:
+            firsts.setdefault(_store_key(name, address), (name, address, region))
+        
+        try:
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+                
+                def run(query, params=None):
+                    with self._timed(query, params) as stat:
+                        cursor.execute(query, params)
+                        rows = cursor.fetchall() if cursor.with_rows else []
+                        stat["rows"] = len(rows) or max(cursor.rowcount, 0)
+                    return rows
+                
+                def find_ids(lookup):
+                    # 이름으로 찾고 주소는 같은 비교 키로 맞춤 (MySQL 비교 규칙과 NULL 주소 모두 대응)
+                    names = list(dict.fromkeys(firsts[key][0] for key in lookup))
+                    rows = run(
+                        "SELECT store_id, store_name, address FROM lotto_stores "
+                        "WHERE store_name IN (" + ", ".join(["%s"] * len(names)) + ") ORDER BY store_id",
+                        tuple(names)
+                    )
+                    found = {}
+                    for store_id, name, address in rows:
+                        found.setdefault(_store_key(name, address), store_id)
+                    return {key: found[key] for key in lookup if key in found}
+                
+                try:
+                    store_ids = find_ids(firsts) if firsts else {}
+                    new_keys = [key for key in firsts if key not in store_ids]
+                    if new_keys:
+                        # 처음 보는 판매점만 추가 (동시 추가와 겹치면 비어 있던 지역만 채움)
+                        run(
+                            "INSERT INTO lotto_stores (store_name, address, region) VALUES "
+                            + ", ".join(["(%s, %s, %s)"] * len(new_keys))
+                            + " ON DUPLICATE KEY UPDATE region = COALESCE(NULLIF(region, ''), VALUES(region))",
+                            tuple(v for key in new_keys for v in firsts[key])
+                        )
+                        store_ids.update(find_ids(new_keys))
+                    
+                    new_rows = [
+                        (seq, store_ids[_store_key(name, address)], method)
+                        for seq, (name, address, _, method) in enumerate(winners)
+                    ]
+                    old_rows = [tuple(row) for row in run(
+                        "SELECT seq, store_id, method FROM store_round_wins "
+                        "WHERE round = %s AND `rank` = %s ORDER BY seq",
+                        (round_num, rank)
+                    )]
+                    if old_rows == new_rows:
+                        return []
+                    
+                    # 원장 교체 -> 트리거가 이전 행만큼 빼고 새 행만큼 더함
+                    run("DELETE FROM store_round_wins WHERE round = %s AND `rank` = %s", (round_num, rank))
+                    if new_rows:
+                        run(
+                            "INSERT INTO store_round_wins (round, `rank`, seq, store_id, method) VALUES "
+                            + ", ".join(["(%s, %s, %s, %s, %s)"] * len(new_rows)),
+                            tuple(v for seq, store_id, method in new_rows
+                                  for v in (round_num, rank, seq, store_id, method))
+                        )
+                finally:
+                    cursor.close()
+        finally:
+            self._invalidate_replica_check()
+        
+        return sorted({store_id for _, store_id, _ in old_rows + new_rows})
+    
+    def get_ledger_rounds(self, start_round, end_round, rank=1):
+        """범위 안에서 원장에 반영된 회차 집합"""
+        query = """
+            SELECT DISTINCT round FROM store_round_wins
+            WHERE round BETWEEN %s AND %s AND `rank` = %s
+        """
+        rows = self.fetch_all(query, (start_round, end_round, rank), dictionary=False, primary=True)
+        return {row[0] for row in rows}
+    
+    def refresh_store_ranks(self):
+        """당첨 횟수 순으로 순위 재계산 (순위가 바뀐 행만 갱신, 반환값: 갱신 행 수)"""
+        return self.execute(STORE_RANK_REFRESH_QUERY)[0]
+    
+    def is_store_ledger_active(self):
+        """원장 트리거가 켜져 있는지 (꺼져 있으면 lotto_stores 합계는 마이그레이션 전 값)"""
+        row = self.fetch_one("SELECT active FROM store_ledger_state WHERE id = 1", primary=True)
+        return bool(row and row[0])
+    
+    def rebuild_store_totals(self):
+        """lotto_stores 당첨 횟수를 원장 전체로 다시 계산하고 원장 트리거를 켬 (한 트랜잭션)
+        
+        원장 백필을 마친 뒤나 트리거 누락 복구용 (반환값: 갱신 행 수)
+        """
+        try:
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+                try:
+                    # 먼저 켜서 상태 행을 잠근 뒤 재계산 (이후 원장 변경은 트리거가 반영)
+                    cursor.execute(STORE_LEDGER_ACTIVATE_QUERY)
+                    with self._timed(STORE_TOTALS_REBUILD_QUERY, None) as stat:
+                        cursor.execute(STORE_TOTALS_REBUILD_QUERY)
+                        updated = stat["rows"] = max(cursor.rowcount, 0)
+                finally:
+                    cursor.close()
         finally:
-            if cursor:
-                cursor.close()
+            self._invalidate_replica_check()
+        self.refresh_store_ranks()
+        logger.info(f"판매점 당첨 횟수 재계산: {updated}개 갱신")
+        return updated
+    
+    def get_stores_by_ids(self, store_ids):
+        """store_id 목록의 판매점 (인덱스 증분 반영용)"""
+        if not store_ids:
+            return []
+        query = (
+            "SELECT store_id, store_name, address, region, wins_1st, wins_2nd, total_wins, `rank`, "
+            "latitude, longitude FROM lotto_stores WHERE store_id IN ("
+            + ", ".join(["%s"] * len(store_ids)) + ")"
+        )
+        return self.fetch_all(query, tuple(store_ids), primary=True)
+    
+    def get_all_stores(self):
+        """판매점 전체 (메모리 인덱스 구성용, 좌표 포함)"""
+        query = """
+            SELECT store_id, store_name, address, region,
+                   wins_1st, wins_2nd, total_wins, `rank`, latitude, longitude
+            FROM lotto_stores
+        """
+        return self.fetch_all(query, retries=3)
     
     def get_top_stores(self, limit=100):
         """상위 판매점 조회"""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                if not self.connection or not self.connection.is_connected():
-                    self.connect()
-                
-                cursor = self.connection.cursor(dictionary=True)
-                query = """
-                    SELECT store_id, store_name, address, region,
-                           wins_1st, wins_2nd, total_wins, `rank`
-                    FROM lotto_stores
-                    ORDER BY `rank` ASC, total_wins DESC
-                    LIMIT %s
-                """
-                cursor.execute(query, (limit,))
-                results = cursor.fetchall()
-                cursor.close()
-                return results
-            except Error as e:
-                logger.error(f"판매점 조회 실패 (시도 {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    self.disconnect()
-                    self.connect()
-                else:
-                    return []
-            except Exception as e:
-                logger.error(f"예상치 못한 오류: {e}")
-                return []
+        try:
+            query = """
+                SELECT store_id, store_name, address, region,
+                       wins_1st, wins_2nd, total_wins, `rank`
+                FROM lotto_stores
+                ORDER BY `rank` ASC, total_wins DESC
+                LIMIT %s
+            """
+            return self.fetch_all(query, (limit,), retries=3)
+        except Error as e:
+            logger.error(f"판매점 조회 실패: {e}")
+            return []
     
     def get_stores_by_region(self, region):
         """지역별 판매점 조회"""
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        
-        cursor = None
         try:
-            cursor = self.connection.cursor(dictionary=True)
             query = """
                 SELECT store_id, store_name, address, region,
                        wins_1st, wins_2nd, total_wins, `rank`
@@ -241,37 +424,44 @@ class Database:
                 WHERE region = %s
                 ORDER BY total_wins DESC
             """
-            cursor.execute(query, (region,))
-            results = cursor.fetchall()
-            return results
+            return self.fetch_all(query, (region,))
         except Error as e:
             logger.error(f"지역별 판매점 조회 실패: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_region_stats(self):
-        """지역별 통계"""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                if not self.connection or not self.connection.is_connected():
-                    self.connect()
-                
-                cursor = self.connection.cursor(dictionary=True)
-                query = "SELECT * FROM v_region_stats"
-                cursor.execute(query)
-                results = cursor.fetchall()
-                cursor.close()
-                return results
-            except Error as e:
-                logger.error(f"지역별 통계 조회 실패 (시도 {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    self.disconnect()
-                    self.connect()
-                else:
-                    return []
-            except Exception as e:
-                logger.error(f"예상치 못한 오류: {e}")
-                return []
+        """지역별 통계 (요약 테이블 조회, lotto_stores 변경 시 트리거로 갱신됨)"""
+        try:
+            query = """
+                SELECT region, store_count, total_1st_wins, total_2nd_wins, total_wins,
+                       total_1st_wins / store_count AS avg_1st_wins,
+                       total_2nd_wins / store_count AS avg_2nd_wins
+                FROM lotto_region_stats
+                WHERE store_count > 0
+                ORDER BY total_wins DESC
+            """
+            return self.fetch_all(query, retries=3)
+        except Error as e:
+            logger.error(f"지역별 통계 조회 실패: {e}")
+            return []
+    
+    def rebuild_region_stats(self):
+        """지역별 통계 요약 테이블을 lotto_stores로 전체 재구성 (한 트랜잭션)
+        
+        반환값: 재구성된 지역 수
+        """
+        try:
+            with self.pool.transaction() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("DELETE FROM lotto_region_stats")
+                    with self._timed(REGION_STATS_REBUILD_QUERY, None) as stat:
+                        cursor.execute(REGION_STATS_REBUILD_QUERY)
+                        stat["rows"] = max(cursor.rowcount, 0)
+                    regions = cursor.rowcount
+                finally:
+                    cursor.close()
+        finally:
+            self._invalidate_replica_check()
+        logger.info(f"지역별 통계 재구성: {regions}개 지역")
+        return regions
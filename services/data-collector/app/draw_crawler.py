@@ -0,0 +1,150 @@
+"""
+당첨 번호 동시 수집기 (동행복권 회차 조회 API)
+
+    crawler = DrawCrawler(db)
+    crawler.backfill([(1, 1196)])          # DB에 없거나 불완전한 회차만 수집
+    crawler.crawl_ranges([(1180, 1196)])   # 구간 전체 다시 수집
+
+회차 API 응답을 AsyncFetcher로 동시에 받고, 모은 회차는 bulk_insert_lotto_numbers로 청크 단위 저장합니다.
+아직 게시되지 않은 회차(returnValue=fail)는 실패 회차로 남기고 캐시하지 않습니다.
+"""
+import json
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from .fetcher import AsyncFetcher
+from .http_cache import HttpCache
+from .jobs import subtract_ranges
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+# 1회 추첨 (토요일, 결과 게시 21시 기준) - 이후 매주 1회
+FIRST_DRAW = datetime(2002, 12, 7, 21, 0, tzinfo=KST)
+
+
+def estimated_latest_round(now=None):
+    """날짜로 계산한 최신 회차 (토요일 21시에 1 증가)"""
+    now = now or datetime.now(KST)
+    return (now - FIRST_DRAW).days // 7 + 1
+
+
+def draw_round(now=None):
+    """오늘(토요일)이나 가장 최근 토요일에 추첨하는 회차 (추첨 전이어도 그날 회차)"""
+    now = now or datetime.now(KST)
+    draw_day = FIRST_DRAW.replace(hour=0, minute=0)
+    return (now - draw_day).days // 7 + 1
+
+
+def parse_draw(text):
+    """회차 API 응답 -> {"round", "draw_date", "numbers", "bonus"} (미게시/형식 오류면 None)"""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if data.get('returnValue') != 'success':
+        return None
+    try:
+        return {
+            'round': int(data['drwNo']),
+            'draw_date': data['drwNoDate'],
+            'numbers': sorted(int(data[f'drwtNo{i}']) for i in range(1, 7)),
+            'bonus': int(data['bnusNo'])
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class DrawCrawler:
+    """회차별 당첨 번호 크롤러"""
+    
+    def __init__(self, db, cache=None):
+        self.db = db
+        # 응답 디스크 캐시 (HTTP_CACHE_DIR가 없으면 None)
+        self.cache = cache or HttpCache.from_env()
+        self.base_url = "https://www.dhlottery.co.kr"
+        self.api_url = f"{self.base_url}/common.do?method=getLottoNumber&drwNo="
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+    
+    def latest_round(self):
+        """최신 회차 (날짜 계산, 아직 게시 전이면 수집 시 실패 회차로 남음)"""
+        return estimated_latest_round()
+    
+    def crawl_ranges(self, ranges, progress=None, chunk_size=None):
+        """구간 [(start, end)]의 모든 회차 수집 후 일괄 저장
+        
+        progress(done, total)는 회차를 받을 때마다 호출됩니다.
+        success는 저장 오류와 실패 회차(미게시 포함)가 모두 없을 때만 True입니다.
+        """
+        urls = {
+            round_num: f"{self.api_url}{round_num}"
+            for start_round, end_round in ranges
+            for round_num in range(start_round, end_round + 1)
+        }
+        total_rounds = len(urls)
+        draws = []
+        if progress:
+            progress(0, total_rounds)
+        
+        def on_page(round_num, text):
+            draw = parse_draw(text)
+            if draw is None or draw['round'] != round_num:
+                logger.warning(f"{round_num}회 당첨 번호 없음 (미게시 또는 형식 오류)")
+                return False
+            draws.append(draw)
+            if progress:
+                progress(len(draws), total_rounds)
+            return True
+        
+        # 당첨 번호는 게시 후 바뀌지 않으므로 캐시에 영구 보관 (미게시 응답은 on_page가 False로 지움)
+        fetcher = AsyncFetcher.from_env(headers=self.headers, encoding='utf-8', cache=self.cache)
+        results, failed = asyncio.run(fetcher.fetch_many(urls, on_page=on_page, permanent=True))
+        failed_rounds = sorted(set(failed) | {r for r, ok in results.items() if not ok})
+        logger.info(
+            f"당첨 번호 수집: {len(draws)}/{total_rounds}회 "
+            f"(요청 {fetcher.stats['requests']}, 캐시 {fetcher.stats['cached']}, "
+            f"{fetcher.stats['elapsed_ms']}ms)"
+        )
+        
+        summary = {"rows": 0, "chunks": [], "elapsed_ms": 0.0, "success": True}
+        if draws:
+            draws.sort(key=lambda d: d['round'])
+            summary = self.db.bulk_insert_lotto_numbers(draws, chunk_size=chunk_size)
+        
+        return {
+            'success': summary['success'] and not failed_rounds,
+            'error': summary.get('error'),
+            'requested': total_rounds,
+            'saved': summary['rows'],
+            'failed_rounds': failed_rounds,
+            'chunks': summary['chunks'],
+            'insert_ms': summary['elapsed_ms'],
+            'fetch': fetcher.stats
+        }
+    
+    def missing_ranges(self, ranges):
+        """구간 중 DB에 없거나 불완전한 회차 구간 (전체 범위에 대해 쿼리 1회)"""
+        first = min(start for start, _ in ranges)
+        last = max(end for _, end in ranges)
+        missing = self.db.get_missing_round_ranges(first, last)
+        # 요청 구간 밖의 간격은 제외
+        outside = subtract_ranges([(first, last)], ranges)
+        return subtract_ranges(missing, outside)
+    
+    def backfill(self, ranges, progress=None, chunk_size=None):
+        """구간 중 빠진 회차만 수집"""
+        missing = self.missing_ranges(ranges)
+        missing_count = sum(end - start + 1 for start, end in missing)
+        logger.info(f"빠진 회차 {missing_count}개, 구간 {len(missing)}개: {missing[:10]}")
+        if not missing:
+            if progress:
+                progress(0, 0)
+            return {'success': True, 'missing_ranges': [], 'requested': 0, 'saved': 0, 'failed_rounds': []}
+        
+        result = self.crawl_ranges(missing, progress=progress, chunk_size=chunk_size)
+        result['missing_ranges'] = missing
+        return result
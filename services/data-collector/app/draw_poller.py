@@ -0,0 +1,140 @@
+"""
+추첨 후 당첨 번호 폴링
+
+토요일 추첨 시각부터 새 회차가 저장될 때까지 짧은 간격으로 확인하고,
+아직 게시되지 않았으면 간격을 지수적으로 늘립니다 (지터 포함).
+    
+    DRAW_POLL_INTERVAL=30          # 첫 확인 간격 (초)
+    DRAW_POLL_MAX_INTERVAL=1800    # 최대 간격 (초)
+    DRAW_POLL_BACKOFF=2            # 간격 배수
+    DRAW_POLL_DEADLINE=172800      # 포기 시간 (초, 기본 48시간)
+  
+  - 새 회차는 DrawCrawler로 받아 저장 -> Database.round_listener가 회차 이벤트를 바로 발행
+  - 모든 복제본이 같은 시각에 시작하지만 Redis lease를 가진 하나만 요청하고,
+    나머지는 같은 간격으로 DB만 확인하다가 소유자가 죽어 lease가 만료되면 이어받음
+"""
+import os
+import time
+import random
+import logging
+import threading
+
+from apscheduler.triggers.cron import CronTrigger
+from lotto_db.lease import RedisLease
+
+from .draw_crawler import draw_round
+
+logger = logging.getLogger(__name__)
+
+LEASE_KEY = 'lotto:draw-poller'
+
+# lease 만료 여유 (다음 확인 전에 만료되지 않도록 대기 시간에 더함)
+LEASE_MARGIN_MS = 60000
+
+
+def poll_trigger(at=None):
+    """토요일 DRAW_POLL_AT(기본 20:45, KST) 폴링 시작 트리거"""
+    hour, minute = (int(v) for v in (at or os.getenv('DRAW_POLL_AT', '20:45')).split(':'))
+    return CronTrigger(day_of_week='sat', hour=hour, minute=minute, timezone='Asia/Seoul')
+
+
+class DrawPoller:
+    """새 회차 폴링 (스케줄러 스레드에서 실행)"""
+    
+    def __init__(self, draw_crawler, client=None, interval=30, max_interval=1800,
+                 backoff=2.0, deadline=172800):
+        self.draw_crawler = draw_crawler
+        self.lease = RedisLease(client, LEASE_KEY)
+        self.interval = float(interval)
+        self.max_interval = float(max_interval)
+        self.backoff = float(backoff)
+        self.deadline = float(deadline)
+        self.state = {"running": False}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+    
+    @classmethod
+    def from_env(cls, draw_crawler, client=None):
+        return cls(
+            draw_crawler,
+            client,
+            interval=float(os.getenv('DRAW_POLL_INTERVAL', 30)),
+            max_interval=float(os.getenv('DRAW_POLL_MAX_INTERVAL', 1800)),
+            backoff=float(os.getenv('DRAW_POLL_BACKOFF', 2)),
+            deadline=float(os.getenv('DRAW_POLL_DEADLINE', 172800))
+        )
+    
+    def _delay(self, interval):
+        """간격의 절반 ~ 전체 (복제본/재시도가 같은 순간에 몰리지 않게)"""
+        return interval / 2 + random.uniform(0, interval / 2)
+    
+    def poll(self, round_num=None):
+        """round_num(기본: 오늘/최근 토요일 추첨 회차)이 저장될 때까지 폴링
+        
+        반환값: {"success", "round", "attempts", "requests", ...} (이미 실행 중이면 None)
+        """
+        if not self._lock.acquire(blocking=False):
+            logger.info("당첨 번호 폴링이 이미 실행 중")
+            return None
+        
+        target = round_num or draw_round()
+        started = time.time()
+        interval = self.interval
+        self.state = {
+            "running": True, "round": target, "attempts": 0, "requests": 0,
+            "started_at": started, "next_poll_at": None, "owner": False
+        }
+        logger.info(f"{target}회 당첨 번호 폴링 시작")
+        try:
+            while not self._stop.is_set():
+                self.state["attempts"] += 1
+                delay = self._delay(interval)
+                owner = False
+                try:
+                    # 다른 복제본이나 수동 수집으로 이미 저장됐으면 끝
+                    if not self.draw_crawler.missing_ranges([(target, target)]):
+                        return self._finish(True, "stored")
+                    
+                    owner = self.lease.hold(delay * 1000 + LEASE_MARGIN_MS)
+                    self.state["owner"] = owner
+                    if owner:
+                        self.state["requests"] += 1
+                        result = self.draw_crawler.crawl_ranges([(target, target)])
+                        if result['saved']:
+                            return self._finish(True, "collected")
+                except Exception as e:
+                    # DB/네트워크 오류는 다음 확인 때 다시 시도
+                    logger.error(f"{target}회 당첨 번호 확인 실패: {e}")
+                
+                if time.time() + delay - started > self.deadline:
+                    logger.error(f"{target}회 당첨 번호 폴링 포기 ({self.state['attempts']}회 확인)")
+                    return self._finish(False, "deadline")
+                
+                logger.info(
+                    f"{target}회 아직 없음, {delay:.0f}초 후 다시 확인 "
+                    f"({'요청' if owner else '대기: ' + str(self.lease.holder())})"
+                )
+                self.state["next_poll_at"] = time.time() + delay
+                self._stop.wait(delay)
+                interval = min(interval * self.backoff, self.max_interval)
+            return self._finish(False, "stopped")
+        finally:
+            self.lease.release()
+            self.state["running"] = False
+            self._lock.release()
+    
+    def _finish(self, success, reason):
+        elapsed = time.time() - self.state["started_at"]
+        self.state.update(success=success, reason=reason, elapsed_sec=round(elapsed, 1), next_poll_at=None)
+        if success:
+            logger.info(
+                f"{self.state['round']}회 당첨 번호 저장 확인 ({reason}, "
+                f"{self.state['attempts']}회 확인, {elapsed:.0f}초)"
+            )
+        return dict(self.state, running=False)
+    
+    def status(self):
+        return dict(self.state, lease_holder=self.lease.holder(), lease_owner_id=self.lease.owner)
+    
+    def stop(self):
+        self._stop.set()
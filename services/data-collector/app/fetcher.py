@@ -0,0 +1,174 @@
+"""
+aiohttp 기반 동시 페이지 수집기
+
+    fetcher = AsyncFetcher.from_env(headers=HEADERS)
+    pages, failed = asyncio.run(fetcher.fetch_many({981: url981, 982: url982}))
+
+  - 동시 요청 수 제한 (CRAWL_CONCURRENCY, 기본 4)
+  - 토큰 버킷 속도 제한 (CRAWL_RATE 초당 요청 수, 기본 2 / CRAWL_BURST, 기본 CRAWL_RATE)
+  - 한 번의 수집 동안 keep-alive 세션(커넥션) 공유
+  - 타임아웃/연결 오류/429/5xx는 지수 백오프 + 지터로 재시도 (CRAWL_RETRIES, 기본 3)
+  - cache(HttpCache)가 있으면 캐시된 응답은 요청하지 않음 (replay 모드면 캐시만 사용)
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+
+import aiohttp
+
+from .http_cache import CacheMiss
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryableStatus(Exception):
+    """재시도 대상 HTTP 상태 코드"""
+    
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한 (rate <= 0이면 제한 없음)"""
+    
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(self.rate, 1.0))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+    
+    async def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        
+        # 대기 순서대로 토큰을 받도록 잠금 안에서 기다림
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """동시성/속도 제한이 있는 페이지 수집기"""
+    
+    def __init__(self, headers=None, concurrency=4, rate=2.0, burst=None, retries=3,
+                 timeout=30, backoff=1.0, encoding='euc-kr', cache=None):
+        self.headers = headers or {}
+        self.concurrency = max(int(concurrency), 1)
+        self.rate = float(rate)
+        self.burst = burst
+        self.retries = max(int(retries), 1)
+        self.timeout = float(timeout)
+        self.backoff = float(backoff)
+        self.encoding = encoding
+        self.cache = cache
+        self.stats = {}
+    
+    @classmethod
+    def from_env(cls, **overrides):
+        """CRAWL_* 환경 변수 설정으로 생성"""
+        settings = {
+            "concurrency": int(os.getenv('CRAWL_CONCURRENCY', 4)),
+            "rate": float(os.getenv('CRAWL_RATE', 2)),
+            "burst": float(os.getenv('CRAWL_BURST', 0)) or None,
+            "retries": int(os.getenv('CRAWL_RETRIES', 3)),
+            "timeout": float(os.getenv('CRAWL_TIMEOUT', 30)),
+            "backoff": float(os.getenv('CRAWL_BACKOFF', 1.0)),
+        }
+        settings.update(overrides)
+        return cls(**settings)
+    
+    def _backoff_delay(self, attempt):
+        """지수 백오프 + 지터 (backoff * 2^(attempt-1)의 절반 ~ 전체)"""
+        delay = self.backoff * (2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    async def fetch_many(self, urls, on_page=None, permanent=False):
+        """{키: URL} 동시 수집
+        
+        on_page(key, text): 페이지를 받을 때마다 호출 (완료 순서)
+            지정하면 본문 대신 on_page 반환값을 남겨 페이지를 메모리에 쌓아 두지 않음
+            False를 반환하면 그 응답은 캐시에서 지움 (아직 게시되지 않은 페이지 등)
+        permanent: 캐시 영구 보관 여부 (bool 또는 키를 받는 함수, 지난 회차 페이지는 True)
+        반환값: ({키: 본문 또는 on_page 반환값}, {키: 오류 메시지})
+        """
+        self.stats = {
+            "requests": 0, "retries": 0, "failed": 0, "cached": 0, "bytes": 0, "elapsed_ms": 0.0
+        }
+        started = time.perf_counter()
+        bucket = TokenBucket(self.rate, self.burst)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pages, failed = {}, {}
+        
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(
+                headers=self.headers, connector=connector, timeout=timeout) as session:
+            
+            async def fetch_one(key, url):
+                async with semaphore:
+                    keep = permanent(key) if callable(permanent) else permanent
+                    try:
+                        text = await self._fetch(session, bucket, url, keep)
+                    except Exception as e:
+                        self.stats["failed"] += 1
+                        failed[key] = str(e) or type(e).__name__
+                        logger.error(f"{key} 수집 실패: {failed[key]}")
+                        return
+                pages[key] = text if on_page is None else on_page(key, text)
+                if pages[key] is False and self.cache is not None:
+                    self.cache.discard(url)
+            
+            await asyncio.gather(*(fetch_one(key, url) for key, url in urls.items()))
+        
+        self.stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return pages, failed
+    
+    async def _fetch(self, session, bucket, url, permanent=False):
+        """한 페이지 수집 (캐시 확인 후 요청, 재시도 포함)"""
+        if self.cache is not None:
+            body = self.cache.get(url)
+            if body is not None:
+                self.stats["cached"] += 1
+                return body.decode(self.encoding, errors='replace')
+            if self.cache.replay:
+                raise CacheMiss(f"캐시에 없음 (replay): {url}")
+        
+        for attempt in range(1, self.retries + 1):
+            await bucket.acquire()
+            self.stats["requests"] += 1
+            try:
+                async with session.get(url) as response:
+                    if response.status in RETRY_STATUSES:
+                        raise RetryableStatus(response.status, url)
+                    response.raise_for_status()
+                    body = await response.read()
+                    self.stats["bytes"] += len(body)
+                    if self.cache is not None:
+                        self.cache.put(url, body, permanent)
+                    return body.decode(self.encoding, errors='replace')
+            except (RetryableStatus, aiohttp.ClientConnectionError,
+                    aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                self.stats["retries"] += 1
+                logger.warning(
+                    f"{url} 수집 오류, {delay:.1f}초 후 재시도 ({attempt}/{self.retries}): "
+                    f"{e or type(e).__name__}")
+                await asyncio.sleep(delay)
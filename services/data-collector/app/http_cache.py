@@ -0,0 +1,155 @@
+"""
+크롤러 HTTP 응답 디스크 캐시
+
+    HTTP_CACHE_DIR=/app/local/http-cache        # 지정하면 캐시 사용
+    HTTP_CACHE_MODE=on | replay | refresh        # 기본 on
+    HTTP_CACHE_LATEST_TTL=600                    # 최신 페이지 보관 시간 (초)
+
+  - 본문은 sha256 이름의 파일로 저장 (objects/ab/abcdef..., 같은 본문은 한 번만 저장)
+  - URL -> (본문 해시, 회차, 만료 시각) 색인은 SQLite
+  - 지난 회차 페이지는 영구 보관, 최신/회차 없는 페이지는 HTTP_CACHE_LATEST_TTL초만 보관
+  - on: 캐시에 있으면 사용, 없으면 요청 후 저장
+  - replay: 캐시만 사용 (없으면 CacheMiss, 네트워크 요청 없음) - 파서 수정 후 재파싱, 테스트/벤치마크용
+  - refresh: 항상 요청하고 캐시를 덮어씀
+"""
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    round INTEGER,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_round ON responses (round);
+"""
+
+MODES = ('on', 'replay', 'refresh')
+
+
+class CacheMiss(Exception):
+    """replay 모드에서 캐시에 없는 URL"""
+
+
+def round_of(url):
+    """URL의 drwNo 파라미터 (없으면 None)"""
+    values = parse_qs(urlsplit(url).query).get('drwNo')
+    return int(values[0]) if values and values[0].isdigit() else None
+
+
+class HttpCache:
+    """내용 주소 기반 응답 캐시"""
+    
+    def __init__(self, directory, mode='on', latest_ttl=600):
+        if mode not in MODES:
+            raise ValueError(f"HTTP_CACHE_MODE는 {', '.join(MODES)} 중 하나여야 합니다: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.latest_ttl = float(latest_ttl)
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+    
+    @classmethod
+    def from_env(cls):
+        """HTTP_CACHE_DIR가 없으면 None (캐시 사용 안 함)"""
+        directory = os.getenv('HTTP_CACHE_DIR')
+        if not directory:
+            return None
+        return cls(
+            directory,
+            mode=os.getenv('HTTP_CACHE_MODE', 'on'),
+            latest_ttl=float(os.getenv('HTTP_CACHE_LATEST_TTL', 600))
+        )
+    
+    @property
+    def replay(self):
+        return self.mode == 'replay'
+    
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.directory, 'index.sqlite3'), timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], digest)
+    
+    def get(self, url):
+        """캐시된 본문 (없거나 만료됐거나 refresh 모드면 None)"""
+        if self.mode == 'refresh':
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT digest, expires_at FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            self.stats["misses"] += 1
+            return None
+        
+        try:
+            with open(self._object_path(row[0]), 'rb') as f:
+                body = zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            logger.warning(f"캐시 본문 읽기 실패, 무시: {url} ({e})")
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return body
+    
+    def put(self, url, body, permanent=False):
+        """본문 저장 (permanent가 아니면 latest_ttl초 후 만료)"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 임시 파일에 쓴 뒤 이름 변경 (읽는 쪽이 쓰다 만 파일을 보지 않음)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(zlib.compress(body))
+            os.replace(tmp, path)
+        
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (url, round, digest, size, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, round_of(url), digest, len(body), now, None if permanent else now + self.latest_ttl)
+            )
+        self.stats["stored"] += 1
+    
+    def discard(self, url):
+        """색인에서 제거 (아직 게시되지 않은 페이지 등, 본문 파일은 다른 URL과 공유될 수 있어 남김)"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+    
+    def status(self):
+        """모드, 색인 수/크기, 이번 프로세스의 적중 지표"""
+        with self._connect() as conn:
+            entries, size, permanent = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COUNT(*) - COUNT(expires_at) FROM responses"
+            ).fetchone()
+        return dict(
+            self.stats,
+            directory=self.directory,
+            mode=self.mode,
+            entries=entries,
+            permanent=permanent,
+            bytes=size
+        )
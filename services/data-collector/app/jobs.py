@@ -0,0 +1,297 @@
+"""
+백그라운드 크롤링 작업 큐
+
+크롤링 요청은 작업으로 등록하고 바로 작업 id를 돌려줍니다 (HTTP 요청 안에서 크롤링하지 않음).
+
+    CRAWL_JOB_WORKERS=2        # 동시에 실행하는 작업 수
+    CRAWL_JOB_MAX_QUEUED=50    # 대기 작업 상한 (넘으면 JobQueueFull)
+    CRAWL_JOB_HISTORY=100      # 보관하는 끝난 작업 수
+
+  - 작업 종류(kind)별 실행 함수를 register로 등록 (runner(job) -> 결과 dict)
+  - 우선순위(high/normal/low) -> 등록 순으로 실행
+  - 같은 종류의 대기/실행 중 작업이 이미 맡은 회차는 빼고 등록, 전부 맡겨져 있으면 기존 작업을 돌려줌
+  - runner는 job.tracker(계획 회차 수)로 받은 콜백 progress(done, total)로 진행 상황을 보고
+    -> 처리 회차, 초당 회차, 남은 시간(ETA)
+"""
+import os
+import time
+import heapq
+import uuid
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {'high': 0, 'normal': 1, 'low': 2}
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+ACTIVE = (QUEUED, RUNNING)
+
+
+class JobQueueFull(Exception):
+    """대기 작업 상한 초과"""
+
+
+def to_ranges(rounds):
+    """회차 목록 -> 연속 구간 [(start, end)]"""
+    ranges = []
+    for round_num in sorted(set(rounds)):
+        if ranges and round_num == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], round_num)
+        else:
+            ranges.append((round_num, round_num))
+    return ranges
+
+
+def subtract_ranges(ranges, covered):
+    """ranges에서 covered 구간들을 뺀 나머지 구간"""
+    remaining = list(ranges)
+    for cov_start, cov_end in covered:
+        next_remaining = []
+        for start, end in remaining:
+            if cov_end < start or end < cov_start:
+                next_remaining.append((start, end))
+                continue
+            if start < cov_start:
+                next_remaining.append((start, cov_start - 1))
+            if cov_end < end:
+                next_remaining.append((cov_end + 1, end))
+        remaining = next_remaining
+    return remaining
+
+
+def _overlaps(ranges, other):
+    return any(start <= o_end and o_start <= end for start, end in ranges for o_start, o_end in other)
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value).isoformat(timespec='seconds') if value else None
+
+
+class _Part:
+    """runner 안의 한 단위 (예: 구간 하나) 진행 상황"""
+    
+    __slots__ = ('planned', 'done', 'total')
+    
+    def __init__(self, planned):
+        self.planned = planned
+        self.done = 0
+        self.total = None
+
+
+class Job:
+    """크롤링 작업 하나"""
+    
+    def __init__(self, kind, ranges, priority, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.ranges = ranges
+        self.priority = priority
+        self.params = params
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.planned = sum(end - start + 1 for start, end in ranges)
+        self._parts = []
+        self._lock = threading.Lock()
+    
+    def tracker(self, planned=None):
+        """진행 보고 콜백 progress(done, total) (total: 이 단위에서 실제로 처리할 회차 수)"""
+        part = _Part(planned if planned is not None else self.planned)
+        with self._lock:
+            self._parts.append(part)
+        
+        def progress(done, total=None):
+            with self._lock:
+                part.done = done
+                if total is not None:
+                    part.total = total
+        return progress
+    
+    def _progress(self):
+        with self._lock:
+            done = sum(part.done for part in self._parts)
+            reported = sum(part.planned for part in self._parts)
+            total = sum(part.planned if part.total is None else part.total for part in self._parts)
+        # 아직 시작하지 않은 단위는 계획 회차 수로 계산
+        return done, total + max(self.planned - reported, 0)
+    
+    def to_dict(self):
+        done, total = self._progress()
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        rate = done / elapsed if elapsed > 0 else 0.0
+        
+        eta = None
+        if self.status == RUNNING and rate > 0:
+            eta = round(max(total - done, 0) / rate, 1)
+        
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "priority": self.priority,
+            "ranges": [list(r) for r in self.ranges],
+            "params": self.params,
+            "submitted_at": _timestamp(self.submitted_at),
+            "started_at": _timestamp(self.started_at),
+            "finished_at": _timestamp(self.finished_at),
+            "progress": {
+                "rounds_done": done,
+                "rounds_total": total,
+                "percent": round(done * 100 / total, 1) if total else (100.0 if self.finished_at else 0.0),
+                "elapsed_sec": round(elapsed, 1),
+                "rounds_per_sec": round(rate, 2),
+                "eta_sec": eta
+            },
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobQueue:
+    """우선순위 작업 큐 + 고정 크기 작업 스레드"""
+    
+    def __init__(self, workers=2, max_queued=50, history=100):
+        self.workers = max(1, int(workers))
+        self.max_queued = int(max_queued)
+        self.history = int(history)
+        self._runners = {}
+        self._jobs = {}
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._threads = []
+    
+    @classmethod
+    def from_env(cls):
+        return cls(
+            workers=int(os.getenv('CRAWL_JOB_WORKERS', 2)),
+            max_queued=int(os.getenv('CRAWL_JOB_MAX_QUEUED', 50)),
+            history=int(os.getenv('CRAWL_JOB_HISTORY', 100))
+        )
+    
+    def register(self, kind, runner):
+        """작업 종류별 실행 함수 등록 (runner(job) -> 결과 dict, 'success'가 False면 실패로 기록)"""
+        self._runners[kind] = runner
+    
+    def _start_workers(self):
+        # 첫 작업 등록 시 시작 (임포트만으로 스레드를 띄우지 않음)
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._work, name=f'crawl-job-{len(self._threads) + 1}', daemon=True)
+            self._threads.append(thread)
+            thread.start()
+    
+    def submit(self, kind, ranges, priority='normal', params=None):
+        """작업 등록 -> (job, created)
+        
+        같은 종류의 진행 중인 작업이 이미 맡은 회차는 빼고 등록합니다.
+        남는 회차가 없으면 겹치는 기존 작업을 created=False로 돌려줍니다.
+        """
+        if kind not in self._runners:
+            raise ValueError(f"등록되지 않은 작업 종류: {kind}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority는 {', '.join(PRIORITIES)} 중 하나여야 합니다: {priority}")
+        ranges = [(int(s), int(e)) for s, e in ranges]
+        if not ranges or any(s > e for s, e in ranges):
+            raise ValueError("회차 구간이 올바르지 않습니다")
+        
+        with self._cond:
+            active = [job for job in self._jobs.values() if job.kind == kind and job.status in ACTIVE]
+            overlapping = [job for job in active if _overlaps(ranges, job.ranges)]
+            remaining = subtract_ranges(
+                ranges, [r for job in overlapping for r in job.ranges])
+            if not remaining:
+                existing = overlapping[0]
+                logger.info(f"작업 중복: {kind} {ranges} -> 기존 작업 {existing.id}")
+                return existing, False
+            
+            queued = sum(1 for job in self._jobs.values() if job.status == QUEUED)
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"대기 작업이 {self.max_queued}개를 넘었습니다")
+            
+            job = Job(kind, remaining, priority, params or {})
+            self._jobs[job.id] = job
+            self._seq += 1
+            heapq.heappush(self._heap, (PRIORITIES[priority], self._seq, job))
+            self._prune()
+            self._start_workers()
+            self._cond.notify()
+        
+        logger.info(f"작업 등록: {job.id} {kind} {remaining} ({priority})")
+        return job, True
+    
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+    
+    def jobs(self, status=None):
+        """작업 목록 (최근 등록 순)"""
+        jobs = sorted(self._jobs.values(), key=lambda job: job.submitted_at, reverse=True)
+        return [job for job in jobs if status is None or job.status == status]
+    
+    def cancel(self, job_id):
+        """대기 중인 작업 취소 (실행 중이거나 끝난 작업은 False)"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            # 힙에서는 꺼낼 때 건너뜀
+            return True
+    
+    def stats(self):
+        counts = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.workers, "max_queued": self.max_queued, "jobs": counts}
+    
+    def _prune(self):
+        """끝난 작업은 최근 history개만 보관"""
+        finished = [job for job in self._jobs.values() if job.status not in ACTIVE]
+        if len(finished) <= self.history:
+            return
+        finished.sort(key=lambda job: job.finished_at)
+        for job in finished[:len(finished) - self.history]:
+            del self._jobs[job.id]
+    
+    def _next(self):
+        with self._cond:
+            while True:
+                while self._heap:
+                    _, _, job = heapq.heappop(self._heap)
+                    if job.status == QUEUED:
+                        job.status = RUNNING
+                        job.started_at = time.time()
+                        return job
+                self._cond.wait()
+    
+    def _work(self):
+        while True:
+            job = self._next()
+            logger.info(f"작업 시작: {job.id} {job.kind} {job.ranges}")
+            try:
+                result = self._runners[job.kind](job)
+                job.result = result
+                if isinstance(result, dict) and result.get('success') is False:
+                    job.error = result.get('error')
+                    job.status = FAILED
+                else:
+                    job.status = SUCCEEDED
+            except Exception as e:
+                logger.error(f"작업 실패: {job.id} ({e})")
+                job.error = str(e)
+                job.status = FAILED
+            job.finished_at = time.time()
+            logger.info(f"작업 종료: {job.id} {job.status} ({job.finished_at - job.started_at:.1f}s)")
+            with self._cond:
+                self._prune()
@@ -4,8 +4,15 @@ import os
 import logging
 from datetime import datetime
 from .database import Database
+from lotto_db import with_local_snapshot
+from lotto_db.events import RoundEventPublisher, redis_from_env
 from .crawler import LottoCrawler
 from .store_crawler import StoreCrawler
+from .draw_crawler import DrawCrawler
+from .draw_poller import DrawPoller, poll_trigger
+from .store_index import StoreGeoIndex, StoreSearchIndex
+from .jobs import JobQueue, JobQueueFull
+from .pagination import clamp_per_page, encode_cursor, decode_cursor, DEFAULT_PER_PAGE
 from apscheduler.schedulers.background import BackgroundScheduler
 
 # 로깅 설정
@@ -20,16 +27,95 @@ db = Database(
     host=os.getenv('MYSQL_HOST', 'localhost'),
     user=os.getenv('MYSQL_USER', 'root'),
     password=os.getenv('MYSQL_PASSWORD', ''),
-    database=os.getenv('MYSQL_DATABASE', 'lotto_db')
+    database=os.getenv('MYSQL_DATABASE', 'lotto_db'),
+    lazy=bool(os.getenv('LOCAL_SNAPSHOT_PATH'))
 )
 
+# 새 회차 저장 시 Redis로 이벤트 발행 (통계/ML 서비스가 구독)
+redis_client = redis_from_env()
+round_events = RoundEventPublisher(redis_client, source='data-collector')
+db.round_listener = round_events.publish
+
+# 로컬 SQLite 스냅샷 (MySQL 준비 전/장애 중 읽기 응답)
+db = with_local_snapshot(db)
+
 # 크롤러 초기화
 crawler = LottoCrawler(db)
 store_crawler = StoreCrawler(db)
+draw_crawler = DrawCrawler(db, cache=store_crawler.cache)
+
+# 판매점 좌표/검색 인덱스 (첫 검색 때 구성, 판매점 크롤링 후 갱신)
+store_geo_index = StoreGeoIndex()
+store_search_index = StoreSearchIndex()
+
+
+def on_stores_saved(stores):
+    store_search_index.apply(stores)
+    store_geo_index.apply(stores)
+
+
+store_crawler.stores_listener = on_stores_saved
+
+
+def run_store_crawl(job):
+    """회차별 판매점 수집 작업 (구간마다 크롤링)"""
+    results = [
+        store_crawler.crawl_historical_stores(
+            start_round, end_round,
+            resume=job.params.get('resume', True),
+            progress=job.tracker(end_round - start_round + 1)
+        )
+        for start_round, end_round in job.ranges
+    ]
+    failed = [r for r in results if not r['success']]
+    return {
+        "success": not failed,
+        "error": failed[0].get('error') if failed else None,
+        "ranges": results
+    }
+
+
+def run_draw_crawl(job):
+    """당첨 번호 일괄 크롤링 작업 (missing_only면 실행 시점에 빠진 회차를 다시 확인)"""
+    if job.params.get('missing_only'):
+        return draw_crawler.backfill(job.ranges, progress=job.tracker())
+    return draw_crawler.crawl_ranges(job.ranges, progress=job.tracker())
+
+
+# 오래 걸리는 크롤링은 작업 큐에서 실행 (요청은 작업 id만 바로 반환)
+job_queue = JobQueue.from_env()
+job_queue.register('stores', run_store_crawl)
+job_queue.register('draws', run_draw_crawl)
+
+
+def submit_job(kind, ranges, data, params=None):
+    """작업 등록 응답 (202, 같은 회차를 맡은 작업이 있으면 그 작업)"""
+    try:
+        job, created = job_queue.submit(
+            kind, ranges,
+            priority=data.get('priority', 'normal'),
+            params=params
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except JobQueueFull as e:
+        return jsonify({"success": False, "error": str(e)}), 429
+    
+    return jsonify({
+        "success": True,
+        "deduplicated": not created,
+        "job": job.to_dict(),
+        "status_url": f"/jobs/{job.id}"
+    }), 202
 
 # 스케줄러 설정 (주 1회 토요일 저녁 수집)
+# 추첨 후 새 회차 폴링 (토요일 DRAW_POLL_AT부터 저장될 때까지, 복제본 중 lease를 가진 하나만 요청)
+draw_poller = DrawPoller.from_env(draw_crawler, redis_client)
+
 scheduler = BackgroundScheduler()
-scheduler.add_job(func=crawler.collect_latest, trigger="cron", day_of_week='sat', hour=21)
+scheduler.add_job(
+    func=draw_poller.poll, trigger=poll_trigger(), id='draw-poll', max_instances=1, misfire_grace_time=3600
+)
 scheduler.start()
 
 
@@ -39,6 +125,19 @@ def health_check():
     return jsonify({"status": "healthy", "service": "data-collector"}), 200
 
 
+@app.route('/db/pool', methods=['GET'])
+def get_pool_stats():
+    """DB 커넥션 풀 지표"""
+    return jsonify({"success": True, "pool": db.pool_stats()}), 200
+
+
+@app.route('/db/queries', methods=['GET'])
+def get_query_stats():
+    """쿼리 형태별 실행 지표와 최근 느린 쿼리"""
+    top = request.args.get('top', 20, type=int)
+    return jsonify({"success": True, "queries": db.query_stats(top)}), 200
+
+
 @app.route('/collect', methods=['POST'])
 def collect_data():
     """수동 데이터 수집"""
@@ -61,6 +160,23 @@ def collect_data():
         }), 500
 
 
+@app.route('/collect/poll', methods=['POST'])
+def start_draw_poll():
+    """새 회차 폴링 즉시 시작 (백그라운드, 이미 실행 중이면 그대로)"""
+    data = request.get_json() or {}
+    if draw_poller.state.get('running'):
+        return jsonify({"success": True, "started": False, "poller": draw_poller.status()}), 200
+    
+    scheduler.add_job(func=draw_poller.poll, args=[data.get('round')], id='draw-poll-now', replace_existing=True)
+    return jsonify({"success": True, "started": True, "status_url": "/collect/poll"}), 202
+
+
+@app.route('/collect/poll', methods=['GET'])
+def get_draw_poll():
+    """새 회차 폴링 상태 (대상 회차, 확인 횟수, 다음 확인 시각, lease 소유자)"""
+    return jsonify({"success": True, "poller": draw_poller.status()}), 200
+
+
 @app.route('/latest', methods=['GET'])
 def get_latest():
     """최신 5회 당첨 번호 조회"""
@@ -83,17 +199,46 @@ def get_latest():
 
 @app.route('/history', methods=['GET'])
 def get_history():
-    """당첨 이력 조회 (페이지네이션)"""
+    """당첨 이력 조회 (커서 또는 페이지 번호 기반 페이지네이션)"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        per_page = clamp_per_page(request.args.get('per_page', DEFAULT_PER_PAGE, type=int))
+        page = request.args.get('page', type=int)
+        cursor = request.args.get('cursor')
+        before_round = request.args.get('before_round', type=int)
+        after_round = request.args.get('after_round', type=int)
+        
+        if cursor:
+            try:
+                direction, round_num = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+            if direction == 'before':
+                before_round, after_round = round_num, None
+            else:
+                before_round, after_round = None, round_num
+        
+        keyset = bool(cursor) or before_round is not None or after_round is not None
+        if page and not keyset:
+            # 기존 page/per_page 방식 (OFFSET)
+            results = db.get_history(max(page, 1), per_page)
+            has_older = len(results) == per_page
+            has_newer = page > 1
+        else:
+            results, has_older, has_newer = db.get_history_page(
+                before_round=before_round,
+                after_round=after_round,
+                limit=per_page
+            )
         
-        results = db.get_history(page, per_page)
+        next_cursor = encode_cursor('before', results[-1]['round']) if results and has_older else None
+        prev_cursor = encode_cursor('after', results[0]['round']) if results and has_newer else None
         
         return jsonify({
             "success": True,
-            "page": page,
+            "page": None if keyset else max(page or 1, 1),
             "per_page": per_page,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
             "data": results
         }), 200
     except Exception as e:
@@ -158,7 +303,7 @@ def crawl_real():
                     "success": False,
                     "error": "크롤링 실패"
                 }), 500
-                
+    
     except Exception as e:
         logger.error(f"크롤링 실패: {str(e)}")
         return jsonify({
@@ -169,25 +314,83 @@ def crawl_real():
 
 @app.route('/crawl/batch', methods=['POST'])
 def crawl_batch():
-    """여러 회차 일괄 크롤링"""
+    """여러 회차 일괄 크롤링 (백그라운드 작업으로 등록)"""
     try:
         data = request.get_json() or {}
         start_round = data.get('start_round', 1177)
         end_round = data.get('end_round')
         
         if not end_round:
-            end_round = real_crawler.get_latest_round()
+            end_round = draw_crawler.latest_round()
+        
+        return submit_job('draws', [(start_round, end_round)], data)
+    
+    except Exception as e:
+        logger.error(f"일괄 크롤링 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/crawl/backfill', methods=['POST'])
+def crawl_backfill():
+    """DB에 없거나 불완전한 회차만 크롤링 (빠진 구간을 백그라운드 작업으로 등록)"""
+    try:
+        data = request.get_json() or {}
+        start_round = data.get('start_round', 1)
+        end_round = data.get('end_round') or draw_crawler.latest_round()
         
-        result = real_crawler.crawl_multiple_rounds(start_round, end_round)
+        missing = draw_crawler.missing_ranges([(start_round, end_round)])
+        if not missing:
+            return jsonify({
+                "success": True,
+                "message": f"{start_round}~{end_round}회 빠진 회차 없음",
+                "missing_ranges": []
+            }), 200
         
+        logger.info(f"빠진 회차 구간 {len(missing)}개 등록: {missing[:10]}")
+        return submit_job('draws', missing, data, params={'missing_only': True})
+    
+    except Exception as e:
+        logger.error(f"빠진 회차 크롤링 실패: {str(e)}")
         return jsonify({
-            "success": True,
-            "message": f"{start_round}~{end_round}회 크롤링 완료",
-            "data": result
-        }), 200
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/ingest/batch', methods=['POST'])
+def ingest_batch():
+    """당첨 번호 일괄 저장 (다중 행 upsert)"""
+    try:
+        data = request.get_json() or {}
+        draws = data.get('draws') or []
+        chunk_size = data.get('chunk_size')
+        
+        if not draws:
+            return jsonify({"success": False, "error": "draws가 필요합니다"}), 400
+        
+        for draw in draws:
+            if len(draw.get('numbers') or []) != 6 or 'round' not in draw:
+                return jsonify({
+                    "success": False,
+                    "error": "각 회차는 round, draw_date, numbers(6개), bonus가 필요합니다"
+                }), 400
         
+        result = db.bulk_insert_lotto_numbers(
+            ({
+                'round': d['round'],
+                'draw_date': d.get('draw_date'),
+                'numbers': d['numbers'],
+                'bonus': d.get('bonus')
+            } for d in draws),
+            chunk_size=chunk_size
+        )
+        
+        return jsonify(result), 200 if result['success'] else 500
     except Exception as e:
-        logger.error(f"일괄 크롤링 실패: {str(e)}")
+        logger.error(f"일괄 저장 실패: {str(e)}")
         return jsonify({
             "success": False,
             "error": str(e)
@@ -204,7 +407,7 @@ def crawl_stores():
             return jsonify(result), 200
         else:
             return jsonify(result), 500
-            
+    
     except Exception as e:
         logger.error(f"판매점 크롤링 실패: {str(e)}")
         return jsonify({
@@ -215,20 +418,16 @@ def crawl_stores():
 
 @app.route('/stores/crawl/historical', methods=['POST'])
 def crawl_historical_stores():
-    """회차별 역사적 데이터 크롤링"""
+    """회차별 역사적 데이터 크롤링 (백그라운드 작업으로 등록)"""
     try:
         data = request.get_json() or {}
         start_round = data.get('start_round', 600)
-        end_round = data.get('end_round', None)
+        end_round = data.get('end_round') or store_crawler.latest_round()
+        resume = data.get('resume', True)
         
-        logger.info(f"역사적 데이터 크롤링 시작: {start_round}회부터")
-        result = store_crawler.crawl_historical_stores(start_round, end_round)
-        
-        if result['success']:
-            return jsonify(result), 200
-        else:
-            return jsonify(result), 500
-            
+        logger.info(f"역사적 데이터 크롤링 등록: {start_round}~{end_round}회")
+        return submit_job('stores', [(start_round, end_round)], data, params={'resume': resume})
+    
     except Exception as e:
         logger.error(f"역사적 데이터 크롤링 실패: {str(e)}")
         return jsonify({
@@ -237,6 +436,49 @@ def crawl_historical_stores():
         }), 500
 
 
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """크롤링 작업 목록 (?status=queued|running|succeeded|failed|cancelled)"""
+    jobs = job_queue.jobs(request.args.get('status'))
+    return jsonify({
+        "success": True,
+        "queue": job_queue.stats(),
+        "jobs": [job.to_dict() for job in jobs]
+    }), 200
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """작업 상태/진행 상황 (처리 회차, 초당 회차, ETA)"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "작업 없음"}), 404
+    return jsonify({"success": True, "job": job.to_dict()}), 200
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """대기 중인 작업 취소"""
+    if job_queue.get(job_id) is None:
+        return jsonify({"success": False, "error": "작업 없음"}), 404
+    if not job_queue.cancel(job_id):
+        return jsonify({"success": False, "error": "대기 중인 작업만 취소할 수 있습니다"}), 409
+    return jsonify({"success": True, "job": job_queue.get(job_id).to_dict()}), 200
+
+
+@app.route('/stores/crawl/checkpoint', methods=['GET'])
+def get_crawl_checkpoint():
+    """회차별 판매점 크롤링 체크포인트 상태"""
+    return jsonify({"success": True, "checkpoint": store_crawler.checkpoint.status()}), 200
+
+
+@app.route('/crawl/cache', methods=['GET'])
+def get_crawl_cache():
+    """크롤러 HTTP 응답 캐시 상태"""
+    cache = store_crawler.cache
+    return jsonify({"success": True, "cache": cache.status() if cache else None}), 200
+
+
 @app.route('/stores/top', methods=['GET'])
 def get_top_stores():
     """상위 판매점 조회"""
@@ -249,7 +491,7 @@ def get_top_stores():
             "count": len(stores),
             "data": stores
         }), 200
-        
+    
     except Exception as e:
         logger.error(f"판매점 조회 실패: {str(e)}")
         return jsonify({
@@ -270,7 +512,7 @@ def get_stores_by_region(region):
             "count": len(stores),
             "data": stores
         }), 200
-        
+    
     except Exception as e:
         logger.error(f"지역별 판매점 조회 실패: {str(e)}")
         return jsonify({
@@ -279,6 +521,71 @@ def get_stores_by_region(region):
         }), 500
 
 
+@app.route('/stores/nearby', methods=['GET'])
+def get_nearby_stores():
+    """근처 판매점 조회 (lat, lng 필수 / radius: km / k: 최대 개수)"""
+    lat = request.args.get('lat', type=float)
+    lng = request.args.get('lng', type=float)
+    if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return jsonify({
+            "success": False,
+            "error": "lat, lng는 올바른 좌표여야 합니다"
+        }), 400
+    
+    radius = request.args.get('radius', type=float)
+    k = min(max(request.args.get('k', 10, type=int), 1), 100)
+    
+    try:
+        store_geo_index.ensure(db)
+        stores = store_geo_index.nearby(lat, lng, k=k, radius_km=radius)
+        
+        return jsonify({
+            "success": True,
+            "count": len(stores),
+            "indexed": len(store_geo_index),
+            "data": stores
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"근처 판매점 조회 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/stores/search', methods=['GET'])
+def search_stores():
+    """판매점명/주소 검색 (q: 검색어, 부분 일치 / total_wins 순)"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({
+            "success": False,
+            "error": "q는 필수입니다"
+        }), 400
+    
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    
+    try:
+        store_search_index.ensure(db)
+        total, stores = store_search_index.search(query, limit)
+        
+        return jsonify({
+            "success": True,
+            "query": query,
+            "total": total,
+            "count": len(stores),
+            "data": stores
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"판매점 검색 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
 @app.route('/stores/stats/region', methods=['GET'])
 def get_region_stats():
     """지역별 통계"""
@@ -290,7 +597,7 @@ def get_region_stats():
             "count": len(stats),
             "data": stats
         }), 200
-        
+    
     except Exception as e:
         logger.error(f"지역별 통계 조회 실패: {str(e)}")
         return jsonify({
@@ -299,5 +606,46 @@ def get_region_stats():
         }), 500
 
 
+
+@app.route('/stores/stats/region/rebuild', methods=['POST'])
+def rebuild_region_stats():
+    """지역별 통계 요약 테이블 전체 재구성"""
+    try:
+        regions = db.rebuild_region_stats()
+        
+        return jsonify({
+            "success": True,
+            "regions": regions
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"지역별 통계 재구성 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/stores/totals/rebuild', methods=['POST'])
+def rebuild_store_totals():
+    """판매점 당첨 횟수를 회차 원장(store_round_wins) 전체로 다시 계산 (원장 트리거도 켬)"""
+    try:
+        updated = db.rebuild_store_totals()
+        if updated:
+            store_search_index.rebuild(db)
+            store_geo_index.rebuild(db)
+        
+        return jsonify({
+            "success": True,
+            "updated": updated
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"판매점 당첨 횟수 재계산 실패: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8001, debug=True)
@@ -0,0 +1,98 @@
+"""
+동행복권 페이지 전용 파서 (lxml)
+
+판매점 페이지에서 필요한 것은 첫 번째 .group_content 안의 표 한 개뿐이므로
+문서 전체를 BeautifulSoup 트리로 만들지 않고, 그 표 구간만 잘라 lxml로 파싱합니다.
+구간을 찾기 전에 주석과 <script>/<style> 내용은 지워 그 안의 태그 문자열에 속지 않게 하고,
+잘라내기가 맞지 않거나(표 닫는 태그 없음 등) 조각에 행이 없으면 문서 전체를 lxml로 파싱합니다.
+
+셀 텍스트는 BeautifulSoup get_text(strip=True)와 같게 만듭니다 (하위 문자열마다 strip 후 연결).
+"""
+import re
+
+from lxml import html as lxml_html
+
+# 태그로 보면 안 되는 구간 (주석, 스크립트/스타일 내용, 닫히지 않으면 문서 끝까지)
+_IGNORED = re.compile(
+    r'<!--.*?(?:-->|$)|<(script|style)\b[^>]*>.*?(?:</\1\s*>|$)', re.I | re.S)
+
+# 첫 번째 group_content 요소 (class 속성 안의 단어로 일치)
+_GROUP_CONTENT = re.compile(r'<[a-zA-Z][^>]*\bclass\s*=\s*["\'][^"\']*\bgroup_content\b', re.I)
+_TABLE_OPEN = re.compile(r'<table\b', re.I)
+_TABLE_CLOSE = re.compile(r'</table\s*>', re.I)
+
+# <select name="drwNo"> 의 첫 번째 option 값 (최신 회차)
+_DRW_SELECT = re.compile(r'<select\b[^>]*\bname\s*=\s*["\']drwNo["\'][^>]*>', re.I)
+_SELECT_CLOSE = re.compile(r'</select\s*>', re.I)
+_OPTION_VALUE = re.compile(r'<option\b[^>]*\bvalue\s*=\s*["\']?(\d+)', re.I)
+
+_GROUP_CONTENT_XPATH = (
+    "(//*[contains(concat(' ', normalize-space(@class), ' '), ' group_content ')])[1]"
+)
+
+
+def _cell_text(cell):
+    return ''.join(text.strip() for text in cell.itertext())
+
+
+def _rows(table_root):
+    """표의 tbody 행별 셀 텍스트 목록"""
+    return [
+        [_cell_text(cell) for cell in row.xpath('.//td')]
+        for row in table_root.xpath('.//table//tbody//tr')
+    ]
+
+
+def _first_table_fragment(page):
+    """첫 번째 group_content 안의 첫 표 HTML 조각
+
+    반환값: 조각 문자열 / 첫 group_content에 표가 없으면 '' / 잘라낼 수 없으면 None
+    """
+    group = _GROUP_CONTENT.search(page)
+    if group is None:
+        return None
+
+    table = _TABLE_OPEN.search(page, group.end())
+    next_group = _GROUP_CONTENT.search(page, group.end())
+    if table is None or (next_group is not None and next_group.start() < table.start()):
+        # 표가 다음 group_content에 속함 -> 첫 번째에는 표 없음
+        return ''
+
+    close = _TABLE_CLOSE.search(page, table.end())
+    if close is None:
+        return None
+    fragment = page[table.start():close.end()]
+    # 중첩 표는 잘라내기로 처리하지 않음
+    if _TABLE_OPEN.search(fragment, 1):
+        return None
+    return fragment
+
+
+def group_table_rows(page):
+    """첫 번째 .group_content 표의 행별 셀 텍스트 (group_content가 없으면 None)"""
+    fragment = _first_table_fragment(_IGNORED.sub('', page))
+    if fragment:
+        rows = _rows(lxml_html.fragment_fromstring(fragment, create_parent='div'))
+        if rows:
+            return rows
+
+    # 잘라낼 수 없거나 조각에 행이 없는 페이지: 문서 전체 파싱
+    if not page.strip():
+        return None
+    contents = lxml_html.document_fromstring(page).xpath(_GROUP_CONTENT_XPATH)
+    if not contents:
+        return None
+    return _rows(contents[0])
+
+
+def latest_round_option(page):
+    """회차 선택 상자의 첫 번째 값 (최신 회차, 없으면 None)"""
+    page = _IGNORED.sub('', page)
+    select = _DRW_SELECT.search(page)
+    if select is None:
+        return None
+    option = _OPTION_VALUE.search(page, select.end())
+    close = _SELECT_CLOSE.search(page, select.end())
+    if option is None or (close is not None and close.start() < option.start()):
+        return None
+    return int(option.group(1))
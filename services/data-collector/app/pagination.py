@@ -0,0 +1,42 @@
+"""
+회차(round) 기준 keyset 페이지네이션 커서
+
+커서는 {"before": 회차} 또는 {"after": 회차}를 base64로 감싼 불투명 토큰입니다.
+클라이언트는 내용을 해석하지 않고 next_cursor / prev_cursor를 그대로 돌려보냅니다.
+"""
+import base64
+import json
+
+# 한 페이지 최대 크기
+MAX_PER_PAGE = 100
+DEFAULT_PER_PAGE = 20
+
+
+def clamp_per_page(per_page):
+    """페이지 크기를 1 ~ MAX_PER_PAGE로 제한"""
+    if not per_page or per_page < 1:
+        return DEFAULT_PER_PAGE
+    return min(per_page, MAX_PER_PAGE)
+
+
+def encode_cursor(direction, round_num):
+    """('before' | 'after', 회차) -> 커서 토큰"""
+    payload = json.dumps({direction: int(round_num)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """커서 토큰 -> ('before' | 'after', 회차)
+    
+    잘못된 토큰이면 ValueError
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        (direction, round_num), = payload.items()
+    except Exception:
+        raise ValueError("잘못된 커서입니다")
+    
+    if direction not in ('before', 'after') or not isinstance(round_num, int):
+        raise ValueError("잘못된 커서입니다")
+    return direction, round_num
@@ -1,23 +1,36 @@
 import requests
-from bs4 import BeautifulSoup
 import logging
-import time
+import asyncio
 import re
+from .fetcher import AsyncFetcher
+from .page_parser import group_table_rows, latest_round_option
+from .checkpoint import CrawlCheckpoint, STORES_KIND
+from .http_cache import HttpCache, CacheMiss
 
 logger = logging.getLogger(__name__)
 
+# 회차별 1등 배출점 수집 시작 회차 (이 회차부터 최신까지 원장에 있으면 원장이 합계 기준)
+HISTORY_FIRST_ROUND = 601
+
 
 class StoreCrawler:
     """로또 판매점 정보 크롤러"""
     
-    def __init__(self, db):
+    # 판매점 저장 후 호출되는 콜백 (변경된 판매점 목록) - main에서 메모리 인덱스 갱신 연결
+    stores_listener = None
+    
+    def __init__(self, db, checkpoint=None):
         self.db = db
+        # 회차별 수집 결과/진행 상황 (재실행 시 완료 회차 건너뜀)
+        self.checkpoint = checkpoint or CrawlCheckpoint.from_env()
+        # 응답 디스크 캐시 (HTTP_CACHE_DIR가 없으면 None)
+        self.cache = HttpCache.from_env()
         self.base_url = "https://www.dhlottery.co.kr"
         # 최근 1등 배출점 목록 페이지
         self.store_url = f"{self.base_url}/store.do?method=topStore&pageGubun=L645"
         # 회차별 당첨 결과 페이지
         self.result_url = f"{self.base_url}/gameResult.do?method=byWin"
-        
+    
     def crawl_winning_stores(self):
         """1등 배출 판매점 크롤링"""
         try:
@@ -27,71 +40,51 @@ class StoreCrawler:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(self.store_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'euc-kr'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 1등 배출점만 찾기 (첫 번째 group_content)
-            contents = soup.select('.group_content')
-            if not contents or len(contents) < 1:
-                logger.error("1등 배출점 영역을 찾을 수 없습니다")
+            # 1등 배출점만 찾기 (첫 번째 group_content의 표)
+            page = self._get_page(self.store_url, headers)
+            round_num = latest_round_option(page)
+            winners = self._parse_round_winners(page)
+            if winners is None or round_num is None:
+                logger.error("1등 배출점 영역 또는 회차를 찾을 수 없습니다")
                 return {'success': False, 'error': '페이지 구조 오류'}
+            if not winners:
+                logger.warning(f"{round_num}회 1등 배출점이 아직 없습니다")
+                return {'success': False, 'round': round_num, 'error': '1등 배출점 없음'}
             
-            # 첫 번째 group_content = 1등 배출점
-            first_content = contents[0]
-            rows = first_content.select('table tbody tr')
+            for name, address, region, method in winners:
+                logger.info(f"수집: {round_num}회 {name} ({region}) - {method}")
             
-            stores = []
-            for row in rows:
-                cols = row.select('td')
-                if len(cols) >= 4:  # 번호, 상호명, 구분, 소재지, 위치보기
-                    try:
-                        rank = cols[0].get_text(strip=True)
-                        store_name = cols[1].get_text(strip=True)
-                        method = cols[2].get_text(strip=True)  # 자동/수동
-                        address = cols[3].get_text(strip=True)
-                        
-                        # URL이나 잘못된 판매점 이름 필터링
-                        if self._is_invalid_store_name(store_name):
-                            logger.warning(f"잘못된 판매점 이름 스킵: {store_name}")
-                            continue
-                        
-                        # 지역 추출
-                        region = self._extract_region(address)
-                        
-                        # 1등 배출점 데이터
-                        store_data = {
-                            'store_name': store_name,
-                            'address': address,
-                            'region': region,
-                            'wins_1st': 1,
-                            'wins_2nd': 0,
-                            'total_wins': 1,
-                            'rank': int(rank) if rank.isdigit() else len(stores) + 1
-                        }
-                        
-                        stores.append(store_data)
-                        logger.info(f"수집: {rank}. {store_name} ({region}) - {method}")
-                        
-                    except Exception as e:
-                        logger.error(f"판매점 파싱 오류: {e}")
-                        continue
-            
-            # DB 저장
-            if stores:
-                saved_count = self.save_stores(stores)
-                logger.info(f"총 {len(stores)}개 1등 배출 판매점 수집 완료, {saved_count}개 저장")
-                return {'success': True, 'count': len(stores), 'saved': saved_count}
-            else:
-                logger.warning("수집된 판매점 데이터 없음")
-                return {'success': False, 'error': '데이터 없음'}
-                
+            # 이 회차 원장만 교체 (당첨 횟수는 원장 트리거로 증분 갱신)
+            self.checkpoint.save_store_round(round_num, winners)
+            saved = self.save_round_winners([(round_num, winners)])
+            logger.info(f"{round_num}회 1등 배출점 {len(winners)}곳 반영")
+            return {
+                'success': not saved['ledger_failed_rounds'],
+                'round': round_num,
+                'count': len(winners),
+                **saved
+            }
+        
         except Exception as e:
             logger.error(f"판매점 크롤링 실패: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _get_page(self, url, headers, timeout=10):
+        """페이지 본문 (캐시 확인 후 요청, 최신 페이지라 짧게만 캐시)"""
+        if self.cache is not None:
+            body = self.cache.get(url)
+            if body is not None:
+                return body.decode('euc-kr', errors='replace')
+            if self.cache.replay:
+                raise CacheMiss(f"캐시에 없음 (replay): {url}")
+        
+        response = requests.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        if self.cache is not None:
+            self.cache.put(url, response.content)
+        response.encoding = 'euc-kr'
+        return response.text
+    
     def _is_invalid_store_name(self, store_name):
         """잘못된 판매점 이름 체크 (URL 등)"""
         if not store_name or len(store_name) < 2:
@@ -179,16 +172,65 @@ class StoreCrawler:
         
         return stores
     
-    def save_stores(self, stores):
-        """판매점 데이터 DB 저장"""
-        saved_count = 0
-        for store in stores:
-            if self.db.insert_store(store):
-                saved_count += 1
-        return saved_count
+    def save_round_winners(self, round_winners):
+        """회차별 1등 배출점을 DB 원장에 반영 (회차마다 한 트랜잭션, 내용이 바뀐 회차만 쓰기)
+        
+        round_winners: (회차, [(store_name, address, region, method)]) iterable
+        당첨 횟수가 바뀐 판매점이 있으면 순위를 다시 계산하고 stores_listener에 알립니다.
+        """
+        rounds, changed_rounds, failed_rounds, changed_ids = 0, 0, [], set()
+        for round_num, winners in round_winners:
+            rounds += 1
+            try:
+                store_ids = self.db.ingest_round_wins(round_num, winners)
+            except Exception as e:
+                logger.error(f"{round_num}회 원장 반영 실패: {e}")
+                failed_rounds.append(round_num)
+                continue
+            if store_ids:
+                changed_rounds += 1
+                changed_ids.update(store_ids)
+        
+        if changed_ids:
+            self.db.refresh_store_ranks()
+            self._notify_stores(self.db.get_stores_by_ids(sorted(changed_ids)))
+        logger.info(
+            f"원장 반영: {rounds}회 중 {changed_rounds}회 변경, 판매점 {len(changed_ids)}곳 갱신"
+            + (f", 실패 {failed_rounds}" if failed_rounds else "")
+        )
+        return {
+            'ledger_rounds': rounds,
+            'changed_rounds': changed_rounds,
+            'changed_stores': len(changed_ids),
+            'ledger_failed_rounds': failed_rounds
+        }
     
-    def crawl_historical_stores(self, start_round=601, end_round=None):
-        """회차별 1등 배출점 수집 및 집계"""
+    def _notify_stores(self, stores):
+        """저장된 판매점을 stores_listener에 알림 (실패해도 저장 결과에는 영향 없음)"""
+        if self.stores_listener is None:
+            return
+        try:
+            self.stores_listener(stores)
+        except Exception as e:
+            logger.error(f"판매점 저장 알림 실패: {e}")
+    
+    def latest_round(self):
+        """판매점 페이지의 회차 선택 상자로 최신 회차 확인 (못 찾으면 1196)"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        return latest_round_option(self._get_page(self.store_url, headers)) or 1196
+    
+    def crawl_historical_stores(self, start_round=HISTORY_FIRST_ROUND, end_round=None, resume=True, progress=None):
+        """회차별 1등 배출점 수집 및 DB 원장 반영
+        
+        회차마다 결과를 체크포인트에 바로 저장하고, resume이면 이미 완료된 회차는 다시 받지 않습니다.
+        이번에 받은 회차와 체크포인트에만 있고 원장에 없는 회차를 원장에 반영하므로
+        일부 회차만 다시 수집해도 판매점 합계는 전체 원장 기준으로 유지됩니다.
+        progress(done, total)는 회차를 저장할 때마다 호출됩니다 (total: 이번에 받을 회차 수).
+        원장 트리거가 꺼져 있을 때 HISTORY_FIRST_ROUND ~ 최신 회차를 실패 없이 마치면
+        합계를 원장 기준으로 다시 계산하고 트리거를 켭니다.
+        """
         try:
             logger.info(f"{start_round}회차부터 역사적 데이터 수집 시작...")
             
@@ -197,127 +239,112 @@ class StoreCrawler:
             }
             
             # 최신 회차 확인
+            to_latest = not end_round
             if not end_round:
-                # 페이지에서 최신 회차 확인
-                response = requests.get(self.store_url, headers=headers, timeout=10)
-                response.encoding = 'euc-kr'
-                soup = BeautifulSoup(response.text, 'html.parser')
-                select_drw = soup.select('select[name="drwNo"] option')
-                if select_drw:
-                    end_round = int(select_drw[0].get('value'))
-                else:
-                    end_round = 1196
+                end_round = self.latest_round()
             
             logger.info(f"수집 범위: {start_round}회 ~ {end_round}회 (총 {end_round - start_round + 1}회)")
             
-            # 판매점별 당첨 횟수 집계
-            stores_dict = {}  # {store_key: {store_name, address, region, wins_1st}}
+            # 완료된 회차는 건너뜀
+            done_rounds = (
+                self.checkpoint.done_rounds(STORES_KIND, start_round, end_round) if resume else set()
+            )
+            urls = {
+                round_num: f"{self.store_url}&drwNo={round_num}"
+                for round_num in range(start_round, end_round + 1)
+                if round_num not in done_rounds
+            }
+            if done_rounds:
+                logger.info(f"체크포인트에서 이어서 수집: 완료 {len(done_rounds)}회, 남은 {len(urls)}회")
             
-            total_rounds = end_round - start_round + 1
-            for idx, round_num in enumerate(range(start_round, end_round + 1)):
-                retry_count = 0
-                max_retries = 3
-                response = None
-                
-                while retry_count < max_retries:
-                    try:
-                        if (idx + 1) % 50 == 0 or (idx + 1) == total_rounds:
-                            logger.info(f"진행 중... {idx + 1}/{total_rounds} ({round_num}회)")
-                        
-                        # 회차별 1등 배출점 페이지
-                        url = f"{self.store_url}&drwNo={round_num}"
-                        response = requests.get(url, headers=headers, timeout=30)
-                        response.raise_for_status()
-                        response.encoding = 'euc-kr'
-                        break  # 성공하면 루프 탈출
-                        
-                    except requests.exceptions.Timeout:
-                        retry_count += 1
-                        if retry_count < max_retries:
-                            wait_time = retry_count * 5
-                            logger.warning(f"{round_num}회 타임아웃, {wait_time}초 후 재시도 ({retry_count}/{max_retries})")
-                            time.sleep(wait_time)
-                        else:
-                            logger.error(f"{round_num}회 수집 실패 (타임아웃)")
-                    except Exception as e:
-                        logger.error(f"{round_num}회 수집 오류: {e}")
-                        retry_count = max_retries  # 다른 오류는 재시도 안 함
-                
-                if retry_count >= max_retries or response is None:
-                    continue
-                
-                # 파싱
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 첫 번째 group_content = 1등 배출점
-                contents = soup.select('.group_content')
-                if contents and len(contents) > 0:
-                    rows = contents[0].select('table tbody tr')
-                    
-                    for row in rows:
-                        cols = row.select('td')
-                        if len(cols) >= 4:
-                            rank = cols[0].get_text(strip=True)
-                            store_name = cols[1].get_text(strip=True)
-                            method = cols[2].get_text(strip=True)
-                            address = cols[3].get_text(strip=True)
-                            
-                            # URL이나 잘못된 판매점 이름 필터링
-                            if self._is_invalid_store_name(store_name):
-                                continue
-                            
-                            region = self._extract_region(address)
-                            
-                            # 판매점 식별 키 (주소 기반)
-                            store_key = f"{store_name}_{address}"
-                            
-                            if store_key not in stores_dict:
-                                stores_dict[store_key] = {
-                                    'store_name': store_name,
-                                    'address': address,
-                                    'region': region,
-                                    'wins_1st': 0,
-                                    'wins_2nd': 0
-                                }
-                            
-                            stores_dict[store_key]['wins_1st'] += 1
-                
-                # 서버 부하 방지 - 대기 시간 증가
-                time.sleep(1.0)
+            # 회차별 1등 배출점 페이지 동시 수집 (받는 즉시 파싱해 체크포인트에 저장)
+            fetcher = AsyncFetcher.from_env(headers=headers, cache=self.cache)
+            total_rounds = len(urls)
+            done = []
+            if progress:
+                progress(0, total_rounds)
             
-            # 결과 정리
-            stores = []
-            for data in stores_dict.values():
-                data['total_wins'] = data['wins_1st'] + data['wins_2nd']
-                stores.append(data)
+            def on_page(round_num, text):
+                winners = self._parse_round_winners(text)
+                if winners is None:
+                    logger.warning(f"{round_num}회 1등 배출점 영역 없음 (미완료로 남김)")
+                    return False
+                if not winners:
+                    # 발표 전에 받은 페이지 등 -> 완료로 표시하지 않아야 이어서 수집할 때 다시 받음
+                    logger.warning(f"{round_num}회 1등 배출점 없음 (미완료로 남김)")
+                    return False
+                self.checkpoint.save_store_round(round_num, winners)
+                done.append(round_num)
+                if progress:
+                    progress(len(done), total_rounds)
+                if len(done) % 50 == 0 or len(done) == total_rounds:
+                    logger.info(f"진행 중... {len(done)}/{total_rounds} ({round_num}회)")
+                return True
             
-            # 당첨 횟수로 정렬
-            stores.sort(key=lambda x: x['total_wins'], reverse=True)
+            # 지난 회차 페이지는 바뀌지 않으므로 캐시에 영구 보관
+            results, failed = asyncio.run(fetcher.fetch_many(
+                urls, on_page=on_page, permanent=lambda round_num: round_num < end_round))
+            failed_rounds = sorted(set(failed) | {r for r, ok in results.items() if not ok})
+            logger.info(
+                f"페이지 수집: {len(done)}/{total_rounds}회 "
+                f"(요청 {fetcher.stats['requests']}, 재시도 {fetcher.stats['retries']}, "
+                f"{fetcher.stats['elapsed_ms']}ms)"
+            )
             
-            # 순위 부여
-            for i, store in enumerate(stores):
-                store['rank'] = i + 1
+            # DB 원장 반영 (이번에 받은 회차 + 체크포인트에만 있고 원장에 없는 회차)
+            checkpointed = self.checkpoint.done_rounds(STORES_KIND, start_round, end_round)
+            pending = sorted(
+                set(done) | (checkpointed - self.db.get_ledger_rounds(start_round, end_round)))
+            saved = self.save_round_winners(
+                (round_num, self.checkpoint.store_round(round_num)) for round_num in pending)
             
-            # DB 저장
-            if stores:
-                saved_count = self.save_stores(stores)
-                logger.info(f"총 {len(stores)}개 판매점 수집 완료, {saved_count}개 저장")
-                top_10 = [f"{s['store_name']}({s['wins_1st']}회)" for s in stores[:10]]
-                logger.info(f"TOP 10: {top_10}")
-                return {
-                    'success': True, 
-                    'count': len(stores), 
-                    'saved': saved_count,
-                    'rounds': f'{start_round}-{end_round}'
-                }
-            else:
-                logger.warning("수집된 판매점 데이터 없음")
-                return {'success': False, 'error': '데이터 없음'}
-                
+            # 원장이 전체 회차를 담게 되면 원장 기준 합계로 전환 (그 전까지는 기존 합계 유지)
+            ledger_activated = False
+            ledger_complete = (
+                start_round <= HISTORY_FIRST_ROUND and to_latest
+                and not failed_rounds and not saved['ledger_failed_rounds']
+            )
+            if ledger_complete and not self.db.is_store_ledger_active():
+                self.db.rebuild_store_totals()
+                self._notify_stores(self.db.get_all_stores())
+                ledger_activated = True
+            
+            return {
+                'success': not failed_rounds and not saved['ledger_failed_rounds'],
+                'rounds': f'{start_round}-{end_round}',
+                'fetched_rounds': len(done),
+                'resumed_rounds': len(done_rounds),
+                'failed_rounds': failed_rounds,
+                **saved,
+                'ledger_activated': ledger_activated,
+                'fetch': fetcher.stats
+            }
+        
         except Exception as e:
             logger.error(f"역사적 데이터 수집 실패: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _parse_round_winners(self, html):
+        """회차 페이지의 1등 배출점 [(store_name, address, region, method)] (페이지 구조가 다르면 None)"""
+        # 첫 번째 group_content = 1등 배출점
+        rows = group_table_rows(html)
+        if rows is None:
+            return None
+        
+        winners = []
+        for cols in rows:
+            if len(cols) < 4:
+                continue
+            store_name = cols[1]
+            address = cols[3]
+            
+            # URL이나 잘못된 판매점 이름 필터링
+            if self._is_invalid_store_name(store_name):
+                continue
+            
+            winners.append((store_name, address, self._extract_region(address), cols[2]))
+        return winners
+    
     def _parse_store_from_result(self, store_text):
         """당첨 결과 페이지의 판매점 정보 파싱"""
         stores = []
@@ -355,7 +382,7 @@ class StoreCrawler:
             # 현재는 전국 TOP 판매점만 수집
             
             return self.crawl_winning_stores()
-            
+        
         except Exception as e:
             logger.error(f"지역별 크롤링 실패: {e}")
             return {'success': False, 'error': str(e)}
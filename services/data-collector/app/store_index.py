@@ -0,0 +1,325 @@
+"""
+판매점 메모리 인덱스
+
+StoreGeoIndex: 위도/경도 격자 버킷 (CELL_DEGREES 단위 칸)
+  - 근처 k개 / 반경 검색은 질의 지점 주변 칸부터 바깥으로 넓혀 가며 후보만 거리 계산
+  - 좌표가 없는 판매점은 색인하지 않음
+  - 판매점 크롤링 후에는 바뀐 판매점만 증분 반영 (바뀐 칸의 목록만 새로 만들어 교체)
+StoreSearchIndex: 판매점명/주소 1-gram, 2-gram 역색인
+  - 검색어의 n-gram 목록을 교집합한 뒤 부분 문자열로 확인, total_wins 순 정렬
+  - 판매점 크롤링 후에는 저장된 판매점만 증분 반영
+
+재구성은 lotto_stores 전체를 읽어 새 구조를 만든 뒤 한 번에 교체하므로
+재구성 중에도 검색은 이전 인덱스로 응답합니다.
+"""
+import math
+import time
+import heapq
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 격자 칸 크기 (도 단위, 위도 0.05도 ≈ 5.6km)
+CELL_DEGREES = 0.05
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# 응답에 포함하는 판매점 컬럼
+STORE_FIELDS = (
+    'store_id', 'store_name', 'address', 'region',
+    'wins_1st', 'wins_2nd', 'total_wins', 'rank'
+)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """두 좌표 사이 대권 거리 (km)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell(lat, lng):
+    return int(math.floor(lat / CELL_DEGREES)), int(math.floor(lng / CELL_DEGREES))
+
+
+def _ring(cy, cx, r, bounds):
+    """(cy, cx)에서 체비셰프 거리 r인 칸 중 bounds(min_y, max_y, min_x, max_x) 안의 칸들"""
+    min_y, max_y, min_x, max_x = bounds
+    x_from, x_to = max(cx - r, min_x), min(cx + r, max_x)
+    for y in {cy - r, cy + r}:
+        if min_y <= y <= max_y:
+            for x in range(x_from, x_to + 1):
+                yield y, x
+    y_from, y_to = max(cy - r + 1, min_y), min(cy + r - 1, max_y)
+    for x in {cx - r, cx + r}:
+        if min_x <= x <= max_x:
+            for y in range(y_from, y_to + 1):
+                yield y, x
+
+
+class StoreGeoIndex:
+    """판매점 좌표 격자 인덱스"""
+    
+    def __init__(self):
+        # (stores, lats, lngs, grid, bounds) - 재구성 시 통째로 교체
+        self._data = None
+        self._positions = {}   # store_id -> stores 번호 (격자에 색인된 판매점만)
+        self._lock = threading.Lock()
+        self.built_at = None
+    
+    @property
+    def ready(self):
+        return self._data is not None
+    
+    def __len__(self):
+        return len(self._positions)
+    
+    def rebuild(self, db):
+        """DB의 판매점 전체로 인덱스 재구성 (반환값: 색인된 판매점 수)"""
+        rows = db.get_all_stores()
+        
+        stores, lats, lngs, grid, positions = [], [], [], {}, {}
+        for row in rows:
+            if row.get('latitude') is None or row.get('longitude') is None:
+                continue
+            lat, lng = float(row['latitude']), float(row['longitude'])
+            grid.setdefault(_cell(lat, lng), []).append(len(stores))
+            positions[row.get('store_id')] = len(stores)
+            stores.append({field: row.get(field) for field in STORE_FIELDS})
+            lats.append(lat)
+            lngs.append(lng)
+        
+        with self._lock:
+            self._data = (stores, lats, lngs, grid, self._bounds(grid))
+            self._positions = positions
+            self.built_at = time.time()
+        logger.info(f"판매점 좌표 인덱스 재구성: {len(stores)}/{len(rows)}개 ({len(grid)}칸)")
+        return len(stores)
+    
+    @staticmethod
+    def _bounds(grid):
+        """격자 칸 범위 (min_y, max_y, min_x, max_x) - 빈 칸 목록은 제외"""
+        keys = [key for key, members in grid.items() if members]
+        if not keys:
+            return None
+        ys = [cy for cy, _ in keys]
+        xs = [cx for _, cx in keys]
+        return min(ys), max(ys), min(xs), max(xs)
+    
+    def ensure(self, db):
+        """아직 만들어지지 않았으면 재구성"""
+        if self._data is None:
+            self.rebuild(db)
+    
+    def apply(self, stores):
+        """저장된 판매점 증분 반영 (당첨 횟수/순위 갱신, 좌표가 바뀌면 칸 이동, 새 판매점 추가)
+        
+        검색 중인 스레드가 보던 칸 목록은 바꾸지 않고, 바뀐 칸만 새 목록으로 교체합니다.
+        """
+        if self._data is None:
+            return 0
+        added = moved = 0
+        with self._lock:
+            rows, lats, lngs, grid, bounds = self._data
+            grid = dict(grid)
+            for store in stores:
+                store_id = store.get('store_id')
+                i = self._positions.get(store_id)
+                has_coords = store.get('latitude') is not None and store.get('longitude') is not None
+                
+                if i is not None:
+                    rows[i] = dict(rows[i], **{
+                        field: store[field] for field in STORE_FIELDS if store.get(field) is not None})
+                    old_cell = _cell(lats[i], lngs[i])
+                    if not has_coords:
+                        grid[old_cell] = [j for j in grid[old_cell] if j != i]
+                        del self._positions[store_id]
+                        moved += 1
+                        continue
+                    lat, lng = float(store['latitude']), float(store['longitude'])
+                    if (lat, lng) == (lats[i], lngs[i]):
+                        continue
+                    lats[i], lngs[i] = lat, lng
+                    if _cell(lat, lng) != old_cell:
+                        grid[old_cell] = [j for j in grid[old_cell] if j != i]
+                        grid[_cell(lat, lng)] = grid.get(_cell(lat, lng), []) + [i]
+                    moved += 1
+                elif has_coords:
+                    i = len(rows)
+                    rows.append({field: store.get(field) for field in STORE_FIELDS})
+                    lats.append(float(store['latitude']))
+                    lngs.append(float(store['longitude']))
+                    key = _cell(lats[i], lngs[i])
+                    grid[key] = grid.get(key, []) + [i]
+                    self._positions[store_id] = i
+                    added += 1
+            
+            if added or moved:
+                self._data = (rows, lats, lngs, grid, self._bounds(grid))
+        logger.info(f"판매점 좌표 인덱스 반영: {len(stores)}개 (신규 {added}개, 좌표 변경 {moved}개)")
+        return len(stores)
+    
+    def nearby(self, lat, lng, k=10, radius_km=None):
+        """(lat, lng)에서 가까운 판매점 최대 k개 (radius_km가 있으면 반경 안만)
+        
+        반환값: 거리 오름차순 판매점 dict 목록 (distance_km 포함)
+        """
+        data = self._data
+        if data is None or data[4] is None or k <= 0:
+            return []
+        stores, lats, lngs, grid, bounds = data
+        min_y, max_y, min_x, max_x = bounds
+        
+        cy, cx = _cell(lat, lng)
+        max_ring = max(cy - min_y, max_y - cy, cx - min_x, max_x - cx, 0)
+        if radius_km is not None:
+            max_ring = min(max_ring, int(radius_km / self._cell_km(lat, max_ring)) + 1)
+        
+        # 최대 힙 (-거리, 인덱스) - 가장 먼 후보를 빠르게 교체
+        best = []
+        seen = 0
+        for r in range(max_ring + 1):
+            for key in _ring(cy, cx, r, bounds):
+                for i in grid.get(key, ()):
+                    seen += 1
+                    d = haversine_km(lat, lng, lats[i], lngs[i])
+                    if radius_km is not None and d > radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, i))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, i))
+            
+            # 바깥 칸은 모두 r칸 너비보다 멀리 있음
+            if (len(best) >= k and -best[0][0] <= r * self._cell_km(lat, r)) or seen >= len(stores):
+                break
+        
+        return [
+            dict(stores[i], latitude=lats[i], longitude=lngs[i], distance_km=round(-neg, 3))
+            for neg, i in sorted(best, reverse=True)
+        ]
+    
+    @staticmethod
+    def _cell_km(lat, r):
+        """r칸 안에서 한 칸의 최소 너비 (km, 고위도 쪽 경도 방향이 가장 좁음)"""
+        widest_lat = min(abs(lat) + (r + 1) * CELL_DEGREES, 89.0)
+        return CELL_DEGREES * KM_PER_DEGREE * math.cos(math.radians(widest_lat))
+    
+    def status(self):
+        return {"ready": self.ready, "stores": len(self), "built_at": self.built_at}
+
+
+def _normalize(text):
+    """검색용 정규화 (소문자, 공백 제거)"""
+    return ''.join((text or '').lower().split())
+
+
+def _grams(text):
+    """1-gram + 2-gram 집합"""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class StoreSearchIndex:
+    """판매점명/주소 n-gram 역색인"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs = []        # 판매점 dict
+        self._texts = []       # (정규화된 판매점명, 정규화된 주소)
+        self._keys = {}        # (store_name, address) -> 문서 번호
+        self._postings = {}    # n-gram -> 문서 번호 집합
+        self.built_at = None
+    
+    @property
+    def ready(self):
+        return self.built_at is not None
+    
+    def __len__(self):
+        return len(self._docs)
+    
+    def rebuild(self, db):
+        """DB의 판매점 전체로 인덱스 재구성 (반환값: 색인된 판매점 수)"""
+        rows = db.get_all_stores()
+        docs, texts, keys, postings = [], [], {}, {}
+        for row in rows:
+            self._add(row, docs, texts, keys, postings)
+        
+        with self._lock:
+            self._docs, self._texts, self._keys, self._postings = docs, texts, keys, postings
+            self.built_at = time.time()
+        logger.info(f"판매점 검색 인덱스 재구성: {len(docs)}개 ({len(postings)}개 n-gram)")
+        return len(docs)
+    
+    def ensure(self, db):
+        """아직 만들어지지 않았으면 재구성"""
+        if not self.ready:
+            self.rebuild(db)
+    
+    @staticmethod
+    def _add(store, docs, texts, keys, postings):
+        doc_id = len(docs)
+        name, address = _normalize(store.get('store_name')), _normalize(store.get('address'))
+        docs.append({field: store.get(field) for field in STORE_FIELDS})
+        texts.append((name, address))
+        keys[(store.get('store_name'), store.get('address'))] = doc_id
+        for gram in _grams(name) | _grams(address):
+            postings.setdefault(gram, set()).add(doc_id)
+    
+    def apply(self, stores):
+        """저장된 판매점 증분 반영 (기존 판매점은 당첨 횟수/순위 갱신, 새 판매점은 색인 추가)"""
+        if not self.ready:
+            return 0
+        added = 0
+        with self._lock:
+            for store in stores:
+                doc_id = self._keys.get((store.get('store_name'), store.get('address')))
+                if doc_id is None:
+                    self._add(store, self._docs, self._texts, self._keys, self._postings)
+                    added += 1
+                else:
+                    self._docs[doc_id].update(
+                        {field: store[field] for field in STORE_FIELDS if store.get(field) is not None})
+        logger.info(f"판매점 검색 인덱스 반영: {len(stores)}개 (신규 {added}개)")
+        return len(stores)
+    
+    def search(self, query, limit=20):
+        """판매점명/주소에 query가 포함된 판매점 (total_wins 내림차순, 같으면 이름 접두 일치 우선)
+        
+        반환값: (전체 일치 수, 상위 limit개 판매점 dict 목록)
+        """
+        text = _normalize(query)
+        if not text:
+            return 0, []
+        grams = {text} if len(text) == 1 else {text[i:i + 2] for i in range(len(text) - 1)}
+        
+        with self._lock:
+            # 가장 짧은 목록부터 교집합
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+            
+            # 2글자 이하는 n-gram 목록이 곧 결과, 더 길면 연속 여부를 부분 문자열로 확인
+            if len(text) <= 2:
+                matches = candidates
+            else:
+                matches = [
+                    i for i in candidates
+                    if text in self._texts[i][0] or text in self._texts[i][1]
+                ]
+            top = heapq.nlargest(limit, matches, key=lambda i: (
+                self._docs[i].get('total_wins') or 0,
+                self._texts[i][0].startswith(text),
+                -i
+            ))
+            return len(matches), [dict(self._docs[i]) for i in top]
+    
+    def status(self):
+        return {"ready": self.ready, "stores": len(self), "grams": len(self._postings),
+                "built_at": self.built_at}
@@ -0,0 +1,181 @@
+"""
+판매점 페이지 파서 벤치마크 (기존 BeautifulSoup 경로 vs app.page_parser)
+
+    cd services/data-collector
+    python benchmarks/bench_page_parser.py --cache-dir /app/local/http-cache   # 크롤러 캐시의 녹화 페이지
+    python benchmarks/bench_page_parser.py --pages ./recorded                  # *.html 파일 (euc-kr/utf-8)
+    python benchmarks/bench_page_parser.py --synthetic 200                     # 실제 구조를 흉내 낸 페이지
+
+페이지마다 파싱 시간(중앙값/p95)과 tracemalloc 최대 메모리를 재고, 두 파서의 결과가 같은지 확인합니다.
+결과 비교에는 주석/스크립트 안의 태그 같은 EDGE_CASES 페이지도 항상 포함합니다.
+"""
+import os
+import sys
+import glob
+import time
+import zlib
+import sqlite3
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.page_parser import group_table_rows  # noqa: E402
+
+
+def bs4_rows(page, backend='html.parser'):
+    """기존 크롤러와 같은 경로 (문서 전체 트리 + .group_content 선택)"""
+    soup = BeautifulSoup(page, backend)
+    contents = soup.select('.group_content')
+    if not contents:
+        return None
+    return [
+        [td.get_text(strip=True) for td in row.select('td')]
+        for row in contents[0].select('table tbody tr')
+    ]
+
+
+PARSERS = {
+    "bs4 html.parser (기존)": bs4_rows,
+    "bs4 lxml": lambda page: bs4_rows(page, 'lxml'),
+    "page_parser (lxml 조각)": group_table_rows,
+}
+
+
+# 잘라내기가 틀리기 쉬운 페이지 (어떤 입력이든 항상 기존 경로와 결과 비교)
+EDGE_CASES = {
+    "주석 처리된 표": '<div class="group_content"><!-- <table><tbody><tr><td>bad</td></tr></tbody></table> -->'
+                  '<table><tbody><tr><td>good</td></tr></tbody></table></div>',
+    "스크립트 안의 group_content": '<script>var s = "<div class=\'group_content\'>";</script>'
+                              '<div class="group_content"><table><tbody><tr><td>ok</td></tr></tbody></table></div>',
+    "스타일 안의 표": '<style>/* <table> */ .group_content { }</style>'
+                  '<div class="group_content"><table><tbody><tr><td>ok</td></tr></tbody></table></div>',
+    "셀 안의 주석": '<div class="group_content"><table><tbody><tr><td>a<!-- x -->b</td></tr></tbody></table></div>',
+    "첫 group_content에 표 없음": '<div class="group_content"><p>없음</p></div>'
+                             '<div class="group_content"><table><tbody><tr><td>2등</td></tr></tbody></table></div>',
+    "닫히지 않은 표": '<div class="group_content"><table><tbody><tr><td>ok</td></tr></tbody></div>',
+    "닫히지 않은 주석": '<div class="group_content"><table><tbody><tr><td>ok</td></tr></tbody></table></div><!-- 끝',
+    "group_content 없음": '<div>x</div>',
+}
+
+
+def load_cache(directory, limit):
+    """HttpCache 디렉터리의 저장된 응답 본문"""
+    conn = sqlite3.connect(os.path.join(directory, 'index.sqlite3'))
+    try:
+        rows = conn.execute(
+            "SELECT digest FROM responses WHERE round IS NOT NULL ORDER BY round LIMIT ?", (limit,)
+        ).fetchall()
+    finally:
+        conn.close()
+    pages = []
+    for (digest,) in rows:
+        with open(os.path.join(directory, 'objects', digest[:2], digest), 'rb') as f:
+            pages.append(zlib.decompress(f.read()).decode('euc-kr', errors='replace'))
+    return pages
+
+
+def load_files(directory, limit):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html')))[:limit]:
+        with open(path, 'rb') as f:
+            body = f.read()
+        try:
+            pages.append(body.decode('utf-8'))
+        except UnicodeDecodeError:
+            pages.append(body.decode('euc-kr', errors='replace'))
+    return pages
+
+
+def synthetic_pages(count):
+    """메뉴/스크립트가 많은 실제 페이지 크기(수십 KB)를 흉내 낸 페이지"""
+    nav = ''.join(f'<li class="menu"><a href="/m{i}">메뉴 {i}</a><ul>'
+                  + ''.join(f'<li><a href="/m{i}/{j}">하위 {j}</a></li>' for j in range(8))
+                  + '</ul></li>' for i in range(40))
+    script = '<script>' + 'var x = 1;\n' * 400 + '</script>'
+    pages = []
+    for n in range(count):
+        winners = ''.join(
+            f'<tr><td>{i + 1}</td><td>행운복권방 {n}-{i}</td><td>자동</td>'
+            f'<td>서울 강남구 역삼동 {i}-{n}</td><td><a href="#" class="btn">위치보기</a></td></tr>'
+            for i in range(5 + n % 10)
+        )
+        seconds = ''.join(
+            f'<tr><td>{i + 1}</td><td>2등점 {i}</td><td>부산 해운대구 {i}</td><td></td></tr>'
+            for i in range(60)
+        )
+        pages.append(
+            f'<html><head>{script}</head><body><ul class="gnb">{nav}</ul>'
+            f'<select name="drwNo">' + ''.join(f'<option value="{r}">{r}</option>' for r in range(1196, 0, -1))
+            + '</select>'
+            f'<div class="group_content"><h4>1등 배출점</h4><table class="tbl_data"><thead><tr><th>번호</th></tr></thead>'
+            f'<tbody>{winners}</tbody></table></div>'
+            f'<div class="group_content"><h4>2등 배출점</h4><table><tbody>{seconds}</tbody></table></div>'
+            f'<div class="footer">{nav}</div></body></html>'
+        )
+    return pages
+
+
+def measure(parse, pages):
+    """페이지별 (시간 ms, 최대 메모리 KB)"""
+    times, peaks = [], []
+    for page in pages:
+        started = time.perf_counter()
+        parse(page)
+        times.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        parse(page)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    return times, peaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="판매점 페이지 파서 벤치마크")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--cache-dir', help="HttpCache 디렉터리 (HTTP_CACHE_DIR)")
+    source.add_argument('--pages', help="녹화한 *.html 파일 디렉터리")
+    source.add_argument('--synthetic', type=int, help="만들 가상 페이지 수")
+    parser.add_argument('--limit', type=int, default=500, help="최대 페이지 수")
+    args = parser.parse_args()
+
+    if args.cache_dir:
+        pages = load_cache(args.cache_dir, args.limit)
+    elif args.pages:
+        pages = load_files(args.pages, args.limit)
+    else:
+        pages = synthetic_pages(min(args.synthetic, args.limit))
+    if not pages:
+        print("페이지 없음")
+        return 1
+
+    avg_kb = sum(len(p.encode('utf-8')) for p in pages) / len(pages) / 1024
+    print(f"페이지 {len(pages)}개 (평균 {avg_kb:.1f}KB)\n")
+
+    baseline = [bs4_rows(page) for page in pages]
+    mismatches = sum(group_table_rows(page) != expected for page, expected in zip(pages, baseline))
+    for name, page in EDGE_CASES.items():
+        if group_table_rows(page) != bs4_rows(page):
+            print(f"불일치 ({name}): {group_table_rows(page)} != {bs4_rows(page)}")
+            mismatches += 1
+
+    print(f"{'파서':<26}{'중앙값 ms':>10}{'p95 ms':>10}{'합계 s':>10}{'최대 메모리 KB':>16}")
+    results = {}
+    for name, parse in PARSERS.items():
+        times, peaks = measure(parse, pages)
+        results[name] = statistics.median(times)
+        p95 = sorted(times)[int(len(times) * 0.95) - 1] if len(times) > 1 else times[0]
+        print(f"{name:<26}{statistics.median(times):>10.3f}{p95:>10.3f}"
+              f"{sum(times) / 1000:>10.2f}{statistics.median(peaks):>16.1f}")
+
+    speedup = results["bs4 html.parser (기존)"] / results["page_parser (lxml 조각)"]
+    print(f"\n기존 대비 {speedup:.1f}배 빠름, 결과 불일치 {mismatches}개")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
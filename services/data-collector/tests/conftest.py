@@ -0,0 +1,7 @@
+import os
+import sys
+
+# app 패키지와 공유 lotto_db (컨테이너에서는 /app 아래에 함께 복사됨)
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'common'))
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+from app import draw_poller
+from app.draw_crawler import KST, draw_round, estimated_latest_round
+from app.draw_poller import DrawPoller, poll_trigger
+
+
+class FakeDrawCrawler:
+    """stored 회차까지 DB에 있고, 요청한 회차는 바로 저장되는 크롤러"""
+    
+    def __init__(self, stored):
+        self.stored = stored
+        self.requested = []
+    
+    def missing_ranges(self, ranges):
+        return [(s, e) for s, e in ranges if e > self.stored]
+    
+    def crawl_ranges(self, ranges):
+        self.requested.extend(ranges)
+        self.stored = max(e for _, e in ranges)
+        return {'saved': 1}
+
+
+def fire_time(at='20:45'):
+    # 2025-10-18(토) 추첨 회차는 1194
+    return poll_trigger(at).get_next_fire_time(None, datetime(2025, 10, 13, tzinfo=KST))
+
+
+def test_scheduled_poll_targets_tonights_round():
+    fired = fire_time()
+    assert fired == datetime(2025, 10, 18, 20, 45, tzinfo=KST)
+    assert estimated_latest_round(fired) == 1193
+    assert draw_round(fired) == 1194
+    assert draw_round(fired) == estimated_latest_round(fired + timedelta(minutes=16))
+
+
+def test_draw_round_after_draw_day():
+    for now in (datetime(2025, 10, 18, 21, 1, tzinfo=KST),
+                datetime(2025, 10, 19, 9, 0, tzinfo=KST),
+                datetime(2025, 10, 24, 23, 59, tzinfo=KST)):
+        assert draw_round(now) == estimated_latest_round(now) == 1194
+    assert draw_round(datetime(2025, 10, 25, 0, 0, tzinfo=KST)) == 1195
+
+
+def test_poll_at_fire_time_requests_new_round(monkeypatch):
+    fired = fire_time()
+    monkeypatch.setattr(draw_poller, 'draw_round', lambda: draw_round(fired))
+    crawler = FakeDrawCrawler(stored=1193)
+    
+    result = DrawPoller(crawler, interval=0.01, deadline=5).poll()
+    
+    assert result['round'] == 1194
+    assert result['reason'] == 'collected'
+    assert crawler.requested == [(1194, 1194)]
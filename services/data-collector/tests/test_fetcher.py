@@ -0,0 +1,171 @@
+import os
+import time
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.fetcher import AsyncFetcher, TokenBucket
+from app.page_parser import group_table_rows
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+
+def recorded_pages():
+    """녹화한 판매점 페이지 {회차: 본문}"""
+    pages = {}
+    for name in sorted(os.listdir(PAGES_DIR)):
+        round_num = int(name.split('_')[1].split('.')[0])
+        with open(os.path.join(PAGES_DIR, name), encoding='utf-8') as f:
+            pages[round_num] = f.read()
+    return pages
+
+
+class StandIn:
+    """녹화 페이지를 euc-kr로 돌려주는 로컬 서버 (동시 요청 수/요청 시각 기록)
+    
+    statuses: {회차: [먼저 돌려줄 상태 코드, ...]} (다 쓰면 페이지 응답)
+    """
+    
+    def __init__(self, pages, delay=0.0, statuses=None):
+        self.pages = pages
+        self.delay = delay
+        self.statuses = {k: list(v) for k, v in (statuses or {}).items()}
+        self.active = 0
+        self.max_active = 0
+        self.hits = {}
+        self.times = []
+    
+    async def handle(self, request):
+        round_num = int(request.query['drwNo'])
+        self.hits[round_num] = self.hits.get(round_num, 0) + 1
+        self.times.append(time.monotonic())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            pending = self.statuses.get(round_num)
+            if pending:
+                return web.Response(status=pending.pop(0))
+            page = self.pages.get(round_num)
+            if page is None:
+                return web.Response(status=404)
+            return web.Response(body=page.encode('euc-kr'), content_type='text/html')
+        finally:
+            self.active -= 1
+    
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/store.do', self.handle)
+        return app
+
+
+def crawl(stand_in, rounds, **settings):
+    """stand_in 서버를 띄우고 rounds를 AsyncFetcher로 수집 -> (pages, failed, stats)"""
+    async def run():
+        server = TestServer(stand_in.app())
+        await server.start_server()
+        try:
+            urls = {r: str(server.make_url(f'/store.do?drwNo={r}')) for r in rounds}
+            fetcher = AsyncFetcher(**settings)
+            pages, failed = await fetcher.fetch_many(urls)
+            return pages, failed, fetcher.stats
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+def test_recorded_pages_parse_through_fetcher():
+    pages = recorded_pages()
+    fetched, failed, stats = crawl(StandIn(pages), pages, rate=0)
+    
+    assert failed == {}
+    assert stats['requests'] == len(pages)
+    assert group_table_rows(fetched[1190]) == [
+        ['1', '복권명당', '자동', '서울 노원구 상계동 123-4', '보기'],
+        ['2', '행운 복권방', '수동', '부산 해운대구 우동 56', '보기'],
+    ]
+    assert group_table_rows(fetched[1191]) == [['1', '대박로또', '반자동', '대구 수성구 범어동 89', '보기']]
+
+
+def test_concurrency_cap():
+    pages = recorded_pages()
+    page = pages[1190]
+    stand_in = StandIn({r: page for r in range(1, 13)}, delay=0.05)
+    
+    fetched, failed, _ = crawl(stand_in, range(1, 13), concurrency=3, rate=0)
+    
+    assert len(fetched) == 12 and failed == {}
+    assert stand_in.max_active == 3
+
+
+def test_token_bucket_pacing():
+    stand_in = StandIn({r: recorded_pages()[1191] for r in range(1, 7)})
+    
+    started = time.monotonic()
+    _, failed, _ = crawl(stand_in, range(1, 7), concurrency=6, rate=20, burst=1)
+    elapsed = time.monotonic() - started
+    
+    # 버스트 1 -> 첫 요청 뒤로는 1/20초마다 하나씩
+    assert failed == {}
+    assert elapsed >= 5 / 20 * 0.9
+    gaps = [b - a for a, b in zip(sorted(stand_in.times), sorted(stand_in.times)[1:])]
+    assert min(gaps) >= 1 / 20 * 0.8
+
+
+def test_token_bucket_burst_then_rate():
+    async def run():
+        bucket = TokenBucket(rate=50, burst=3)
+        stamps = []
+        for _ in range(6):
+            await bucket.acquire()
+            stamps.append(time.monotonic())
+        return stamps
+    
+    stamps = asyncio.run(run())
+    # 처음 3개는 바로, 나머지 3개는 1/50초 간격
+    assert stamps[2] - stamps[0] < 0.01
+    assert stamps[5] - stamps[2] >= 3 / 50 * 0.8
+
+
+def test_retry_backoff_on_429_and_5xx(monkeypatch):
+    delays = []
+    backoff_delay = AsyncFetcher._backoff_delay
+    
+    def record_delay(self, attempt):
+        delays.append((attempt, backoff_delay(self, attempt)))
+        return delays[-1][1]
+    
+    monkeypatch.setattr(AsyncFetcher, '_backoff_delay', record_delay)
+    stand_in = StandIn(recorded_pages(), statuses={1190: [429, 503, 500]})
+    
+    fetched, failed, stats = crawl(stand_in, [1190, 1191], rate=0, retries=4, backoff=0.02)
+    
+    assert failed == {}
+    assert group_table_rows(fetched[1190])[0][1] == '복권명당'
+    assert stand_in.hits == {1190: 4, 1191: 1}
+    assert stats['retries'] == 3 and stats['requests'] == 5
+    # 지수 백오프 + 지터: attempt n의 대기는 backoff * 2^(n-1)의 절반 ~ 전체
+    assert [attempt for attempt, _ in delays] == [1, 2, 3]
+    for attempt, delay in delays:
+        base = 0.02 * 2 ** (attempt - 1)
+        assert base / 2 <= delay <= base
+
+
+def test_gives_up_after_retries():
+    stand_in = StandIn(recorded_pages(), statuses={1190: [502] * 5})
+    
+    fetched, failed, _ = crawl(stand_in, [1190, 1191], rate=0, retries=3, backoff=0.01)
+    
+    assert list(failed) == [1190] and '502' in failed[1190]
+    assert 1191 in fetched
+    assert stand_in.hits[1190] == 3
+
+
+def test_client_error_is_not_retried():
+    stand_in = StandIn(recorded_pages())
+    
+    _, failed, stats = crawl(stand_in, [9999], rate=0, retries=3, backoff=0.01)
+    
+    assert list(failed) == [9999]
+    assert stand_in.hits == {9999: 1} and stats['retries'] == 0
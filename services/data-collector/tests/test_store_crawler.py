@@ -0,0 +1,75 @@
+import re
+
+import app.store_crawler as store_crawler
+from app.checkpoint import CrawlCheckpoint, STORES_KIND
+from app.store_crawler import StoreCrawler
+from test_fetcher import recorded_pages
+
+
+class PageFetcher:
+    """녹화 페이지를 on_page에 바로 넘기는 AsyncFetcher 대역"""
+    
+    pages = {}
+    
+    def __init__(self):
+        self.stats = {'requests': 0, 'retries': 0, 'elapsed_ms': 0}
+    
+    @classmethod
+    def from_env(cls, **kwargs):
+        return cls()
+    
+    async def fetch_many(self, urls, on_page=None, permanent=False):
+        results = {}
+        for round_num in urls:
+            self.stats['requests'] += 1
+            results[round_num] = on_page(round_num, self.pages[round_num])
+        return results, {}
+
+
+class LedgerDB:
+    def __init__(self):
+        self.ledger = {}
+    
+    def get_ledger_rounds(self, start_round, end_round):
+        return {r for r in self.ledger if start_round <= r <= end_round}
+    
+    def ingest_round_wins(self, round_num, winners):
+        self.ledger[round_num] = winners
+        return []
+    
+    def is_store_ledger_active(self):
+        return True
+
+
+def empty_page(page):
+    """1등 배출점 표는 있지만 행이 없는 페이지 (발표 전)"""
+    return re.sub(r'<tbody>.*?</tbody>', '<tbody></tbody>', page, count=1, flags=re.S)
+
+
+def test_empty_round_is_fetched_again_on_resume(tmp_path, monkeypatch):
+    pages = recorded_pages()
+    monkeypatch.setattr(store_crawler, 'AsyncFetcher', PageFetcher)
+    monkeypatch.setattr(PageFetcher, 'pages', {1190: pages[1190], 1191: empty_page(pages[1191])})
+    db = LedgerDB()
+    crawler = StoreCrawler(db, checkpoint=CrawlCheckpoint(str(tmp_path / 'checkpoint.sqlite3')))
+    
+    result = crawler.crawl_historical_stores(1190, 1191)
+    
+    assert not result['success'] and result['failed_rounds'] == [1191]
+    assert crawler.checkpoint.done_rounds(STORES_KIND, 1190, 1191) == {1190}
+    assert set(db.ledger) == {1190}
+    
+    # 발표 후 다시 실행하면 빈 회차만 받음
+    monkeypatch.setattr(PageFetcher, 'pages', {1191: pages[1191]})
+    result = crawler.crawl_historical_stores(1190, 1191)
+    
+    assert result['success'] and result['fetched_rounds'] == 1 and result['resumed_rounds'] == 1
+    assert [name for name, *_ in db.ledger[1191]] == ['대박로또']
+
+
+def test_empty_checkpoint_round_is_not_done(tmp_path):
+    checkpoint = CrawlCheckpoint(str(tmp_path / 'checkpoint.sqlite3'))
+    checkpoint.save_store_round(1190, [])
+    checkpoint.save_store_round(1191, [('대박로또', '대구 수성구 범어동 89', '대구', '반자동')])
+    
+    assert checkpoint.done_rounds(STORES_KIND, 1190, 1191) == {1191}
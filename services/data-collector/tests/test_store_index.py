@@ -0,0 +1,57 @@
+import random
+
+from app.store_index import StoreGeoIndex
+
+
+class StubDB:
+    def __init__(self, stores):
+        self.stores = stores
+    
+    def get_all_stores(self):
+        return self.stores
+
+
+def make_store(store_id, lat, lng, total_wins=0):
+    return {
+        'store_id': store_id, 'store_name': f'판매점{store_id}', 'address': f'서울 {store_id}',
+        'region': '서울', 'wins_1st': total_wins, 'wins_2nd': 0, 'total_wins': total_wins, 'rank': None,
+        'latitude': lat, 'longitude': lng,
+    }
+
+
+def nearby_ids(index, lat, lng, **kwargs):
+    return [(s['store_id'], s['distance_km'], s['total_wins']) for s in index.nearby(lat, lng, **kwargs)]
+
+
+def test_apply_matches_rebuild():
+    rng = random.Random(7)
+    stores = [make_store(i, 37 + rng.random(), 127 + rng.random(), i % 5) for i in range(500)]
+    stores[3]['latitude'] = None
+    index = StoreGeoIndex()
+    index.rebuild(StubDB(stores))
+    
+    saved = [
+        dict(stores[10], total_wins=9),                         # 당첨 횟수만 갱신
+        dict(stores[20], latitude=37.9, longitude=127.9),       # 다른 칸으로 이동
+        dict(stores[30], latitude=None, longitude=None),        # 좌표 삭제
+        dict(stores[3], latitude=37.5),                         # 좌표 생김
+        make_store(500, 37.42, 127.31, 4),                      # 새 판매점
+    ]
+    index.apply(saved)
+    
+    latest = {s['store_id']: s for s in stores}
+    latest.update({s['store_id']: s for s in saved})
+    expected = StoreGeoIndex()
+    expected.rebuild(StubDB(list(latest.values())))
+    
+    assert len(index) == len(expected) == 500
+    for _ in range(100):
+        lat, lng = 36.9 + rng.random() * 1.2, 126.9 + rng.random() * 1.2
+        assert nearby_ids(index, lat, lng, k=10) == nearby_ids(expected, lat, lng, k=10)
+        assert nearby_ids(index, lat, lng, k=50, radius_km=3) == nearby_ids(expected, lat, lng, k=50, radius_km=3)
+
+
+def test_apply_before_build_is_ignored():
+    index = StoreGeoIndex()
+    assert index.apply([make_store(1, 37.5, 127.0)]) == 0
+    assert not index.ready
@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+
+from app.database import Database
+
+
+def collate(value):
+    """utf8mb4_unicode_ci 비교 흉내 (대소문자/끝 공백 무시)"""
+    return None if value is None else value.rstrip(' ').casefold()
+
+
+class FakeCursor:
+    """ingest_round_wins가 보내는 쿼리만 처리하는 메모리 테이블"""
+    
+    def __init__(self, tables):
+        self.tables = tables
+        self.rows = []
+        self.with_rows = False
+        self.rowcount = 0
+    
+    def execute(self, query, params=None):
+        params = list(params or ())
+        stores, ledger = self.tables['stores'], self.tables['ledger']
+        self.rows, self.with_rows, self.rowcount = [], query.startswith('SELECT'), 0
+        if query.startswith('SELECT store_id'):
+            names = {collate(name) for name in params}
+            self.rows = [(s['store_id'], s['store_name'], s['address'])
+                         for s in stores if collate(s['store_name']) in names]
+        elif query.startswith('INSERT INTO lotto_stores'):
+            for i in range(0, len(params), 3):
+                name, address, region = params[i:i + 3]
+                # NULL 주소는 UNIQUE 키에 걸리지 않음
+                same = [s for s in stores if address is not None and s['address'] is not None
+                        and (collate(s['store_name']), collate(s['address'])) == (collate(name), collate(address))]
+                if not same:
+                    stores.append({'store_id': len(stores) + 1, 'store_name': name, 'address': address, 'region': region})
+                    self.rowcount += 1
+        elif query.startswith('SELECT seq'):
+            round_num, rank = params
+            self.rows = sorted((seq, store_id, method) for r, k, seq, store_id, method in ledger
+                               if (r, k) == (round_num, rank))
+        elif query.startswith('DELETE'):
+            ledger[:] = [row for row in ledger if row[:2] != tuple(params)]
+        elif query.startswith('INSERT INTO store_round_wins'):
+            ledger.extend(tuple(params[i:i + 5]) for i in range(0, len(params), 5))
+        else:
+            raise AssertionError(query)
+    
+    def fetchall(self):
+        return self.rows
+    
+    def close(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.tables = {'stores': [], 'ledger': []}
+    
+    @contextmanager
+    def transaction(self):
+        yield self
+    
+    def cursor(self):
+        return FakeCursor(self.tables)
+
+
+class LedgerDatabase(Database):
+    def _create_pool(self, *args):
+        return FakePool()
+    
+    def connect(self):
+        return True
+
+
+def make_db(stores=()):
+    db = LedgerDatabase('localhost', 'user', 'password', 'lotto_db')
+    db.pool.tables['stores'].extend(
+        {'store_id': i + 1, 'store_name': name, 'address': address, 'region': '서울'}
+        for i, (name, address) in enumerate(stores))
+    return db
+
+
+def test_ingest_matches_stores_like_mysql_collation():
+    db = make_db([('복권명당', '서울 노원구 상계동 123-4'), ('Lucky Shop', '서울 강남구 역삼동 1')])
+    winners = [
+        ('복권명당 ', '서울 노원구 상계동 123-4', '서울', '자동'),   # 끝 공백
+        ('LUCKY shop', '서울 강남구 역삼동 1  ', '서울', '수동'),    # 대소문자 + 끝 공백
+    ]
+    
+    assert db.ingest_round_wins(1190, winners) == [1, 2]
+    assert len(db.pool.tables['stores']) == 2
+    assert db.pool.tables['ledger'] == [(1190, 1, 0, 1, '자동'), (1190, 1, 1, 2, '수동')]
+
+
+def test_ingest_reuses_store_with_missing_address():
+    db = make_db([('인터넷 복권판매사이트', None)])
+    winners = [
+        ('인터넷 복권판매사이트', '', '', '자동'),
+        ('새 판매점', None, '', '자동'),
+    ]
+    
+    assert db.ingest_round_wins(1191, winners) == [1, 2]
+    assert [s['store_id'] for s in db.pool.tables['stores']] == [1, 2]
+    # 같은 회차를 다시 넣어도 NULL 주소 판매점이 늘어나지 않음
+    assert db.ingest_round_wins(1191, winners) == []
+    assert len(db.pool.tables['stores']) == 2
@@ -5,6 +5,9 @@ import logging
 from .predictor import MLPredictor
 from .real_predictor import RealMLPredictor
 from .database import Database
+from .number_cache import NumberMatrixCache
+from lotto_db import with_local_snapshot
+from lotto_db.events import RoundEventSubscriber, redis_from_env
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,13 +20,23 @@ db = Database(
     host=os.getenv('MYSQL_HOST', 'localhost'),
     user=os.getenv('MYSQL_USER', 'root'),
     password=os.getenv('MYSQL_PASSWORD', ''),
-    database=os.getenv('MYSQL_DATABASE', 'lotto_db')
+    database=os.getenv('MYSQL_DATABASE', 'lotto_db'),
+    lazy=bool(os.getenv('LOCAL_SNAPSHOT_PATH'))
 )
 
+# 로컬 SQLite 스냅샷 (MySQL 준비 전/장애 중 읽기 응답)
+db = with_local_snapshot(db)
+
+# 당첨 번호 행렬 캐시 (새 회차 이벤트로 증분 갱신)
+numbers = NumberMatrixCache(db)
+round_subscriber = RoundEventSubscriber(redis_from_env(), numbers.apply_event, name='ml-prediction')
+numbers.subscriber = round_subscriber
+round_subscriber.start()
+
 # ML 예측기 (실제 학습된 모델 사용)
 try:
     model_dir = '/app/models' if os.path.exists('/app/models') else './models'
-    real_predictor = RealMLPredictor(db, model_dir=model_dir)
+    real_predictor = RealMLPredictor(numbers, model_dir=model_dir)
     USE_REAL_MODEL = True
     logger.info(f"✓ 실제 학습된 ML 모델 사용 (경로: {model_dir})")
 except Exception as e:
@@ -34,13 +47,26 @@ except Exception as e:
     USE_REAL_MODEL = False
 
 # 백업용 시뮬레이션 예측기
-predictor = MLPredictor(db)
+predictor = MLPredictor(numbers)
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """헬스 체크"""
-    return jsonify({"status": "healthy", "service": "ml-prediction"}), 200
+    return jsonify({"status": "healthy", "service": "ml-prediction", "events": round_subscriber.status()}), 200
+
+
+@app.route('/db/pool', methods=['GET'])
+def get_pool_stats():
+    """DB 커넥션 풀 지표"""
+    return jsonify({"success": True, "pool": db.pool_stats()}), 200
+
+
+@app.route('/db/queries', methods=['GET'])
+def get_query_stats():
+    """쿼리 형태별 실행 지표와 최근 느린 쿼리"""
+    top = request.args.get('top', 20, type=int)
+    return jsonify({"success": True, "queries": db.query_stats(top)}), 200
 
 
 @app.route('/predict', methods=['POST'])
@@ -0,0 +1,75 @@
+"""
+당첨 번호 행렬 메모리 캐시
+
+예측 요청마다 전체 회차를 다시 읽지 않도록 (회차 수, 6) 행렬을 메모리에 두고,
+새 회차 이벤트가 오면 추가된 회차만 가져와 붙입니다.
+이벤트 구독이 끊겨 있는 동안에는 캐시를 쓰지 않고 DB에서 바로 읽습니다.
+"""
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class NumberMatrixCache:
+    """Database 앞에 두는 get_number_matrix 캐시 (나머지 메서드는 그대로 위임)"""
+    
+    def __init__(self, db, subscriber=None):
+        self.db = db
+        self.subscriber = subscriber
+        self._rounds = None
+        self._numbers = None
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+    
+    @property
+    def active(self):
+        """이벤트 구독이 연결되어 있을 때만 캐시 사용"""
+        return self.subscriber is not None and self.subscriber.connected
+    
+    def get_number_matrix(self, limit=None):
+        """당첨 번호 (회차 수, 6) 정수 행렬 (회차 오름차순, limit이면 최근 limit회)"""
+        if not self.active:
+            return self.db.get_number_matrix(limit)
+        
+        with self._lock:
+            if self._numbers is None:
+                matrix = self.db.get_round_matrix()
+                if matrix is None or not len(matrix):
+                    return self.db.get_number_matrix(limit)
+                self._rounds, self._numbers = matrix[:, 0], matrix[:, 1:]
+            numbers = self._numbers
+        
+        if limit is None:
+            return numbers
+        return numbers[max(len(numbers) - limit, 0):]
+    
+    def apply_event(self, event):
+        """새 회차 이벤트: 마지막 캐시 회차 이후만 가져와 추가"""
+        with self._lock:
+            if self._numbers is None:
+                return 0
+            
+            last_round = int(self._rounds[-1])
+            if min(event['rounds']) <= last_round:
+                # 과거 회차 추가/수정 -> 다음 조회 때 전체 로드
+                self._rounds = self._numbers = None
+                return 0
+            
+            matrix = self.db.get_round_matrix(since_round=last_round)
+            if matrix is None:
+                self._rounds = self._numbers = None
+                return 0
+            
+            self._rounds = np.concatenate([self._rounds, matrix[:, 0]])
+            self._numbers = np.concatenate([self._numbers, matrix[:, 1:]])
+            logger.info(f"당첨 번호 캐시 증분 갱신: {len(matrix)}개 회차 추가 (최신 {event['round']}회)")
+            return len(matrix)
+    
+    def invalidate(self):
+        with self._lock:
+            self._rounds = self._numbers = None
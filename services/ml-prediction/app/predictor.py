@@ -22,9 +22,9 @@ class MLPredictor:
         """번호 예측"""
         try:
             # 최근 5회 데이터 조회
-            recent_data = self.db.get_recent_numbers(5)
+            recent_data = self.db.get_number_matrix(5)[::-1]  # 최신 회차 먼저
             
-            if not recent_data or len(recent_data) < 5:
+            if len(recent_data) < 5:
                 return self._generate_random_prediction()
             
             # 특성 엔지니어링
@@ -60,20 +60,14 @@ class MLPredictor:
             'sum': 0
         }
         
-        all_numbers = []
-        for row in data:
-            numbers = [
-                row['number1'], row['number2'], row['number3'],
-                row['number4'], row['number5'], row['number6']
-            ]
-            all_numbers.extend(numbers)
-            features['recent_numbers'].extend(numbers)
+        all_numbers = data.ravel().tolist()
+        features['recent_numbers'].extend(all_numbers)
         
         # 통계 계산
         features['avg'] = np.mean(all_numbers)
         features['std'] = np.std(all_numbers)
         features['odd_ratio'] = sum(1 for n in all_numbers if n % 2 == 1) / len(all_numbers)
-        features['sum'] = sum(data[0]['number1'] for _ in range(1))  # 최근 합계
+        features['sum'] = int(data[0][0])  # 최근 합계
         
         return features
     
@@ -82,14 +76,8 @@ class MLPredictor:
         # 실제로는 학습된 모델 사용
         # 여기서는 통계 기반 시뮬레이션
         
-        all_data = self.db.get_all_numbers()
-        all_numbers = []
-        
-        for row in all_data:
-            all_numbers.extend([
-                row['number1'], row['number2'], row['number3'],
-                row['number4'], row['number5'], row['number6']
-            ])
+        all_data = self.db.get_number_matrix()
+        all_numbers = all_data.ravel().tolist()
         
         counter = Counter(all_numbers)
         
@@ -111,14 +99,8 @@ class MLPredictor:
     def _predict_xgb(self, features):
         """XGBoost 예측 (시뮬레이션)"""
         # 최근 트렌드 반영
-        recent_data = self.db.get_recent_numbers(10)
-        recent_numbers = []
-        
-        for row in recent_data:
-            recent_numbers.extend([
-                row['number1'], row['number2'], row['number3'],
-                row['number4'], row['number5'], row['number6']
-            ])
+        recent_data = self.db.get_number_matrix(10)[::-1]  # 최신 회차 먼저
+        recent_numbers = recent_data.ravel().tolist()
         
         counter = Counter(recent_numbers)
         
@@ -146,13 +128,8 @@ class MLPredictor:
         combined = set(rf_numbers[:3]) | set(xgb_numbers[:3])
         
         # 부족한 번호는 랜덤 추가
-        all_data = self.db.get_all_numbers()
-        all_numbers = []
-        for row in all_data:
-            all_numbers.extend([
-                row['number1'], row['number2'], row['number3'],
-                row['number4'], row['number5'], row['number6']
-            ])
+        all_data = self.db.get_number_matrix()
+        all_numbers = all_data.ravel().tolist()
         
         counter = Counter(all_numbers)
         candidates = [n for n in range(1, 46) if n not in combined]
@@ -178,14 +155,8 @@ class MLPredictor:
     def predict_by_frequency(self):
         """빈도 기반 예측"""
         try:
-            all_data = self.db.get_all_numbers()
-            all_numbers = []
-            
-            for row in all_data:
-                all_numbers.extend([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
+            all_data = self.db.get_number_matrix()
+            all_numbers = all_data.ravel().tolist()
             
             counter = Counter(all_numbers)
             top_numbers = [num for num, _ in counter.most_common(15)]
@@ -204,14 +175,8 @@ class MLPredictor:
     def predict_by_trend(self):
         """최근 추세 기반 예측"""
         try:
-            recent_data = self.db.get_recent_numbers(10)
-            recent_numbers = []
-            
-            for row in recent_data:
-                recent_numbers.extend([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
+            recent_data = self.db.get_number_matrix(10)[::-1]  # 최신 회차 먼저 (most_common 동률은 최근 회차 번호 우선)
+            recent_numbers = recent_data.ravel().tolist()
             
             counter = Counter(recent_numbers)
             top_numbers = [num for num, _ in counter.most_common(12)]
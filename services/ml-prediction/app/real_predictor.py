@@ -43,7 +43,7 @@ class RealMLPredictor:
                 logger.info(f"✓ XGBoost 모델 로드 완료: {xgb_path}")
             else:
                 logger.warning(f"XGBoost 모델 없음: {xgb_path}")
-                
+        
         except Exception as e:
             logger.error(f"모델 로드 실패: {e}")
             self.rf_models = None
@@ -52,7 +52,7 @@ class RealMLPredictor:
     def extract_features(self, window=10):
         """최근 데이터에서 특성 추출"""
         # 최근 window개 회차 데이터 조회
-        recent_data = self.db.get_recent_numbers(window)
+        recent_data = self.db.get_number_matrix(window)[::-1]  # 최신 회차 먼저
         
         if len(recent_data) < window:
             return None
@@ -61,12 +61,7 @@ class RealMLPredictor:
         features = {}
         
         # 1. 최근 번호들의 빈도
-        all_numbers = []
-        for row in recent_data:
-            all_numbers.extend([
-                row['number1'], row['number2'], row['number3'],
-                row['number4'], row['number5'], row['number6']
-            ])
+        all_numbers = recent_data.ravel().tolist()
         
         # 각 번호별 출현 빈도
         for num in range(1, 46):
@@ -139,7 +134,7 @@ class RealMLPredictor:
             confidence = 70 + np.random.uniform(-5, 5)
             
             return predicted_numbers, confidence
-            
+        
         except Exception as e:
             logger.error(f"Random Forest 예측 오류: {e}")
             return None, str(e)
@@ -187,7 +182,7 @@ class RealMLPredictor:
             confidence = 75 + np.random.uniform(-5, 5)
             
             return predicted_numbers, confidence
-            
+        
         except Exception as e:
             logger.error(f"XGBoost 예측 오류: {e}")
             return None, str(e)
@@ -222,7 +217,7 @@ class RealMLPredictor:
             confidence = (rf_conf + xgb_conf) / 2
             
             return ensemble_numbers, confidence
-            
+        
         except Exception as e:
             logger.error(f"앙상블 예측 오류: {e}")
             return None, str(e)
@@ -278,14 +273,8 @@ class RealMLPredictor:
     
     def _predict_frequency_based(self):
         """빈도 기반 예측"""
-        all_data = self.db.get_all_numbers()
-        all_numbers = []
-        
-        for row in all_data:
-            all_numbers.extend([
-                row['number1'], row['number2'], row['number3'],
-                row['number4'], row['number5'], row['number6']
-            ])
+        all_data = self.db.get_number_matrix()
+        all_numbers = all_data.ravel().tolist()
         
         counter = Counter(all_numbers)
         most_common = [num for num, _ in counter.most_common(6)]
@@ -295,14 +284,8 @@ class RealMLPredictor:
     
     def _predict_trend_based(self):
         """최근 트렌드 기반 예측"""
-        recent_data = self.db.get_recent_numbers(20)
-        recent_numbers = []
-        
-        for row in recent_data:
-            recent_numbers.extend([
-                row['number1'], row['number2'], row['number3'],
-                row['number4'], row['number5'], row['number6']
-            ])
+        recent_data = self.db.get_number_matrix(20)[::-1]  # 최신 회차 먼저 (most_common 동률은 최근 회차 번호 우선)
+        recent_numbers = recent_data.ravel().tolist()
         
         counter = Counter(recent_numbers)
         trend_nums = [num for num, _ in counter.most_common(6)]
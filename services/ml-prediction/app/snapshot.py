@@ -0,0 +1,66 @@
+"""
+통계 서비스가 저장한 컬럼형 스냅샷에서 당첨 번호 읽기
+
+Arrow IPC 파일을 memory map으로 열어 MySQL 없이 학습 데이터를 가져옵니다.
+Database와 같은 조회 메서드를 제공하므로 그대로 바꿔 끼울 수 있습니다.
+"""
+import os
+import logging
+
+import numpy as np
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotDatabase:
+    """lotto_numbers 스냅샷 (읽기 전용)"""
+    
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.snapshot_dir = self._resolve(base_dir)
+        path = os.path.join(self.snapshot_dir, 'lotto_numbers.arrow')
+        
+        # memory map (zero-copy) - SnapshotWriter가 회차 오름차순으로 쓰므로 다시 정렬하지 않음
+        # (sort_by는 메모리에 새 테이블을 만듦, 순서만 확인)
+        source = pa.memory_map(path, 'r')
+        self.table = pa.ipc.open_file(source).read_all()
+        rounds = self.table.column('round').to_numpy()
+        if np.any(np.diff(rounds) <= 0):
+            raise ValueError(f"스냅샷 회차가 오름차순이 아님: {path}")
+        logger.info(f"스냅샷 로드 완료: {self.snapshot_dir} ({self.table.num_rows}회차)")
+    
+    @staticmethod
+    def _resolve(base_dir):
+        """LATEST 포인터를 따라 스냅샷 디렉터리 결정"""
+        if os.path.exists(os.path.join(base_dir, 'lotto_numbers.arrow')):
+            return base_dir
+        
+        latest_path = os.path.join(base_dir, 'LATEST')
+        if not os.path.exists(latest_path):
+            raise FileNotFoundError(f"스냅샷 없음: {base_dir}")
+        
+        with open(latest_path, encoding='utf-8') as f:
+            return os.path.join(base_dir, f.read().strip())
+    
+    def to_pandas(self):
+        """회차 오름차순 DataFrame"""
+        return self.table.to_pandas()
+    
+    def get_all_numbers(self):
+        """모든 로또 번호 조회 (회차 오름차순)"""
+        return self.table.to_pylist()
+    
+    def get_recent_numbers(self, limit=10):
+        """최근 N회 번호 조회 (회차 내림차순)"""
+        start = max(self.table.num_rows - limit, 0)
+        return self.table.slice(start).to_pylist()[::-1]
+    
+    def get_number_matrix(self, limit=None):
+        """당첨 번호 (회차 수, 6) 정수 행렬 (회차 오름차순, limit이면 최근 limit회)"""
+        table = self.table
+        if limit is not None:
+            table = table.slice(max(table.num_rows - limit, 0))
+        return np.column_stack([
+            table.column(f'number{i}').to_numpy() for i in range(1, 7)
+        ]).astype(np.int32, copy=False)
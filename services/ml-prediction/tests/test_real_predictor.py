@@ -0,0 +1,38 @@
+import numpy as np
+
+from app.real_predictor import RealMLPredictor
+
+
+class MatrixDB:
+    """get_number_matrix만 흉내 (회차 오름차순, limit이면 최근 limit회)"""
+    
+    def __init__(self, matrix):
+        self.matrix = np.asarray(matrix, dtype=np.int32)
+    
+    def get_number_matrix(self, limit=None):
+        return self.matrix if limit is None else self.matrix[-limit:]
+
+
+def tied_draws():
+    """앞 10회는 1~6, 뒤 10회는 7~12 -> 12개 번호 모두 10번씩 (동률)"""
+    return [[1, 2, 3, 4, 5, 6]] * 10 + [[7, 8, 9, 10, 11, 12]] * 10
+
+
+def make_predictor(matrix, tmp_path):
+    return RealMLPredictor(MatrixDB(matrix), model_dir=str(tmp_path))
+
+
+def test_trend_ties_prefer_latest_draws(tmp_path):
+    predictor = make_predictor(tied_draws(), tmp_path)
+    
+    numbers, _ = predictor._predict_trend_based()
+    
+    assert numbers == [7, 8, 9, 10, 11, 12]
+
+
+def test_frequency_ties_prefer_earliest_draws(tmp_path):
+    predictor = make_predictor(tied_draws(), tmp_path)
+    
+    numbers, _ = predictor._predict_frequency_based()
+    
+    assert numbers == [1, 2, 3, 4, 5, 6]
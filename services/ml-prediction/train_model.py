@@ -7,6 +7,7 @@
 
 import sys
 import os
+import argparse
 import numpy as np
 import pandas as pd
 import pickle
@@ -19,6 +20,8 @@ import xgboost as xgb
 # 경로 추가
 sys.path.insert(0, os.path.dirname(__file__))
 from app.database import Database
+from app.snapshot import SnapshotDatabase
+from lotto_db import LocalSnapshot
 
 
 class LottoModelTrainer:
@@ -37,46 +40,38 @@ class LottoModelTrainer:
         print("\n📊 데이터 로드 중...")
         
         # 데이터베이스에서 모든 회차 조회
-        data = self.db.get_all_numbers()
+        # (회차 수, 6) 정수 행렬 (회차 오름차순)
+        numbers = self.db.get_number_matrix()
         
-        if len(data) < min_rounds:
-            print(f"⚠️  경고: 데이터가 부족합니다 (현재: {len(data)}개, 최소: {min_rounds}개)")
+        if len(numbers) < min_rounds:
+            print(f"⚠️  경고: 데이터가 부족합니다 (현재: {len(numbers)}개, 최소: {min_rounds}개)")
             print(f"   크롤러로 더 많은 데이터를 수집해주세요.")
             return None
         
-        print(f"✓ {len(data)}개 회차 데이터 로드 완료")
+        print(f"✓ {len(numbers)}개 회차 데이터 로드 완료")
         
-        # DataFrame으로 변환
-        df = pd.DataFrame(data)
-        df = df.sort_values('round')
-        
-        return df
+        return numbers
     
-    def extract_features(self, df, window=10):
+    def extract_features(self, numbers, window=10):
         """특성 추출 (Feature Engineering)"""
         print("\n🔧 특성 추출 중...")
         
         features_list = []
         targets = {f'num{i+1}': [] for i in range(6)}
         
-        for idx in range(window, len(df)):
+        for idx in range(window, len(numbers)):
             # 최근 window개 회차 데이터
-            recent = df.iloc[idx-window:idx]
+            all_numbers = numbers[idx-window:idx].ravel()
             
             # 특성 계산
             features = {}
             
             # 1. 최근 번호들의 빈도
-            all_numbers = []
-            for _, row in recent.iterrows():
-                all_numbers.extend([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
+            counts = np.bincount(all_numbers, minlength=46)
             
             # 각 번호별 출현 빈도
             for num in range(1, 46):
-                features[f'freq_{num}'] = all_numbers.count(num)
+                features[f'freq_{num}'] = int(counts[num])
             
             # 2. 통계 특성
             features['mean'] = np.mean(all_numbers)
@@ -106,9 +101,9 @@ class LottoModelTrainer:
             features_list.append(features)
             
             # 타겟 값 (다음 회차 번호)
-            current = df.iloc[idx]
+            current = numbers[idx]
             for i in range(6):
-                targets[f'num{i+1}'].append(current[f'number{i+1}'])
+                targets[f'num{i+1}'].append(int(current[i]))
         
         X = pd.DataFrame(features_list)
         y = pd.DataFrame(targets)
@@ -227,12 +222,12 @@ class LottoModelTrainer:
         print("=" * 70)
         
         # 1. 데이터 로드
-        df = self.load_data(min_rounds=100)
-        if df is None:
+        numbers = self.load_data(min_rounds=100)
+        if numbers is None:
             return False
         
         # 2. 특성 추출
-        X, y = self.extract_features(df, window=10)
+        X, y = self.extract_features(numbers, window=10)
         
         # 3. Random Forest 학습
         self.train_random_forest(X, y)
@@ -257,14 +252,35 @@ class LottoModelTrainer:
 
 def main():
     """메인 함수"""
-    
-    # DB 연결
-    db = Database(
-        host=os.getenv('MYSQL_HOST', 'localhost'),
-        user=os.getenv('MYSQL_USER', 'lotto_user'),
-        password=os.getenv('MYSQL_PASSWORD', '2323'),
-        database=os.getenv('MYSQL_DATABASE', 'lotto_db')
+    parser = argparse.ArgumentParser(description='로또 예측 ML 모델 학습')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        '--snapshot',
+        default=os.getenv('SNAPSHOT_DIR'),
+        help='MySQL 대신 통계 서비스 스냅샷 디렉터리에서 데이터 로드'
+    )
+    # 폴백 스냅샷은 최신이 아닐 수 있으므로 명시했을 때만 사용
+    source.add_argument(
+        '--local',
+        metavar='PATH',
+        help='MySQL 대신 로컬 SQLite 스냅샷 파일에서 데이터 로드 (오프라인 학습)'
     )
+    args = parser.parse_args()
+    
+    if args.local:
+        # 로컬 SQLite 스냅샷
+        db = LocalSnapshot(args.local)
+    elif args.snapshot:
+        # 컬럼형 스냅샷 (memory map)
+        db = SnapshotDatabase(args.snapshot)
+    else:
+        # DB 연결
+        db = Database(
+            host=os.getenv('MYSQL_HOST', 'localhost'),
+            user=os.getenv('MYSQL_USER', 'lotto_user'),
+            password=os.getenv('MYSQL_PASSWORD', '2323'),
+            database=os.getenv('MYSQL_DATABASE', 'lotto_db')
+        )
     
     # 훈련 시작
     trainer = LottoModelTrainer(db)
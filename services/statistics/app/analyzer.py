@@ -1,50 +1,117 @@
+# Statistics Service
 import numpy as np
-import pandas as pd
-from collections import Counter
 import logging
+from . import kernels
+from .games import LOTTO_645, DrawStore
 
 logger = logging.getLogger(__name__)
 
+# 달력 집계 단위
+CALENDAR_PERIODS = ('year', 'quarter', 'month', 'season')
+
+# 계절 (월 -> 봄/여름/가을/겨울)
+SEASONS = ('winter', 'spring', 'summer', 'autumn')
+
+# 게임별 분석 (POST /games/<game>/<analysis>)
+ANALYSES = ('frequency', 'patterns', 'statistics', 'trends', 'heatmap', 'calendar')
+
 
 class StatisticsAnalyzer:
-    def __init__(self, database, cache):
+    def __init__(self, database, cache, game=LOTTO_645):
         self.db = database
         self.cache = cache
+        self.game = game
+        
+        # 데이터 버전별 당첨 번호 저장소 (회차 오름차순)
+        self._draws_version = None
+        self._draws = None
+    
+    def load_draws(self, version=None):
+        """당첨 번호 저장소 로드 (데이터 버전이 같으면 재사용)"""
+        if version is None:
+            version = self.db.get_data_version()
+        
+        if self._draws is not None and version is not None and version == self._draws_version:
+            return self._draws
+        
+        matrix = self.db.get_draw_matrix(self.game)
+        if matrix is None or not len(matrix):
+            return None
+        
+        self._draws = DrawStore.from_matrix(self.game, matrix)
+        self._draws_version = version
+        return self._draws
+    
+    def refresh_draws(self, version):
+        """새 회차만 가져와 저장소 뒤에 붙임 (회차 수가 맞지 않으면 전체 재로드)"""
+        if self._draws is None or not len(self._draws) or version is None:
+            return self.load_draws(version)
+        if version == self._draws_version:
+            return self._draws
+        
+        last_round = int(self._draws.rounds[-1])
+        matrix = self.db.get_draw_matrix(self.game, since_round=last_round)
+        expected = int(version.rsplit('-', 1)[1])
+        if matrix is None or len(self._draws) + len(matrix) != expected:
+            # 과거 회차가 추가/수정됨
+            self._draws = None
+            return self.load_draws(version)
+        
+        self._draws = self._draws.append(DrawStore.from_matrix(self.game, matrix))
+        self._draws_version = version
+        logger.info(f"당첨 번호 저장소 증분 갱신: {len(matrix)}개 회차 추가 (버전 {version})")
+        return self._draws
     
-    def analyze_frequency(self):
+    def _resolve(self, store):
+        """분석 대상 저장소 (없으면 DB 데이터)"""
+        if store is None:
+            store = self.load_draws()
+        if store is None or not len(store):
+            return None
+        return store
+    
+    def analyze(self, analysis, store, **kwargs):
+        """이름으로 분석 실행 (시뮬레이션 이력 등 임의 저장소 대상)"""
+        if analysis == 'frequency':
+            return self.analyze_frequency(store)
+        if analysis == 'patterns':
+            return self.analyze_patterns(store)
+        if analysis == 'statistics':
+            return self.get_statistics(store)
+        if analysis == 'trends':
+            return self.analyze_trends(kwargs.get('limit', 10), store)
+        if analysis == 'heatmap':
+            return self.generate_heatmap(store)
+        if analysis == 'calendar':
+            return self.analyze_calendar(kwargs.get('period', 'year'), store=store)
+        return {"success": False, "error": f"지원하지 않는 분석: {analysis}"}
+    
+    def analyze_frequency(self, store=None):
         """빈도 분석"""
         try:
-            # 모든 번호 조회
-            data = self.db.get_all_numbers()
+            store = self._resolve(store)
             
-            if not data:
+            if store is None:
                 return {"success": False, "error": "데이터 없음"}
             
-            # 번호 수집
-            all_numbers = []
-            for row in data:
-                all_numbers.extend([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
-            
             # 빈도 계산
-            counter = Counter(all_numbers)
+            pool = store.config.pool
+            counts = kernels.frequency(store.numbers, pool)
+            ranking = [int(n) for n in kernels.rank_numbers(counts) if counts[n - 1] > 0]
             
-            # 전체 번호 빈도 (1-45번 모두)
-            hot_numbers = [{"number": num, "count": count} 
-                          for num, count in counter.most_common()]
+            # 출현한 번호 전체 (빈도 내림차순)
+            hot_numbers = [{"number": num, "count": int(counts[num - 1])}
+                          for num in ranking]
             
             # 하위 10개 (Cold Numbers)
-            cold_numbers = [{"number": num, "count": count} 
-                           for num, count in counter.most_common()[-10:]]
+            cold_numbers = hot_numbers[-10:]
             
             # 전체 빈도
-            frequency = {num: counter.get(num, 0) for num in range(1, 46)}
+            frequency = {num: int(counts[num - 1]) for num in range(1, pool + 1)}
             
             return {
                 "success": True,
-                "total_draws": len(data),
+                "total_draws": len(store),
                 "hot_numbers": hot_numbers,
                 "cold_numbers": cold_numbers,
                 "frequency": frequency
@@ -53,42 +120,23 @@ class StatisticsAnalyzer:
             logger.error(f"빈도 분석 오류: {e}")
             return {"success": False, "error": str(e)}
     
-    def analyze_patterns(self):
+    def analyze_patterns(self, store=None):
         """패턴 분석"""
         try:
-            data = self.db.get_all_numbers()
+            store = self._resolve(store)
             
-            if not data:
+            if store is None:
                 return {"success": False, "error": "데이터 없음"}
             
-            # 패턴 통계
-            odd_even_ratios = []
-            consecutive_counts = []
-            sum_values = []
-            
-            for row in data:
-                numbers = sorted([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
-                
-                # 홀짝 비율
-                odd_count = sum(1 for n in numbers if n % 2 == 1)
-                odd_even_ratios.append({"odd": odd_count, "even": 6 - odd_count})
-                
-                # 연속 번호
-                consecutive = sum(1 for i in range(len(numbers)-1) 
-                                if numbers[i+1] - numbers[i] == 1)
-                consecutive_counts.append(consecutive)
-                
-                # 합계
-                sum_values.append(sum(numbers))
+            # 회차별 홀수 개수, 연속 번호, 합계
+            odd_counts, consecutive_counts, sum_values = kernels.draw_patterns(store.numbers)
+            avg_odd = float(np.mean(odd_counts))
             
             return {
                 "success": True,
                 "odd_even_ratio": {
-                    "avg_odd": float(np.mean([r["odd"] for r in odd_even_ratios])),
-                    "avg_even": float(np.mean([r["even"] for r in odd_even_ratios]))
+                    "avg_odd": avg_odd,
+                    "avg_even": float(store.config.picks - avg_odd)
                 },
                 "consecutive_avg": float(np.mean(consecutive_counts)),
                 "sum_stats": {
@@ -102,25 +150,20 @@ class StatisticsAnalyzer:
             logger.error(f"패턴 분석 오류: {e}")
             return {"success": False, "error": str(e)}
     
-    def get_statistics(self):
+    def get_statistics(self, store=None):
         """통계 지표"""
         try:
-            data = self.db.get_all_numbers()
+            store = self._resolve(store)
             
-            if not data:
+            if store is None:
                 return {"success": False, "error": "데이터 없음"}
             
-            all_numbers = []
-            for row in data:
-                all_numbers.extend([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
+            all_numbers = store.numbers.ravel()
             
             return {
                 "success": True,
-                "total_rounds": len(data),
-                "total_numbers": len(all_numbers),
+                "total_rounds": len(store),
+                "total_numbers": int(all_numbers.size),
                 "mean": float(np.mean(all_numbers)),
                 "median": float(np.median(all_numbers)),
                 "std": float(np.std(all_numbers)),
@@ -132,96 +175,181 @@ class StatisticsAnalyzer:
             logger.error(f"통계 조회 오류: {e}")
             return {"success": False, "error": str(e)}
     
-    def analyze_trends(self, limit=10):
+    def analyze_trends(self, limit=10, store=None):
         """추이 분석"""
         try:
-            recent = self.db.get_recent_numbers(limit)
-            all_data = self.db.get_all_numbers()
+            store = self._resolve(store)
             
-            if not recent or not all_data:
+            if store is None:
                 return {"success": False, "error": "데이터 없음"}
             
-            # 최근 번호 빈도
-            recent_numbers = []
-            for row in recent:
-                recent_numbers.extend([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
-            
-            recent_counter = Counter(recent_numbers)
-            
-            # 전체 번호 빈도
-            all_numbers = []
-            for row in all_data:
-                all_numbers.extend([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
-            
-            all_counter = Counter(all_numbers)
-            
-            # 비교
-            trends = []
-            for num in range(1, 46):
-                recent_freq = recent_counter.get(num, 0)
-                all_freq = all_counter.get(num, 0) / len(all_data) * limit
-                
-                trends.append({
-                    "number": num,
-                    "recent_count": recent_freq,
-                    "expected_count": round(all_freq, 2),
-                    "difference": round(recent_freq - all_freq, 2)
-                })
+            pool = store.config.pool
+            
+            # 최근 번호 빈도 vs 전체 빈도 기반 기댓값
+            recent_counts = kernels.frequency(store.tail(limit).numbers, pool)
+            expected = kernels.frequency(store.numbers, pool) / len(store) * limit
+            difference = recent_counts - expected
+            
+            # 차이 내림차순 상위 20개 (동률은 번호 오름차순)
+            order = np.argsort(-difference, kind='stable')[:20]
+            trends = [{
+                "number": int(idx + 1),
+                "recent_count": int(recent_counts[idx]),
+                "expected_count": round(float(expected[idx]), 2),
+                "difference": round(float(difference[idx]), 2)
+            } for idx in order]
             
             return {
                 "success": True,
                 "limit": limit,
-                "trends": sorted(trends, key=lambda x: x['difference'], reverse=True)[:20]
+                "trends": trends
             }
         except Exception as e:
             logger.error(f"추이 분석 오류: {e}")
             return {"success": False, "error": str(e)}
     
-    def generate_heatmap(self):
-        """히트맵 데이터 생성 (5x9 그리드)"""
+    def generate_heatmap(self, store=None):
+        """히트맵 데이터 생성 (로또 6/45는 5x9 그리드)"""
         try:
-            data = self.db.get_all_numbers()
+            store = self._resolve(store)
             
-            if not data:
+            if store is None:
                 return {"success": False, "error": "데이터 없음"}
             
             # 빈도 계산
-            all_numbers = []
-            for row in data:
-                all_numbers.extend([
-                    row['number1'], row['number2'], row['number3'],
-                    row['number4'], row['number5'], row['number6']
-                ])
+            counts = kernels.frequency(store.numbers, store.config.pool)
+            cells = kernels.grid(counts, store.config.grid_cols)
             
-            counter = Counter(all_numbers)
-            
-            # 5x9 그리드 생성 (1-45)
+            # rows x cols 그리드 생성 (빈 칸은 None)
             heatmap = []
-            for row in range(5):
+            for row_idx, row in enumerate(cells):
                 row_data = []
-                for col in range(9):
-                    num = row * 9 + col + 1
-                    if num <= 45:
+                for col_idx, count in enumerate(row):
+                    if count >= 0:
                         row_data.append({
-                            "number": num,
-                            "count": counter.get(num, 0)
+                            "number": row_idx * store.config.grid_cols + col_idx + 1,
+                            "count": int(count)
                         })
                     else:
                         row_data.append(None)
                 heatmap.append(row_data)
             
+            appeared = counts[counts > 0]
+            
             return {
                 "success": True,
                 "heatmap": heatmap,
-                "max_count": max(counter.values()) if counter else 0,
-                "min_count": min(counter.values()) if counter else 0
+                "max_count": int(appeared.max()) if appeared.size else 0,
+                "min_count": int(appeared.min()) if appeared.size else 0
             }
         except Exception as e:
             logger.error(f"히트맵 생성 오류: {e}")
             return {"success": False, "error": str(e)}
+    
+    def analyze_calendar(self, period='year', version=None, store=None):
+        """달력 기준 집계 (연/분기/월/계절별 빈도 및 패턴)"""
+        try:
+            if period not in CALENDAR_PERIODS:
+                return {"success": False, "error": f"지원하지 않는 집계 단위: {period}"}
+            
+            if store is None:
+                store = self.load_draws(version)
+                version = self._draws_version
+            if store is None or not len(store):
+                return {"success": False, "error": "데이터 없음"}
+            
+            # 추첨일이 없는 회차는 제외
+            dated = ~np.isnat(store.dates)
+            if not dated.any():
+                return {"success": False, "error": "추첨일 데이터 없음"}
+            
+            config = store.config
+            numbers = store.numbers[dated]
+            keys, labels = self._calendar_keys(store.dates[dated], period)
+            
+            # 그룹 인덱스 (키 오름차순)
+            group_keys, group_idx = np.unique(keys, return_inverse=True)
+            n_groups = len(group_keys)
+            draw_counts = np.bincount(group_idx, minlength=n_groups)
+            
+            # 그룹별 번호 빈도 (n_groups x N)
+            frequency = kernels.group_frequency(numbers, group_idx, n_groups, config.pool)
+            ranking = kernels.rank_numbers(frequency)
+            
+            # 회차별 패턴 지표 -> 그룹별 집계
+            odd_counts, consecutive, sums = kernels.draw_patterns(numbers)
+            avg_odd = kernels.group_mean(odd_counts, group_idx, draw_counts)
+            avg_consecutive = kernels.group_mean(consecutive, group_idx, draw_counts)
+            sum_mean = kernels.group_mean(sums, group_idx, draw_counts)
+            sum_std = kernels.group_std(sums, group_idx, draw_counts)
+            sum_min, sum_max = kernels.group_min_max(sums, group_idx, draw_counts)
+            
+            groups = []
+            for g in range(n_groups):
+                groups.append({
+                    "key": labels[group_keys[g]],
+                    "draws": int(draw_counts[g]),
+                    "frequency": {num: int(frequency[g, num - 1]) for num in range(1, config.pool + 1)},
+                    "hot_numbers": [int(n) for n in ranking[g, :config.picks]],
+                    "cold_numbers": [int(n) for n in ranking[g, -config.picks:][::-1]],
+                    "odd_even_ratio": {
+                        "avg_odd": float(avg_odd[g]),
+                        "avg_even": float(config.picks - avg_odd[g])
+                    },
+                    "consecutive_avg": float(avg_consecutive[g]),
+                    "sum_stats": {
+                        "mean": float(sum_mean[g]),
+                        "std": float(sum_std[g]),
+                        "min": int(sum_min[g]),
+                        "max": int(sum_max[g])
+                    }
+                })
+            
+            return {
+                "success": True,
+                "period": period,
+                "data_version": version,
+                "total_draws": int(len(numbers)),
+                "groups": groups
+            }
+        except Exception as e:
+            logger.error(f"달력 집계 오류: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def analyze_calendar_all(self, version=None):
+        """모든 집계 단위 사전 계산"""
+        return {period: self.analyze_calendar(period, version) for period in CALENDAR_PERIODS}
+    
+    def analyze_all(self, version=None):
+        """스냅샷용 전체 분석 결과"""
+        store = self.load_draws(version)
+        analyses = {
+            "frequency": self.analyze_frequency(store),
+            "patterns": self.analyze_patterns(store),
+            "statistics": self.get_statistics(store),
+            "trends": self.analyze_trends(store=store),
+            "heatmap": self.generate_heatmap(store)
+        }
+        for period, result in self.analyze_calendar_all(version).items():
+            analyses[f"calendar_{period}"] = result
+        return analyses
+    
+    @staticmethod
+    def _calendar_keys(dates, period):
+        """추첨일 -> 그룹 키 (정수) 및 키별 레이블"""
+        years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+        months = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        
+        if period == 'year':
+            keys = years
+            return keys, {k: str(k) for k in np.unique(keys)}
+        if period == 'quarter':
+            keys = years * 10 + (months - 1) // 3 + 1
+            return keys, {k: f"{k // 10}-Q{k % 10}" for k in np.unique(keys)}
+        if period == 'month':
+            keys = years * 100 + months
+            return keys, {k: f"{k // 100}-{k % 100:02d}" for k in np.unique(keys)}
+        
+        # 계절: 12~2월 겨울, 3~5월 봄, 6~8월 여름, 9~11월 가을 (연도 무관)
+        keys = (months % 12) // 3
+        return keys, {k: SEASONS[k] for k in np.unique(keys)}
@@ -0,0 +1,174 @@
+"""
+통계 서비스 ASGI 모드
+    
+    hypercorn app.asgi:app --bind 0.0.0.0:8002
+
+당첨 번호 조회는 aiomysql 비동기 풀로, numpy 분석과 Redis 캐시 호출은 스레드로
+넘겨 이벤트 루프를 막지 않습니다. 스냅샷 저장과 게임별 분석은 WSGI 앱(app.main)이 담당합니다.
+"""
+from quart import Quart, jsonify, request
+from quart_cors import cors
+import os
+import asyncio
+import logging
+from .analyzer import StatisticsAnalyzer, CALENDAR_PERIODS
+from .games import LOTTO_645, DrawStore
+from .async_database import AsyncDatabase
+from .cache import CacheManager
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+app = cors(Quart(__name__))
+
+# 비동기 데이터베이스 (풀은 서버 시작 시 이벤트 루프 안에서 생성)
+db = AsyncDatabase(
+    host=os.getenv('MYSQL_HOST', 'localhost'),
+    user=os.getenv('MYSQL_USER', 'root'),
+    password=os.getenv('MYSQL_PASSWORD', ''),
+    database=os.getenv('MYSQL_DATABASE', 'lotto_db')
+)
+
+# 캐시 매니저
+cache = CacheManager(
+    host=os.getenv('REDIS_HOST', 'localhost'),
+    port=int(os.getenv('REDIS_PORT', 6379))
+)
+
+# 통계 분석기 (당첨 번호 저장소는 아래에서 비동기로 로드해 넘김)
+analyzer = StatisticsAnalyzer(None, cache)
+
+# 데이터 버전별 당첨 번호 저장소
+_draws = {"version": None, "store": None}
+_draws_lock = asyncio.Lock()
+
+
+@app.before_serving
+async def startup():
+    await db.connect()
+
+
+@app.after_serving
+async def shutdown():
+    await db.disconnect()
+
+
+async def load_draws():
+    """(데이터 버전, 당첨 번호 저장소) - 버전이 같으면 재사용"""
+    version = await db.get_data_version()
+    async with _draws_lock:
+        if _draws["store"] is None or version is None or version != _draws["version"]:
+            matrix = await db.get_draw_matrix(LOTTO_645)
+            if matrix is None or not len(matrix):
+                return version, None
+            _draws["store"] = DrawStore.from_matrix(LOTTO_645, matrix)
+            _draws["version"] = version
+        return version, _draws["store"]
+
+
+async def cached_analysis(cache_key, analysis, ttl=3600, **kwargs):
+    """캐시 확인 후 분석 실행 (분석은 스레드에서, cache_key가 None이면 캐시 미사용)"""
+    if cache_key is not None:
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached:
+            return cached
+    
+    _, store = await load_draws()
+    if store is None:
+        return {"success": False, "error": "데이터 없음"}
+    
+    result = await asyncio.to_thread(analyzer.analyze, analysis, store, **kwargs)
+    if cache_key is not None and result.get('success'):
+        await asyncio.to_thread(cache.set, cache_key, result, ttl)
+    return result
+
+
+@app.route('/health', methods=['GET'])
+async def health_check():
+    """헬스 체크"""
+    return jsonify({"status": "healthy", "service": "statistics", "mode": "asgi"}), 200
+
+
+@app.route('/db/pool', methods=['GET'])
+async def get_pool_stats():
+    """DB 커넥션 풀 지표"""
+    return jsonify({"success": True, "pool": db.pool_stats()}), 200
+
+
+@app.route('/db/queries', methods=['GET'])
+async def get_query_stats():
+    """쿼리 형태별 실행 지표와 최근 느린 쿼리"""
+    top = request.args.get('top', 20, type=int)
+    return jsonify({"success": True, "queries": db.query_stats(top)}), 200
+
+
+@app.route('/frequency', methods=['GET'])
+async def get_frequency():
+    """빈도 분석"""
+    try:
+        return jsonify(await cached_analysis('stats:frequency', 'frequency')), 200
+    except Exception as e:
+        logger.error(f"빈도 분석 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/patterns', methods=['GET'])
+async def get_patterns():
+    """패턴 분석"""
+    try:
+        return jsonify(await cached_analysis('stats:patterns', 'patterns')), 200
+    except Exception as e:
+        logger.error(f"패턴 분석 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/statistics', methods=['GET'])
+async def get_statistics():
+    """통계 지표"""
+    try:
+        return jsonify(await cached_analysis('stats:statistics', 'statistics')), 200
+    except Exception as e:
+        logger.error(f"통계 조회 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/trends', methods=['GET'])
+async def get_trends():
+    """추이 분석"""
+    try:
+        limit = request.args.get('limit', 10, type=int)
+        return jsonify(await cached_analysis(f'stats:trends:{limit}', 'trends', limit=limit)), 200
+    except Exception as e:
+        logger.error(f"추이 분석 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/heatmap', methods=['GET'])
+async def get_heatmap():
+    """히트맵 데이터"""
+    try:
+        return jsonify(await cached_analysis('stats:heatmap', 'heatmap')), 200
+    except Exception as e:
+        logger.error(f"히트맵 생성 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/calendar', methods=['GET'])
+async def get_calendar():
+    """달력 기준 집계 (연/분기/월/계절)"""
+    try:
+        period = request.args.get('period', 'year')
+        if period not in CALENDAR_PERIODS:
+            return jsonify({
+                "success": False,
+                "error": f"period는 {', '.join(CALENDAR_PERIODS)} 중 하나여야 합니다"
+            }), 400
+        
+        # 데이터 버전별 캐시 (새 회차가 들어오면 키가 바뀜, 버전을 모르면 캐시 미사용)
+        version = await db.get_data_version()
+        cache_key = f'stats:calendar:{period}:{version}' if version is not None else None
+        result = await cached_analysis(cache_key, 'calendar', ttl=86400, period=period)
+        return jsonify(result), 200
+    except Exception as e:
+        logger.error(f"달력 집계 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
@@ -0,0 +1,57 @@
+from lotto_db.aio import AsyncBaseDatabase, Error
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabase(AsyncBaseDatabase):
+    """통계 서비스 비동기 DB 접근 (ASGI 모드)"""
+    
+    pool_name = 'statistics-async'
+    
+    async def get_latest_numbers(self, limit=5):
+        """최신 N회 당첨 번호 조회"""
+        try:
+            query = """
+                SELECT round, draw_date,
+                       number1, number2, number3, number4, number5, number6, bonus_number
+                FROM lotto_numbers
+                ORDER BY round DESC
+                LIMIT %s
+            """
+            results = await self.fetch_all(query, (limit,))
+            
+            # datetime을 문자열로 변환
+            for row in results:
+                if row['draw_date']:
+                    row['draw_date'] = row['draw_date'].strftime('%Y-%m-%d')
+            
+            return results
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return []
+    
+    async def get_draw_matrix(self, game):
+        """회차 오름차순 정수 행렬 (Database.get_draw_matrix와 동일)"""
+        try:
+            columns = ', '.join(
+                game.number_columns + [f'COALESCE({col}, 0)' for col in game.bonus_columns]
+            )
+            query = f"""
+                SELECT round, DATEDIFF(draw_date, '1970-01-01'), {columns}
+                FROM lotto_numbers
+                ORDER BY round ASC
+            """
+            return await self.fetch_array(query)
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return None
+    
+    async def get_data_version(self):
+        """데이터 버전 (최신 회차 + 전체 회차 수)"""
+        try:
+            latest_round, count = await self.fetch_one("SELECT MAX(round), COUNT(*) FROM lotto_numbers")
+            return f"{latest_round or 0}-{count}"
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return None
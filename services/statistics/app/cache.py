@@ -47,6 +47,20 @@ class CacheManager:
             logger.error(f"캐시 저장 실패: {e}")
             return False
     
+    def delete_pattern(self, pattern):
+        """패턴에 맞는 캐시 전체 삭제 (삭제한 키 수)"""
+        if not self.redis_client:
+            return 0
+        
+        try:
+            keys = list(self.redis_client.scan_iter(match=pattern, count=500))
+            if keys:
+                self.redis_client.delete(*keys)
+            return len(keys)
+        except Exception as e:
+            logger.error(f"캐시 삭제 실패: {e}")
+            return 0
+    
     def delete(self, key):
         """캐시에서 데이터 삭제"""
         if not self.redis_client:
@@ -1,52 +1,21 @@
-import mysql.connector
 from mysql.connector import Error
+from lotto_db import BaseDatabase
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class Database:
-    def __init__(self, host, user, password, database):
-        self.host = host
-        self.user = user
-        self.password = password
-        self.database = database
-        self.connection = None
-        # 초기 연결 시도
-        self.connect()
+class Database(BaseDatabase):
+    """통계 서비스 DB 접근 (공유 커넥션 풀 사용)"""
     
-    def connect(self):
-        """데이터베이스 연결"""
-        try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database
-            )
-            if self.connection.is_connected():
-                logger.info("MySQL 데이터베이스 연결 성공")
-                return True
-        except Error as e:
-            logger.error(f"데이터베이스 연결 실패: {e}")
-            self.connection = None
-            return False
-    
-    def disconnect(self):
-        """데이터베이스 연결 종료"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            logger.info("MySQL 연결 종료")
+    pool_name = 'statistics'
+    all_numbers_order = 'DESC'
     
     def insert_lotto_numbers(self, round_num, draw_date, numbers, bonus):
         """로또 번호 저장"""
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        
         try:
-            cursor = self.connection.cursor()
             query = """
-                INSERT INTO lotto_numbers 
+                INSERT INTO lotto_numbers
                 (round, draw_date, number1, number2, number3, number4, number5, number6, bonus_number)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ON DUPLICATE KEY UPDATE
@@ -59,34 +28,24 @@ class Database:
                 number6 = VALUES(number6),
                 bonus_number = VALUES(bonus_number)
             """
-            cursor.execute(query, (round_num, draw_date, *numbers, bonus))
-            self.connection.commit()
+            self.execute(query, (round_num, draw_date, *numbers, bonus))
             logger.info(f"{round_num}회차 데이터 저장 완료")
             return True
         except Error as e:
             logger.error(f"데이터 저장 실패: {e}")
-            self.connection.rollback()
             return False
-        finally:
-            cursor.close()
     
     def get_latest_numbers(self, limit=5):
         """최신 N회 당첨 번호 조회"""
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        
-        cursor = None
         try:
-            cursor = self.connection.cursor(dictionary=True)
             query = """
-                SELECT round, draw_date, 
+                SELECT round, draw_date,
                        number1, number2, number3, number4, number5, number6, bonus_number
                 FROM lotto_numbers
                 ORDER BY round DESC
                 LIMIT %s
             """
-            cursor.execute(query, (limit,))
-            results = cursor.fetchall()
+            results = self.fetch_all(query, (limit,))
             
             # datetime을 문자열로 변환
             for row in results:
@@ -97,24 +56,10 @@ class Database:
         except Error as e:
             logger.error(f"조회 실패: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_history(self, page=1, per_page=20):
         """당첨 이력 조회 (페이지네이션)"""
-        if not self.connection or not self.connection.is_connected():
-            if not self.connect():
-                logger.error("데이터베이스 연결 실패")
-                return []
-        
-        cursor = None
         try:
-            if not self.connection:
-                logger.error("데이터베이스 연결이 None입니다")
-                return []
-            
-            cursor = self.connection.cursor(dictionary=True)
             offset = (page - 1) * per_page
             query = """
                 SELECT round, draw_date,
@@ -123,8 +68,7 @@ class Database:
                 ORDER BY round DESC
                 LIMIT %s OFFSET %s
             """
-            cursor.execute(query, (per_page, offset))
-            results = cursor.fetchall()
+            results = self.fetch_all(query, (per_page, offset))
             
             # datetime을 문자열로 변환
             for row in results:
@@ -135,79 +79,53 @@ class Database:
         except Error as e:
             logger.error(f"조회 실패: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_total_count(self):
         """전체 회차 개수"""
-        if not self.connection or not self.connection.is_connected():
-            if not self.connect():
-                logger.error("데이터베이스 연결 실패")
-                return 0
-        
-        cursor = None
         try:
-            if not self.connection:
-                logger.error("데이터베이스 연결이 None입니다")
-                return 0
-            
-            cursor = self.connection.cursor()
             query = "SELECT COUNT(*) FROM lotto_numbers"
-            cursor.execute(query)
-            count = cursor.fetchone()[0]
-            return count
+            return self.fetch_one(query)[0]
         except Error as e:
             logger.error(f"조회 실패: {e}")
             return 0
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_all_numbers(self):
         """모든 로또 번호 조회"""
-        if not self.connection or not self.connection.is_connected():
-            if not self.connect():
-                logger.error("데이터베이스 연결 실패")
-                return []
-        
-        cursor = None
         try:
-            if not self.connection:
-                logger.error("데이터베이스 연결이 None입니다")
-                return []
-            
-            cursor = self.connection.cursor(dictionary=True)
-            query = """
+            query = f"""
                 SELECT round, draw_date,
                        number1, number2, number3, number4, number5, number6, bonus_number
                 FROM lotto_numbers
-                ORDER BY round DESC
+                ORDER BY round {self.all_numbers_order}
             """
-            cursor.execute(query)
-            results = cursor.fetchall()
-            return results
+            return self.fetch_all(query)
         except Error as e:
             logger.error(f"조회 실패: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
+    
+    def get_draw_matrix(self, game, since_round=0):
+        """회차 오름차순 정수 행렬 [round, 추첨일(1970-01-01 기준 일수), 번호..., 보너스...]
+        
+        since_round: 이 회차 이후만 (증분 갱신용)
+        """
+        try:
+            columns = ', '.join(
+                game.number_columns + [f'COALESCE({col}, 0)' for col in game.bonus_columns]
+            )
+            query = f"""
+                SELECT round, DATEDIFF(draw_date, '1970-01-01'), {columns}
+                FROM lotto_numbers
+                WHERE round > %s
+                ORDER BY round ASC
+            """
+            return self.fetch_array(query, (since_round,))
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return None
     
     def get_recent_numbers(self, limit=10):
         """최근 N회 번호 조회"""
-        if not self.connection or not self.connection.is_connected():
-            if not self.connect():
-                logger.error("데이터베이스 연결 실패")
-                return []
-        
-        cursor = None
         try:
-            if not self.connection:
-                logger.error("데이터베이스 연결이 None입니다")
-                return []
-            
-            cursor = self.connection.cursor(dictionary=True)
             query = """
                 SELECT round, draw_date,
                        number1, number2, number3, number4, number5, number6, bonus_number
@@ -215,12 +133,17 @@ class Database:
                 ORDER BY round DESC
                 LIMIT %s
             """
-            cursor.execute(query, (limit,))
-            results = cursor.fetchall()
-            return results
+            return self.fetch_all(query, (limit,))
         except Error as e:
             logger.error(f"조회 실패: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
+    
+    def get_data_version(self):
+        """데이터 버전 (최신 회차 + 전체 회차 수)"""
+        try:
+            query = "SELECT MAX(round), COUNT(*) FROM lotto_numbers"
+            latest_round, count = self.fetch_one(query)
+            return f"{latest_round or 0}-{count}"
+        except Error as e:
+            logger.error(f"조회 실패: {e}")
+            return None
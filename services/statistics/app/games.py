@@ -0,0 +1,155 @@
+"""
+K-of-N 추첨 게임 설정과 당첨 번호 저장소
+
+로또 6/45는 GameConfig(picks=6, pool=45, bonus=1) 하나의 설정일 뿐이며,
+분석 커널(kernels.py)은 모든 게임 설정에서 공유됩니다.
+"""
+import numpy as np
+
+
+class GameConfig:
+    """K-of-N 게임 설정 (N개 번호 중 K개 추첨 + 보너스 B개)"""
+    
+    def __init__(self, name, picks, pool, bonus=0, grid_cols=9, label=None):
+        if picks < 1 or picks > pool:
+            raise ValueError(f"잘못된 게임 설정: {picks}/{pool}")
+        
+        self.name = name
+        self.picks = picks
+        self.pool = pool
+        self.bonus = bonus
+        self.grid_cols = grid_cols
+        self.label = label or f"{picks}/{pool}"
+        
+        # 번호 범위에 맞는 최소 정수형
+        self.dtype = np.uint8 if pool <= np.iinfo(np.uint8).max else np.uint16
+    
+    @property
+    def number_columns(self):
+        """당첨 번호 컬럼명 (number1..numberK)"""
+        return [f'number{i + 1}' for i in range(self.picks)]
+    
+    @property
+    def bonus_columns(self):
+        """보너스 번호 컬럼명"""
+        if self.bonus == 1:
+            return ['bonus_number']
+        return [f'bonus{i + 1}' for i in range(self.bonus)]
+    
+    @property
+    def grid_rows(self):
+        """히트맵 행 수"""
+        return -(-self.pool // self.grid_cols)
+    
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "label": self.label,
+            "picks": self.picks,
+            "pool": self.pool,
+            "bonus": self.bonus,
+            "grid": [self.grid_rows, self.grid_cols]
+        }
+
+
+# 동행복권 로또 6/45
+LOTTO_645 = GameConfig('lotto645', picks=6, pool=45, bonus=1, grid_cols=9, label='로또 6/45')
+
+GAMES = {
+    LOTTO_645.name: LOTTO_645,
+}
+
+
+def register_game(config):
+    """게임 설정 등록"""
+    GAMES[config.name] = config
+    return config
+
+
+class DrawStore:
+    """회차 오름차순 당첨 번호 행렬
+    
+    numbers: (회차 수, K) 정수 배열, N에 맞는 크기의 dtype
+    bonus:   (회차 수, B) 정수 배열
+    rounds:  회차 번호 (int32)
+    dates:   추첨일 (datetime64[D], 없으면 NaT)
+    """
+    
+    def __init__(self, config, numbers, bonus=None, rounds=None, dates=None):
+        numbers = np.asarray(numbers)
+        if numbers.ndim != 2 or numbers.shape[1] != config.picks:
+            raise ValueError(f"번호 행렬은 (회차 수, {config.picks}) 이어야 합니다")
+        if numbers.size and (numbers.min() < 1 or numbers.max() > config.pool):
+            raise ValueError(f"번호는 1~{config.pool} 범위여야 합니다")
+        
+        count = len(numbers)
+        self.config = config
+        self.numbers = numbers.astype(config.dtype, copy=False)
+        
+        if bonus is None:
+            bonus = np.zeros((count, config.bonus), dtype=config.dtype)
+        self.bonus = np.asarray(bonus).reshape(count, config.bonus).astype(config.dtype, copy=False)
+        
+        if rounds is None:
+            rounds = np.arange(1, count + 1)
+        self.rounds = np.asarray(rounds, dtype=np.int32)
+        
+        if dates is None:
+            dates = np.full(count, np.datetime64('NaT'), dtype='datetime64[D]')
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+    
+    def __len__(self):
+        return len(self.numbers)
+    
+    @classmethod
+    def from_rows(cls, config, rows):
+        """DB 조회 결과(dict 리스트) -> DrawStore (회차 오름차순)"""
+        rows = sorted(rows, key=lambda row: row['round'])
+        numbers = np.array(
+            [[row[col] for col in config.number_columns] for row in rows],
+            dtype=config.dtype
+        ).reshape(len(rows), config.picks)
+        bonus = np.array(
+            [[row.get(col) or 0 for col in config.bonus_columns] for row in rows],
+            dtype=config.dtype
+        ).reshape(len(rows), config.bonus)
+        return cls(
+            config,
+            numbers,
+            bonus=bonus,
+            rounds=[row['round'] for row in rows],
+            dates=[row.get('draw_date') for row in rows]
+        )
+    
+    @classmethod
+    def from_matrix(cls, config, matrix):
+        """정수 행렬 [round, 추첨일(epoch 일수), 번호..., 보너스...] -> DrawStore"""
+        picks = config.picks
+        return cls(
+            config,
+            matrix[:, 2:2 + picks],
+            bonus=matrix[:, 2 + picks:2 + picks + config.bonus],
+            rounds=matrix[:, 0],
+            dates=matrix[:, 1].astype('datetime64[D]')
+        )
+    
+    def append(self, other):
+        """뒤에 회차 추가한 새 저장소 (증분 갱신)"""
+        return DrawStore(
+            self.config,
+            np.concatenate([self.numbers, other.numbers]),
+            bonus=np.concatenate([self.bonus, other.bonus]),
+            rounds=np.concatenate([self.rounds, other.rounds]),
+            dates=np.concatenate([self.dates, other.dates])
+        )
+    
+    def tail(self, limit):
+        """최근 limit회"""
+        start = max(len(self) - limit, 0)
+        return DrawStore(
+            self.config,
+            self.numbers[start:],
+            bonus=self.bonus[start:],
+            rounds=self.rounds[start:],
+            dates=self.dates[start:]
+        )
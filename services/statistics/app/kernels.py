@@ -0,0 +1,61 @@
+"""
+벡터화 분석 커널 (모든 K-of-N 게임 설정에서 공유)
+
+모든 함수는 (회차 수, K) 번호 행렬과 번호 범위 N만 받으며
+회차별 Python 루프 없이 numpy 연산으로 계산합니다.
+"""
+import numpy as np
+
+
+def frequency(numbers, pool):
+    """번호별 출현 횟수 (길이 N, 인덱스 0 = 1번)"""
+    return np.bincount(numbers.ravel(), minlength=pool + 1)[1:]
+
+
+def group_frequency(numbers, group_idx, n_groups, pool):
+    """그룹별 번호 출현 횟수 (n_groups x N)"""
+    flat = (group_idx[:, None].astype(np.intp) * (pool + 1) + numbers).ravel()
+    counts = np.bincount(flat, minlength=n_groups * (pool + 1))
+    return counts.reshape(n_groups, pool + 1)[:, 1:]
+
+
+def rank_numbers(counts):
+    """빈도 내림차순 번호 (동률은 번호 오름차순), 마지막 축 기준"""
+    return np.argsort(-counts, axis=-1, kind='stable') + 1
+
+
+def draw_patterns(numbers):
+    """회차별 홀수 개수, 연속 번호 쌍 수, 번호 합계"""
+    ordered = np.sort(numbers, axis=1).astype(np.int32)
+    odd = (ordered % 2).sum(axis=1)
+    consecutive = (np.diff(ordered, axis=1) == 1).sum(axis=1)
+    sums = ordered.sum(axis=1).astype(np.int64)
+    return odd, consecutive, sums
+
+
+def group_mean(values, group_idx, counts):
+    """그룹별 평균"""
+    return np.bincount(group_idx, weights=values, minlength=len(counts)) / counts
+
+
+def group_std(values, group_idx, counts):
+    """그룹별 모표준편차"""
+    mean = group_mean(values, group_idx, counts)
+    sq = group_mean(values.astype(np.float64) ** 2, group_idx, counts)
+    return np.sqrt(np.maximum(sq - mean ** 2, 0))
+
+
+def group_min_max(values, group_idx, counts):
+    """그룹별 최소/최대"""
+    order = np.argsort(group_idx, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ordered = values[order]
+    return np.minimum.reduceat(ordered, starts), np.maximum.reduceat(ordered, starts)
+
+
+def grid(counts, cols):
+    """번호 빈도를 rows x cols 격자로 배치 (빈 칸은 -1)"""
+    rows = -(-len(counts) // cols)
+    cells = np.full(rows * cols, -1, dtype=np.int64)
+    cells[:len(counts)] = counts
+    return cells.reshape(rows, cols)
@@ -2,9 +2,14 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 import os
 import logging
-from .analyzer import StatisticsAnalyzer
+import threading
+from .analyzer import StatisticsAnalyzer, CALENDAR_PERIODS, ANALYSES
+from .games import GAMES, DrawStore
 from .database import Database
+from lotto_db import with_local_snapshot
+from lotto_db.events import RoundEventSubscriber
 from .cache import CacheManager
+from .snapshot import SnapshotWriter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,9 +22,13 @@ db = Database(
     host=os.getenv('MYSQL_HOST', 'localhost'),
     user=os.getenv('MYSQL_USER', 'root'),
     password=os.getenv('MYSQL_PASSWORD', ''),
-    database=os.getenv('MYSQL_DATABASE', 'lotto_db')
+    database=os.getenv('MYSQL_DATABASE', 'lotto_db'),
+    lazy=bool(os.getenv('LOCAL_SNAPSHOT_PATH'))
 )
 
+# 로컬 SQLite 스냅샷 (MySQL 준비 전/장애 중 읽기 응답)
+db = with_local_snapshot(db)
+
 # 캐시 매니저
 cache = CacheManager(
     host=os.getenv('REDIS_HOST', 'localhost'),
@@ -29,11 +38,73 @@ cache = CacheManager(
 # 통계 분석기
 analyzer = StatisticsAnalyzer(db, cache)
 
+# 컬럼형 스냅샷 (데이터 버전이 바뀔 때마다 저장)
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', '/app/snapshots' if os.path.exists('/app') else './snapshots')
+SNAPSHOT_INTERVAL = int(os.getenv('SNAPSHOT_INTERVAL', 300))
+snapshot_writer = SnapshotWriter(SNAPSHOT_DIR)
+_snapshot_lock = threading.Lock()
+_snapshot_stop = threading.Event()
+
+
+def write_snapshot_if_changed():
+    """데이터 버전이 바뀌었으면 스냅샷 저장"""
+    with _snapshot_lock:
+        version = db.get_data_version()
+        if version is None or version == snapshot_writer.current_version():
+            return False
+        
+        store = analyzer.load_draws(version)
+        if store is None:
+            return False
+        
+        snapshot_writer.write(version, store, analyzer.analyze_all(version))
+        return True
+
+
+def _snapshot_loop():
+    """주기적으로 데이터 버전 확인"""
+    while True:
+        try:
+            write_snapshot_if_changed()
+        except Exception as e:
+            logger.error(f"스냅샷 저장 실패: {e}")
+        _snapshot_stop.wait(SNAPSHOT_INTERVAL)
+
+
+if SNAPSHOT_INTERVAL > 0:
+    threading.Thread(target=_snapshot_loop, name='snapshot-writer', daemon=True).start()
+
+
+def on_round_ingested(event):
+    """새 회차 이벤트: 당첨 번호 저장소 증분 갱신, 분석 캐시 무효화, 스냅샷 저장"""
+    analyzer.refresh_draws(event.get('version'))
+    removed = cache.delete_pattern('stats:*')
+    logger.info(f"{event['round']}회 이벤트 반영 (캐시 {removed}개 삭제)")
+    write_snapshot_if_changed()
+
+
+# 새 회차 이벤트 구독 (데이터 수집 서비스가 Redis로 발행)
+round_subscriber = RoundEventSubscriber(cache.redis_client, on_round_ingested, name='statistics')
+round_subscriber.start()
+
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """헬스 체크"""
-    return jsonify({"status": "healthy", "service": "statistics"}), 200
+    return jsonify({"status": "healthy", "service": "statistics", "events": round_subscriber.status()}), 200
+
+
+@app.route('/db/pool', methods=['GET'])
+def get_pool_stats():
+    """DB 커넥션 풀 지표"""
+    return jsonify({"success": True, "pool": db.pool_stats()}), 200
+
+
+@app.route('/db/queries', methods=['GET'])
+def get_query_stats():
+    """쿼리 형태별 실행 지표와 최근 느린 쿼리"""
+    top = request.args.get('top', 20, type=int)
+    return jsonify({"success": True, "queries": db.query_stats(top)}), 200
 
 
 @app.route('/frequency', methods=['GET'])
@@ -144,5 +215,103 @@ def get_heatmap():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/calendar', methods=['GET'])
+def get_calendar():
+    """달력 기준 집계 (연/분기/월/계절)"""
+    try:
+        period = request.args.get('period', 'year')
+        if period not in CALENDAR_PERIODS:
+            return jsonify({
+                "success": False,
+                "error": f"period는 {', '.join(CALENDAR_PERIODS)} 중 하나여야 합니다"
+            }), 400
+        
+        # 데이터 버전별 캐시 (새 회차가 들어오면 키가 바뀜)
+        # 버전을 모르면 어느 데이터의 결과인지 알 수 없으므로 캐시를 쓰지 않음
+        version = db.get_data_version()
+        if version is not None:
+            cached = cache.get(f'stats:calendar:{period}:{version}')
+            if cached:
+                return jsonify(cached), 200
+        
+        # 모든 집계 단위를 한 번에 계산해 캐시에 저장
+        results = analyzer.analyze_calendar_all(version)
+        if version is not None:
+            for key, value in results.items():
+                if value.get('success'):
+                    cache.set(f'stats:calendar:{key}:{version}', value, ttl=86400)
+        
+        return jsonify(results[period]), 200
+    except Exception as e:
+        logger.error(f"달력 집계 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/games', methods=['GET'])
+def list_games():
+    """지원하는 K-of-N 게임 설정"""
+    return jsonify({
+        "success": True,
+        "games": [config.to_dict() for config in GAMES.values()],
+        "analyses": list(ANALYSES)
+    }), 200
+
+
+@app.route('/games/<game>/<analysis>', methods=['POST'])
+def analyze_game(game, analysis):
+    """임의 당첨 이력(시뮬레이션 등)에 대한 분석"""
+    try:
+        config = GAMES.get(game)
+        if not config:
+            return jsonify({"success": False, "error": f"알 수 없는 게임: {game}"}), 404
+        if analysis not in ANALYSES:
+            return jsonify({"success": False, "error": f"지원하지 않는 분석: {analysis}"}), 404
+        
+        data = request.get_json() or {}
+        draws = data.get('draws')
+        if not draws:
+            return jsonify({"success": False, "error": "draws가 필요합니다"}), 400
+        
+        try:
+            store = DrawStore(
+                config,
+                draws,
+                bonus=data.get('bonus'),
+                rounds=data.get('rounds'),
+                dates=data.get('dates')
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        
+        result = analyzer.analyze(
+            analysis,
+            store,
+            limit=request.args.get('limit', 10, type=int),
+            period=request.args.get('period', 'year')
+        )
+        result['game'] = config.to_dict()
+        
+        return jsonify(result), 200
+    except Exception as e:
+        logger.error(f"게임 분석 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/snapshot', methods=['POST'])
+def create_snapshot():
+    """스냅샷 즉시 저장"""
+    try:
+        written = write_snapshot_if_changed()
+        return jsonify({
+            "success": True,
+            "written": written,
+            "version": snapshot_writer.current_version(),
+            "directory": SNAPSHOT_DIR
+        }), 200
+    except Exception as e:
+        logger.error(f"스냅샷 저장 실패: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8002, debug=True)
@@ -0,0 +1,200 @@
+"""
+컬럼형 스냅샷 (Arrow IPC / Parquet)
+
+데이터 버전이 바뀔 때마다 lotto_numbers 전체와 계산된 분석 결과를
+버전별 디렉터리에 저장합니다. Arrow IPC 파일은 압축 없이 저장하므로
+memory map으로 복사 없이 읽을 수 있습니다.
+    
+    snapshots/
+        LATEST                      # 최신 버전 이름
+        v1196-1196/
+            manifest.json
+            lotto_numbers.arrow
+            lotto_numbers.parquet
+            analyses/frequency.arrow
+            analyses/trends.trends.arrow
+            ...
+"""
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+def draws_schema(config):
+    """게임 설정별 당첨 번호 스키마 (번호 범위에 맞는 정수형)"""
+    number_type = pa.from_numpy_dtype(config.dtype)
+    fields = [('round', pa.int32()), ('draw_date', pa.date32())]
+    fields += [(col, number_type) for col in config.number_columns]
+    fields += [(col, number_type) for col in config.bonus_columns]
+    return pa.schema(fields)
+
+
+def draws_table(store):
+    """DrawStore -> pa.Table"""
+    columns = [
+        pa.array(store.rounds, type=pa.int32()),
+        pa.array(store.dates, type=pa.date32()),
+    ]
+    columns += [pa.array(store.numbers[:, i]) for i in range(store.config.picks)]
+    columns += [pa.array(store.bonus[:, i]) for i in range(store.config.bonus)]
+    return pa.Table.from_arrays(columns, schema=draws_schema(store.config))
+
+
+def write_table(table, path):
+    """Arrow IPC 파일로 저장 (무압축, memory map 가능)"""
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_table(path):
+    """memory map으로 Arrow IPC 파일 읽기 (zero-copy)"""
+    source = pa.memory_map(path, 'r')
+    return pa.ipc.open_file(source).read_all()
+
+
+def latest_snapshot_dir(base_dir):
+    """최신 스냅샷 디렉터리 경로 (없으면 None)"""
+    latest_path = os.path.join(base_dir, 'LATEST')
+    if not os.path.exists(latest_path):
+        return None
+    
+    with open(latest_path, encoding='utf-8') as f:
+        name = f.read().strip()
+    
+    snapshot_dir = os.path.join(base_dir, name)
+    return snapshot_dir if os.path.isdir(snapshot_dir) else None
+
+
+def _flatten(value, prefix=''):
+    """중첩 dict를 '_'로 이어 붙인 단일 행으로 평탄화"""
+    row = {}
+    for key, item in value.items():
+        name = f"{prefix}{key}"
+        if isinstance(item, dict):
+            row.update(_flatten(item, f"{name}_"))
+        else:
+            row[name] = item
+    return row
+
+
+def analysis_tables(name, result):
+    """분석 결과(dict) -> {테이블 이름: pa.Table}
+    
+    스칼라/중첩 dict 값은 1행짜리 요약 테이블로, dict 리스트 값은
+    필드별 테이블로 저장합니다 (히트맵 같은 2차원 리스트는 펼침).
+    """
+    tables = {}
+    summary = {}
+    
+    for key, value in result.items():
+        if isinstance(value, list):
+            rows = value
+            if rows and all(isinstance(r, list) for r in rows):
+                rows = [cell for r in rows for cell in r]
+            rows = [r for r in rows if r is not None]
+            if rows and all(isinstance(r, dict) for r in rows):
+                tables[f"{name}.{key}"] = pa.Table.from_pylist([_flatten(r) for r in rows])
+            else:
+                summary[key] = value
+        elif isinstance(value, dict):
+            summary.update(_flatten(value, f"{key}_"))
+        else:
+            summary[key] = value
+    
+    tables[name] = pa.Table.from_pylist([summary])
+    return tables
+
+
+class SnapshotWriter:
+    """데이터 버전별 컬럼형 스냅샷 저장"""
+    
+    def __init__(self, base_dir, keep=3):
+        self.base_dir = base_dir
+        self.keep = keep
+        os.makedirs(self.base_dir, exist_ok=True)
+    
+    def current_version(self):
+        """최신 스냅샷의 데이터 버전"""
+        snapshot_dir = latest_snapshot_dir(self.base_dir)
+        if not snapshot_dir:
+            return None
+        return os.path.basename(snapshot_dir)[1:]
+    
+    def write(self, version, store, analyses):
+        """스냅샷 저장 (임시 디렉터리에 쓴 뒤 rename으로 교체)
+        
+        store: 당첨 번호 저장소 (DrawStore)
+        analyses: {분석 이름: 결과 dict}
+        """
+        name = f"v{version}"
+        final_dir = os.path.join(self.base_dir, name)
+        tmp_dir = os.path.join(self.base_dir, f".{name}.tmp")
+        
+        if os.path.isdir(final_dir):
+            self._set_latest(name)
+            return final_dir
+        
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(os.path.join(tmp_dir, 'analyses'))
+        
+        table = draws_table(store)
+        
+        write_table(table, os.path.join(tmp_dir, 'lotto_numbers.arrow'))
+        pq.write_table(table, os.path.join(tmp_dir, 'lotto_numbers.parquet'))
+        
+        files = []
+        for analysis_name, result in analyses.items():
+            if not result or not result.get('success'):
+                logger.warning(f"스냅샷 제외 (분석 실패): {analysis_name}")
+                continue
+            for table_name, analysis_table in analysis_tables(analysis_name, result).items():
+                filename = f"{table_name}.arrow"
+                write_table(analysis_table, os.path.join(tmp_dir, 'analyses', filename))
+                files.append(filename)
+        
+        manifest = {
+            "version": version,
+            "game": store.config.to_dict(),
+            "created_at": datetime.now().isoformat(),
+            "rows": table.num_rows,
+            "analyses": files
+        }
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        
+        try:
+            os.replace(tmp_dir, final_dir)
+        except OSError:
+            # 다른 프로세스가 같은 버전을 먼저 저장한 경우
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(final_dir):
+                raise
+        self._set_latest(name)
+        self._cleanup()
+        
+        logger.info(f"스냅샷 저장 완료: {final_dir} ({table.num_rows}회차, 분석 {len(files)}개)")
+        return final_dir
+    
+    def _set_latest(self, name):
+        """LATEST 포인터 원자적 교체"""
+        tmp_path = os.path.join(self.base_dir, '.LATEST.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(name)
+        os.replace(tmp_path, os.path.join(self.base_dir, 'LATEST'))
+    
+    def _cleanup(self):
+        """오래된 스냅샷 정리 (최근 keep개 유지)"""
+        snapshots = sorted(
+            (d for d in os.listdir(self.base_dir)
+             if d.startswith('v') and os.path.isdir(os.path.join(self.base_dir, d))),
+            key=lambda d: os.path.getmtime(os.path.join(self.base_dir, d))
+        )
+        for old in snapshots[:-self.keep]:
+            shutil.rmtree(os.path.join(self.base_dir, old), ignore_errors=True)